@@ -0,0 +1,91 @@
+"""
+메일 전송 방식별 처리량 비교 (메일마다 새 연결 vs. SMTPMailer 연결 재사용/배치 전송)
+
+    python -m benchmarks.smtp_send --count 500 --latency 0.005
+"""
+import argparse
+import asyncio
+import time
+from email.mime.text import MIMEText
+
+from aiosmtplib import SMTP
+
+from benchmarks.smtp_sink import SMTPSink
+from src.service.mailer import SMTPMailer
+
+SENDER = "noreply@example.com"
+
+
+def build_message(index: int) -> MIMEText:
+    msg = MIMEText(f"user{index}, Thank you for register.", "plain")
+    msg["From"] = SENDER
+    msg["To"] = f"user{index}@example.com"
+    msg["Subject"] = "Welcome to our service!"
+    return msg
+
+
+async def send_with_new_connection(port: int, count: int, concurrency: int):
+    # 기존 방식: 메일마다 연결 -> 로그인 -> 전송 -> 종료
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(index: int):
+        async with semaphore:
+            async with SMTP(hostname="127.0.0.1", port=port, start_tls=False) as client:
+                await client.login(SENDER, "password")
+                await client.send_message(build_message(index))
+
+    await asyncio.gather(*(send(index) for index in range(count)))
+
+
+async def send_with_mailer(port: int, count: int, pool_size: int, batch_size: int):
+    mailer = SMTPMailer(
+        hostname="127.0.0.1",
+        port=port,
+        username=SENDER,
+        password="password",
+        pool_size=pool_size,
+        batch_size=batch_size,
+    )
+    await asyncio.gather(*(mailer.send(build_message(index)) for index in range(count)))
+    await mailer.close()
+
+
+async def run(count: int, latency: float, pool_size: int, batch_size: int):
+    cases = {
+        "new connection": lambda port: send_with_new_connection(
+            port, count, concurrency=pool_size
+        ),
+        "pooled mailer": lambda port: send_with_mailer(
+            port, count, pool_size, batch_size
+        ),
+    }
+
+    for name, send in cases.items():
+        sink = SMTPSink(latency=latency)
+        await sink.start()
+
+        start = time.perf_counter()
+        await send(sink.port)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<15} {sink.received} emails in {elapsed:.2f}s "
+            f"({sink.received / elapsed:,.0f} emails/s, {sink.connections} connections)"
+        )
+
+        await sink.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.smtp_send")
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="SMTP 명령마다 추가할 응답 지연 (초)"
+    )
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.latency, args.pool_size, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+받은 메일을 버리기만 하는 로컬 SMTP 서버 (개발/벤치마크용)
+
+    python -m benchmarks.smtp_sink --port 1025
+    SMTP_SERVER=localhost SMTP_PORT=1025 SMTP_USER=noreply@example.com ...
+"""
+import argparse
+import asyncio
+from typing import Optional
+
+
+class SMTPSink:
+    """
+    EHLO, AUTH, MAIL, RCPT, DATA 등 메일 전송에 필요한 최소한의 명령만 처리하며,
+    인증 정보와 관계없이 모든 메일을 받아들입니다.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0):
+        self.host = host
+        self.port = port
+        # 명령마다 추가하는 응답 지연 (초, 실제 서버와의 왕복 시간 흉내)
+        self.latency = latency
+        self.server: Optional[asyncio.Server] = None
+        self.received = 0
+        self.connections = 0
+        # True이면 다음 명령을 받았을 때 응답 없이 연결을 끊음 (서버의 idle 연결 종료 흉내)
+        self.drop_next_command = False
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def reply(self, writer: asyncio.StreamWriter, line: str):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        await self.reply(writer, "220 localhost SMTP sink")
+
+        while line := await reader.readline():
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if self.drop_next_command:
+                self.drop_next_command = False
+                break
+            if verb == "EHLO":
+                writer.write(b"250-localhost\r\n250-AUTH PLAIN LOGIN\r\n")
+                await self.reply(writer, "250 8BITMIME")
+            elif verb == "AUTH":
+                await self.reply(writer, "235 Authentication successful")
+            elif verb == "DATA":
+                await self.reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                while (data := await reader.readline()) not in (b".\r\n", b""):
+                    pass
+                if not data:
+                    # 메일 본문을 받는 도중 연결이 끊어짐
+                    break
+                self.received += 1
+                await self.reply(writer, "250 OK")
+            elif verb == "QUIT":
+                await self.reply(writer, "221 Bye")
+                break
+            else:
+                # HELO, MAIL, RCPT, RSET, NOOP
+                await self.reply(writer, "250 OK")
+
+        writer.close()
+
+
+async def run(host: str, port: int):
+    sink = SMTPSink(host, port)
+    await sink.start()
+    print(f"SMTP sink listening on {sink.host}:{sink.port}")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"Received {sink.received} emails ({sink.connections} connections)")
+    finally:
+        await sink.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.smtp_sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+동시 구매 시 재고 확보 방식별 처리량 및 중복 할당 비교
+(기존 SELECT 후 ORM 변경 vs. allocate_stocks의 UPDATE ... RETURNING / SKIP LOCKED)
+
+    python -m benchmarks.stock_allocate --database-url postgresql+asyncpg://... --buyers 200
+
+행 잠금이 없는 SQLite에서는 allocate_stocks가 프로세스 내에서 직렬화되므로
+SKIP LOCKED의 효과는 PostgreSQL/MySQL에서 측정해야 합니다.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import delete, func, insert, pool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.product import StatusType, Stock
+from src.models.repository import StockRepository
+from src.redis_client import get_redis_client
+
+# 실제 상품과 겹치지 않는 ID (측정 후 Redis 재고 카운터도 삭제함)
+BENCHMARK_PRODUCT_ID = 0
+
+
+async def allocate_with_select(session: AsyncSession, quantity: int) -> list[int]:
+    # 기존 방식: 가용 재고를 조회한 뒤 ORM 인스턴스의 상태를 변경
+    stock_repo = StockRepository(session, get_redis_client())
+    stocks = await stock_repo.get_available_stock_by_quantity(
+        product_id=BENCHMARK_PRODUCT_ID, quantity=quantity
+    )
+    if len(stocks) < quantity:
+        return []
+
+    stock_ids = [stock.id for stock in stocks]
+    for stock in stocks:
+        stock.status = StatusType.SOLD
+    await session.commit()
+    return stock_ids
+
+
+async def allocate_atomically(session: AsyncSession, quantity: int) -> list[int]:
+    stock_repo = StockRepository(session, get_redis_client())
+    return await stock_repo.allocate_stocks(
+        product_id=BENCHMARK_PRODUCT_ID, quantity=quantity
+    )
+
+
+async def reset_stocks(engine: AsyncEngine, stock_count: int):
+    async with engine.begin() as conn:
+        await conn.execute(
+            delete(Stock).where(Stock.product_id == BENCHMARK_PRODUCT_ID)
+        )
+        await conn.execute(
+            insert(Stock),
+            [{"product_id": BENCHMARK_PRODUCT_ID, "status": StatusType.AVAILABLE}]
+            * stock_count,
+        )
+
+
+async def run(database_url: str, stock_count: int, buyers: int, quantity: int):
+    engine = create_async_engine(database_url, poolclass=pool.NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    cases = {
+        "select + orm update": allocate_with_select,
+        "allocate_stocks": allocate_atomically,
+    }
+
+    for name, allocate in cases.items():
+        await reset_stocks(engine, stock_count)
+        errors = 0
+
+        async def buy() -> list[int]:
+            nonlocal errors
+            async with AsyncSession(engine) as session:
+                try:
+                    return await allocate(session, quantity)
+                except Exception:
+                    # 잠금 대기 시간 초과 등
+                    errors += 1
+                    return []
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(buy() for _ in range(buyers)))
+        elapsed = time.perf_counter() - start
+
+        allocated = [stock_id for stock_ids in results for stock_id in stock_ids]
+        async with AsyncSession(engine) as session:
+            result = await session.exec(
+                select(func.count(Stock.id)).where(
+                    Stock.product_id == BENCHMARK_PRODUCT_ID,
+                    Stock.status == StatusType.SOLD,
+                )
+            )
+            sold = result.one()
+
+        print(
+            f"{name:<20} {buyers} buyers in {elapsed:.2f}s "
+            f"({buyers / elapsed:,.0f} buyers/s), "
+            f"handed out {len(allocated)} stocks for {sold} sold rows "
+            f"({len(allocated) - len(set(allocated))} duplicates, {errors} errors)"
+        )
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            delete(Stock).where(Stock.product_id == BENCHMARK_PRODUCT_ID)
+        )
+    await get_redis_client().delete(
+        StockRepository.generate_stock_counter_key(product_id=BENCHMARK_PRODUCT_ID)
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    # 메모리 DB는 커넥션 하나를 공유하므로 동시성 측정에는 파일 DB를 기본값으로 사용
+    parser.add_argument(
+        "--database-url",
+        default=f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'stock_allocate.sqlite3')}",
+    )
+    parser.add_argument("--stocks", type=int, default=1000)
+    parser.add_argument("--buyers", type=int, default=200)
+    parser.add_argument("--quantity", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.database_url, args.stocks, args.buyers, args.quantity))
@@ -0,0 +1,75 @@
+"""
+재고 생성 방식별 처리량 비교 (기존 ORM add_all vs. chunk 단위 executemany)
+
+    python -m benchmarks.stock_insert --quantity 100000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, delete, pool
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.product import StatusType, Stock
+from src.models.repository import StockRepository
+from src.redis_client import get_redis_client
+
+# 실제 상품과 겹치지 않는 ID (측정 후 Redis 재고 카운터도 삭제함)
+BENCHMARK_PRODUCT_ID = 0
+
+
+async def create_stocks_with_orm(session: AsyncSession, quantity: int):
+    stock_list = [
+        Stock(product_id=BENCHMARK_PRODUCT_ID, status=StatusType.AVAILABLE)
+        for _ in range(quantity)
+    ]
+    session.add_all(stock_list)
+    await session.commit()
+
+
+async def run(database_url: str, quantity: int, chunk_size: int):
+    engine = create_async_engine(database_url, poolclass=pool.StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        stock_repo = StockRepository(session, get_redis_client())
+        cases = {
+            "orm add_all": lambda: create_stocks_with_orm(session, quantity),
+            "bulk executemany": lambda: stock_repo.create_stocks(
+                product_id=BENCHMARK_PRODUCT_ID,
+                quantity=quantity,
+                chunk_size=chunk_size,
+            ),
+        }
+
+        for name, create in cases.items():
+            start = time.perf_counter()
+            await create()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:<18} {quantity} rows in {elapsed:.2f}s "
+                f"({quantity / elapsed:,.0f} rows/s)"
+            )
+
+            await session.exec(
+                delete(Stock).where(Stock.product_id == BENCHMARK_PRODUCT_ID)
+            )
+            await session.commit()
+
+        await stock_repo.redis.delete(
+            stock_repo.generate_stock_counter_key(product_id=BENCHMARK_PRODUCT_ID)
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--quantity", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.database_url, args.quantity, args.chunk_size))
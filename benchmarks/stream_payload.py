@@ -0,0 +1,90 @@
+"""
+stream 메시지 인코딩 형식별 크기 및 인코딩/디코딩 비용 비교
+
+    python -m benchmarks.stream_payload
+    python -m benchmarks.stream_payload --redis   # 작업용 Redis에 메시지를 추가하여 메모리 사용량 측정
+"""
+import argparse
+import asyncio
+import timeit
+
+from src.redis_client import get_task_redis_client
+from src.service.serializer import codecs
+
+BENCHMARK_STREAM = "benchmark:stream_payload"
+
+
+def build_product_info() -> dict:
+    # 실제 상품 상세와 비슷한 길이의 텍스트 필드
+    return {
+        "id": 12345,
+        "seller_id": 42,
+        "product_name": "[1+1 기획] 수분 가득 히알루론산 진정 토너 500ml",
+        "category_id": 17,
+        "price": 32000,
+        "discounted_price": 24900,
+        "capacity": "500ml",
+        "key_specification": "모든 피부용",
+        "expiration_date": "제조일로부터 36개월",
+        "how_to_use": "세안 후 적당량을 화장솜에 덜어 피부결을 따라 부드럽게 닦아냅니다. " * 8,
+        "ingredient": "정제수, 부틸렌글라이콜, 글리세린, 나이아신아마이드, 소듐하이알루로네이트, " * 12,
+        "caution": "화장품 사용 시 또는 사용 후 직사광선에 의하여 사용부위가 붉은 반점, "
+        "부어오름 또는 가려움증 등의 이상 증상이나 부작용이 있는 경우 전문의 등과 상담할 것. " * 4,
+        "inventory_quantity": 300,
+        "use_status": True,
+        "brand_name": "올리브영",
+        "contact_number": "02-000-0000",
+        "category_3": "토너",
+        "category_id_2": 5,
+        "category_2": "스킨/토너",
+        "category_id_1": 1,
+        "category_1": "스킨케어",
+    }
+
+
+async def measure_redis_memory(version: str, payload: str, count: int) -> float:
+    task_redis = get_task_redis_client()
+    await task_redis.delete(BENCHMARK_STREAM)
+    async with task_redis.pipeline(transaction=False) as pipe:
+        for _ in range(count):
+            pipe.xadd(
+                BENCHMARK_STREAM,
+                {"type": "sync_product", "v": version, "data": payload},
+            )
+        await pipe.execute()
+    memory = await task_redis.memory_usage(BENCHMARK_STREAM, samples=0)
+    await task_redis.delete(BENCHMARK_STREAM)
+    return memory / count
+
+
+async def run(number: int, use_redis: bool, count: int):
+    product_info = build_product_info()
+
+    for version, codec in codecs.items():
+        payload = codec.encode(product_info)
+        assert codec.decode(payload) == product_info
+
+        encode_us = timeit.timeit(lambda: codec.encode(product_info), number=number)
+        decode_us = timeit.timeit(lambda: codec.decode(payload), number=number)
+        line = (
+            f"v{version}: {len(payload.encode()):>6} bytes, "
+            f"encode {encode_us / number * 1e6:6.1f}us, "
+            f"decode {decode_us / number * 1e6:6.1f}us"
+        )
+        if use_redis:
+            memory = await measure_redis_memory(version, payload, count)
+            line += f", redis {memory:,.0f} bytes/message"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stream_payload")
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--redis", action="store_true")
+    parser.add_argument("--count", type=int, default=1000, help="Redis에 추가할 메시지 수")
+    args = parser.parse_args()
+    asyncio.run(run(args.number, args.redis, args.count))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, status
 
-from src.apis.common import health
+from src.apis.common import health, metrics
 
 common_router = APIRouter(tags=["common"])
 
@@ -10,3 +10,10 @@ common_router.add_api_route(
     endpoint=health.handler,
     status_code=status.HTTP_200_OK,
 )
+
+common_router.add_api_route(
+    methods=["GET"],
+    path="/metrics",
+    endpoint=metrics.handler,
+    status_code=status.HTTP_200_OK,
+)
@@ -0,0 +1,5 @@
+from src.metrics import collect_metrics
+
+
+def handler() -> dict:
+    return collect_metrics()
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, status
 
-from src.apis.store import cart, goods, product
+from src.apis.store import cart, category, goods, product
 from src.schema import response
 
 store_router = APIRouter(tags=["store"])
@@ -13,6 +13,14 @@ store_router.add_api_route(
     status_code=status.HTTP_200_OK,
 )
 
+store_router.add_api_route(
+    methods=["GET"],
+    path="/categories",
+    endpoint=category.get_categories_handler,
+    response_model=list[response.CategoryResponse],
+    status_code=status.HTTP_200_OK,
+)
+
 store_router.add_api_route(
     methods=["GET"],
     path="/goods/{goods_id}",
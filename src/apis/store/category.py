@@ -0,0 +1,17 @@
+from fastapi import Depends, Response
+
+from src.models.category import CategoryTree
+from src.models.repository import CategoryRepository
+from src.schema.response import CategoryResponse
+
+
+async def get_categories_handler(
+    response: Response,
+    category_repo: CategoryRepository = Depends(CategoryRepository),
+) -> list[CategoryResponse]:
+    category_tree: CategoryTree = await category_repo.get_category_tree()
+
+    # 카테고리는 거의 변경되지 않으므로 클라이언트 측 캐시 허용
+    response.headers["Cache-Control"] = "public, max-age=300"
+
+    return list(category_tree.nodes)
@@ -8,17 +8,26 @@ from src.schema.response import (
     GetGoodsListResponse,
     GetGoodsPageResponse,
 )
+from src.service.cursor import get_next_cursor, get_page_cursor
 
 
 async def get_goods_list_handler(
     category: str = Query(default=None, max_length=15),
     search_after: list[int] = Query(default=None),
     pit_id: str = Query(default=None),
+    cursor: str = Query(default=None),
     es_repo: ElasticsearchRepository = Depends(ElasticsearchRepository),
 ) -> GetGoodsPageResponse:
+    page = get_page_cursor(
+        query=["goods", category],
+        cursor=cursor,
+        search_after=search_after,
+        pit_id=pit_id,
+    )
+
     if not category:
         goods_list, next_search_after, new_pit_id = await es_repo.get_product_list(
-            search_after=search_after, pit_id=pit_id
+            search_after=page.search_after, pit_id=page.pit_id, use_pit=page.use_pit
         )
     else:
         match = re.match(r"(\D+)(\d+)", category)
@@ -34,26 +43,22 @@ async def get_goods_list_handler(
         ) = await es_repo.get_product_list_by_category(
             category_type=category_type,
             category_id=category_id,
-            search_after=search_after,
-            pit_id=pit_id,
+            search_after=page.search_after,
+            pit_id=page.pit_id,
+            use_pit=page.use_pit,
         )
 
     if goods_list is None:
         goods_list = []
 
-    response = [
-        GetGoodsListResponse(
-            id=goods["id"],
-            brand_name=goods["brand_name"],
-            product_name=goods["product_name"],
-            price=goods["price"],
-            discounted_price=goods["discounted_price"],
-        )
-        for goods in goods_list
-    ]
+    # 목록용 필드(PRODUCT_LIST_FIELDS)만 조회되므로 그대로 응답에 사용
+    response = [GetGoodsListResponse(**goods) for goods in goods_list]
 
     return GetGoodsPageResponse(
-        products=response, next_search_after=next_search_after, pit_id=new_pit_id
+        products=response,
+        next_search_after=next_search_after,
+        pit_id=new_pit_id,
+        cursor=get_next_cursor(page, next_search_after, new_pit_id),
     )
 
 
@@ -75,6 +80,7 @@ async def search_goods_handler(
     keyword: str,
     search_after: list[int] = Query(default=None),
     pit_id: str = Query(default=None),
+    cursor: str = Query(default=None),
     es_repo: ElasticsearchRepository = Depends(ElasticsearchRepository),
 ) -> GetGoodsPageResponse:
     if not keyword:
@@ -82,23 +88,27 @@ async def search_goods_handler(
             status_code=422, detail="Keyword is required and cannot be empty."
         )
 
+    page = get_page_cursor(
+        query=["search", keyword],
+        cursor=cursor,
+        search_after=search_after,
+        pit_id=pit_id,
+    )
+
     goods_list, next_search_after, new_pit_id = await es_repo.search_products(
-        keyword=keyword, search_after=search_after, pit_id=pit_id
+        keyword=keyword,
+        search_after=page.search_after,
+        pit_id=page.pit_id,
+        use_pit=page.use_pit,
     )
 
-    response = [
-        GetGoodsListResponse(
-            id=goods["id"],
-            brand_name=goods["brand_name"],
-            product_name=goods["product_name"],
-            price=goods["price"],
-            discounted_price=goods["discounted_price"],
-        )
-        for goods in goods_list
-    ]
+    response = [GetGoodsListResponse(**goods) for goods in goods_list]
 
     return GetGoodsPageResponse(
-        products=response, next_search_after=next_search_after, pit_id=new_pit_id
+        products=response,
+        next_search_after=next_search_after,
+        pit_id=new_pit_id,
+        cursor=get_next_cursor(page, next_search_after, new_pit_id),
     )
 
 
@@ -2,19 +2,27 @@ import asyncio
 
 from fastapi import Cookie, Depends, HTTPException
 
+from src.models.category import CategoryTree
 from src.models.product import Product
-from src.models.repository import ProductRepository, StockRepository, UserRepository
+from src.models.repository import (
+    CategoryRepository,
+    ProductRepository,
+    StockRepository,
+    UserRepository,
+)
 from src.models.user import User
 from src.schema.request import CreateProductRequest, UpdateProductRequest
 from src.schema.response import GetProductDetailResponse, GetProductResponse
 from src.service.auth import verify_seller, verify_user_can_access_product
 from src.service.background_task import add_product_to_stream
 from src.service.session import SessionService
+from src.service.sync import build_product_document
 
 
 async def create_product_handler(
     request: CreateProductRequest,
     product_repo: ProductRepository = Depends(ProductRepository),
+    category_repo: CategoryRepository = Depends(CategoryRepository),
     stock_repo: StockRepository = Depends(StockRepository),
     user_repo: UserRepository = Depends(UserRepository),
     session_id: str = Cookie(None),
@@ -28,30 +36,16 @@ async def create_product_handler(
     )
     user: User = await user_repo.get_user_by_id(user_id=user_id)
 
+    if await category_repo.get_category_path(request.category_id) is None:
+        raise HTTPException(status_code=400, detail="Invalid category_id.")
+
     request_data: dict = request.model_dump(exclude_unset=True)
     product: Product = Product(seller_id=user.seller.id, **request_data)
     created_product: Product = await product_repo.create_product(product)
 
     created_product: Product = await product_repo.fetch_product(created_product.id)
-    product_info: dict = created_product.model_dump()
-
-    ##### 필요한 추가 정보 입력 #####
-    # 1. 판매자 정보 : 브랜드명, 전화번호
-    product_info["brand_name"] = created_product.seller.brand_name
-    product_info["contact_number"] = created_product.seller.contact_number
-    # 2. 카테고리 정보 : 종류별(대/중/소) 카테고리 ID, 카테고리명
-    # 소분류 (id는 상품 정보에 category_id 필드로 이미 포함되어 있음)
-    product_info["category_3"] = created_product.category.name
-    # 중분류
-    product_info["category_id_2"] = created_product.category.secondary_category.id
-    product_info["category_2"] = created_product.category.secondary_category.name
-    # 대분류
-    product_info[
-        "category_id_1"
-    ] = created_product.category.secondary_category.primary_category.id
-    product_info[
-        "category_1"
-    ] = created_product.category.secondary_category.primary_category.name
+    category_tree: CategoryTree = await category_repo.get_category_tree()
+    product_info: dict = build_product_document(created_product, category_tree)
 
     await asyncio.create_task(
         add_product_to_stream(product_info=product_info, action_type="create")
@@ -87,11 +81,11 @@ async def get_product_by_id_handler(
 
     product: Product | None = await product_repo.get_product_by_id(product_id)
 
-    quantity = await stock_repo.count_stocks_by_product_id(product_id=product.id)
-
     if product is None:
         raise HTTPException(status_code=404, detail="Product Not Found")
 
+    quantity = await stock_repo.get_available_stock(product_id=product.id)
+
     await verify_user_can_access_product(
         seller_id=user.seller.id, product_seller_id=product.seller_id
     )
@@ -117,6 +111,7 @@ async def update_product_handler(
     product_id: int,
     request: UpdateProductRequest,
     product_repo: ProductRepository = Depends(ProductRepository),
+    stock_repo: StockRepository = Depends(StockRepository),
     user_repo: UserRepository = Depends(UserRepository),
     session_id: str = Cookie(None),
     session_service: SessionService = Depends(),
@@ -129,19 +124,31 @@ async def update_product_handler(
     )
     user: User = await user_repo.get_user_by_id(user_id=user_id)
 
-    product: Product | None = await product_repo.get_product_by_id(product_id)
+    product: Product | None = await product_repo.get_product_by_id(
+        product_id, for_update=True
+    )
 
     if product:
         await verify_user_can_access_product(
             seller_id=user.seller.id, product_seller_id=product.seller_id
         )
 
+        previous_quantity: int = product.inventory_quantity
+
         request_data = request.model_dump(exclude_unset=True)
         for key, value in request_data.items():
             if hasattr(product, key) and value is not None:
                 setattr(product, key, value)
 
         updated_product: Product = await product_repo.update_product(product)
+
+        # 재고 수량이 늘어난 경우 늘어난 만큼 일괄 재입고
+        restock_quantity = updated_product.inventory_quantity - previous_quantity
+        if restock_quantity > 0:
+            await stock_repo.create_stocks(
+                product_id=updated_product.id, quantity=restock_quantity
+            )
+
         request_data["id"] = updated_product.id
         await asyncio.create_task(
             add_product_to_stream(product_info=request_data, action_type="update")
@@ -172,7 +179,9 @@ async def delete_product_handler(
     )
     user: User = await user_repo.get_user_by_id(user_id=user_id)
 
-    product: Product | None = await product_repo.get_product_by_id(product_id)
+    product: Product | None = await product_repo.get_product_by_id(
+        product_id, for_update=True
+    )
 
     if not product:
         raise HTTPException(status_code=404, detail="Product Not Found")
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+
+from src.database import create_session
+from src.models.repository import CartRepository, StockRepository
+from src.redis_client import get_redis_client
+from src.service.background_task import replay_dead_letters
+from src.service.category import publish_category_invalidation
+from src.service.product_index import (
+    PRODUCTS_TEMPLATE,
+    PRODUCTS_TEMPLATE_VERSION,
+    get_live_mapping_meta,
+    get_sync_index,
+    is_current_mapping,
+    put_products_template,
+    reindex_products,
+)
+from src.service.sync import sync_all_products
+
+
+async def migrate_cart(args: argparse.Namespace) -> None:
+    cart_repo = CartRepository(get_redis_client())
+    migrated = await cart_repo.migrate_legacy_cart_keys()
+    print(f"Migrated {migrated} legacy cart keys")
+
+
+async def reconcile_stock(args: argparse.Namespace) -> None:
+    async with create_session() as session:
+        stock_repo = StockRepository(session, get_redis_client())
+        drifted = await stock_repo.reconcile_available_stocks()
+    print(f"Reconciled available stock counters ({drifted} drifted)")
+
+
+async def invalidate_categories(args: argparse.Namespace) -> None:
+    await publish_category_invalidation()
+    print("Published category cache invalidation")
+
+
+async def sync_products(args: argparse.Namespace) -> None:
+    try:
+        index = args.index or await get_sync_index()
+    except RuntimeError as e:
+        raise SystemExit(f"sync-products: {e}")
+
+    report = await sync_all_products(
+        index=index, chunk_size=args.chunk_size, concurrency=args.concurrency
+    )
+    print(
+        f"Synced {report.indexed} products, {report.failed} failed "
+        f"in {report.elapsed:.1f}s ({report.docs_per_sec:.0f} docs/sec)"
+    )
+
+
+async def reindex(args: argparse.Namespace) -> None:
+    report = await reindex_products(
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        delete_old=args.delete_old,
+    )
+    print(
+        f"Reindexed {report.indexed} products ({report.skipped} already up to date) "
+        f"in {report.elapsed:.1f}s ({report.docs_per_sec:.0f} docs/sec)"
+    )
+
+
+async def put_template(args: argparse.Namespace) -> None:
+    if await put_products_template():
+        print(f"Put {PRODUCTS_TEMPLATE} v{PRODUCTS_TEMPLATE_VERSION}")
+
+    live_meta = await get_live_mapping_meta()
+    if live_meta is not None and is_current_mapping(live_meta):
+        print("Live index already uses the current mapping")
+    elif args.reindex:
+        await reindex(args)
+    elif live_meta is None:
+        print("No products index yet; run reindex-products to create one")
+    else:
+        print(
+            f"Live index uses mapping v{live_meta.get('version', 0)} "
+            f"(analysis {live_meta.get('analysis')}); "
+            "run reindex-products to apply the current mapping"
+        )
+
+
+async def replay_dead_letter_tasks(args: argparse.Namespace) -> None:
+    replayed = await replay_dead_letters(limit=args.limit, task_type=args.type)
+    print(f"Replayed {replayed} dead-letter tasks")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("migrate-cart", help="이전 형식의 장바구니 키를 새 구조로 이전").set_defaults(
+        handler=migrate_cart
+    )
+
+    subparsers.add_parser(
+        "reconcile-stock", help="stocks 테이블 기준으로 가용 재고 카운터 보정"
+    ).set_defaults(handler=reconcile_stock)
+
+    subparsers.add_parser(
+        "invalidate-categories", help="모든 프로세스의 카테고리 캐시 무효화"
+    ).set_defaults(handler=invalidate_categories)
+
+    sync_parser = subparsers.add_parser(
+        "sync-products", help="전체 상품을 Elasticsearch에 다시 색인"
+    )
+    sync_parser.add_argument("--index", help="색인할 인덱스 (기본값: 쓰기 alias가 가리키는 인덱스)")
+    sync_parser.add_argument("--chunk-size", type=int, default=500)
+    sync_parser.add_argument("--concurrency", type=int, default=4)
+    sync_parser.set_defaults(handler=sync_products)
+
+    reindex_parser = subparsers.add_parser(
+        "reindex-products", help="새 버전의 인덱스로 전체 재색인 후 alias 전환"
+    )
+    reindex_parser.add_argument("--chunk-size", type=int, default=500)
+    reindex_parser.add_argument("--concurrency", type=int, default=4)
+    reindex_parser.add_argument(
+        "--delete-old", action="store_true", help="alias 전환 후 이전 인덱스 삭제"
+    )
+    reindex_parser.set_defaults(handler=reindex)
+
+    template_parser = subparsers.add_parser(
+        "put-products-template", help="상품 인덱스 템플릿(매핑/분석기) 생성 또는 갱신"
+    )
+    template_parser.add_argument(
+        "--reindex", action="store_true", help="조회 인덱스의 매핑이 이전 버전이면 재색인"
+    )
+    template_parser.add_argument("--chunk-size", type=int, default=500)
+    template_parser.add_argument("--concurrency", type=int, default=4)
+    template_parser.add_argument(
+        "--delete-old", action="store_true", help="alias 전환 후 이전 인덱스 삭제"
+    )
+    template_parser.set_defaults(handler=put_template)
+
+    replay_parser = subparsers.add_parser(
+        "replay-dead-letters", help="dead-letter stream의 작업을 다시 처리하도록 task_stream에 추가"
+    )
+    replay_parser.add_argument("--limit", type=int)
+    replay_parser.add_argument("--type", help="지정한 종류의 작업만 다시 처리")
+    replay_parser.set_defaults(handler=replay_dead_letter_tasks)
+
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,39 @@
 import os
+from typing import Literal, Optional
 
-from pydantic import Field
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
 
 class DatabaseConfig(BaseSettings):
     url: str = Field(default=os.getenv("DATABASE_URL"), alias="DATABASE_URL")
     echo: bool = Field(default=os.getenv("DATABASE_ECHO"), alias="DATABASE_ECHO")
+    # 지정하면 읽기 전용 조회를 replica로 보냄
+    replica_url: Optional[str] = Field(
+        default=os.getenv("DATABASE_REPLICA_URL"), alias="DATABASE_REPLICA_URL"
+    )
+    # 지정하지 않으면 DB 종류에 맞는 기본값을 사용
+    pool_class: Optional[Literal["static", "null", "queue"]] = Field(
+        default=os.getenv("DATABASE_POOL_CLASS"), alias="DATABASE_POOL_CLASS"
+    )
+    pool_size: int = Field(
+        default=os.getenv("DATABASE_POOL_SIZE", 10), alias="DATABASE_POOL_SIZE"
+    )
+    max_overflow: int = Field(
+        default=os.getenv("DATABASE_MAX_OVERFLOW", 20), alias="DATABASE_MAX_OVERFLOW"
+    )
+    pool_timeout: float = Field(
+        default=os.getenv("DATABASE_POOL_TIMEOUT", 30), alias="DATABASE_POOL_TIMEOUT"
+    )
+    pool_recycle: int = Field(
+        default=os.getenv("DATABASE_POOL_RECYCLE", 1800), alias="DATABASE_POOL_RECYCLE"
+    )
+
+    @field_validator("pool_class", mode="before")
+    @classmethod
+    def empty_pool_class_as_default(cls, value: Optional[str]) -> Optional[str]:
+        # DATABASE_POOL_CLASS=""는 지정하지 않은 것으로 처리
+        return value or None
 
 
 class CORSConfig(BaseSettings):
@@ -21,6 +48,10 @@ class CORSConfig(BaseSettings):
 class WebConfig(BaseSettings):
     host: str = Field(default=os.getenv("WEB_HOST"), alias="WEB_HOST")
     port: int = Field(default=os.getenv("WEB_PORT"), alias="WEB_PORT")
+    # 상품 목록/검색 cursor 서명 키 (API 프로세스가 여러 개면 모두 같은 값으로 설정)
+    cursor_secret: Optional[str] = Field(
+        default=os.getenv("WEB_CURSOR_SECRET"), alias="WEB_CURSOR_SECRET"
+    )
 
 
 class RedisConfig(BaseSettings):
@@ -32,6 +63,155 @@ class RedisConfig(BaseSettings):
     task_db: str = Field(default=os.getenv("REDIS_TASK_DB"), alias="REDIS_TASK_DB")
 
 
+class TaskWorkerConfig(BaseSettings):
+    # API 프로세스 안에서 작업을 처리할지 여부 (별도의 워커를 사용하면 false)
+    embedded_consumer: bool = Field(
+        default=os.getenv("TASK_EMBEDDED_CONSUMER", True),
+        alias="TASK_EMBEDDED_CONSUMER",
+    )
+    # 별도 워커(python -m src.worker)의 프로세스 수 및 health/metrics 서버 주소
+    processes: int = Field(
+        default=os.getenv("TASK_WORKER_PROCESSES", 1), alias="TASK_WORKER_PROCESSES"
+    )
+    host: str = Field(
+        default=os.getenv("TASK_WORKER_HOST", "0.0.0.0"), alias="TASK_WORKER_HOST"
+    )
+    port: int = Field(
+        default=os.getenv("TASK_WORKER_PORT", 8001), alias="TASK_WORKER_PORT"
+    )
+    # 종료 신호를 받은 뒤 처리 중인 작업을 마칠 때까지 기다리는 최대 시간 (초)
+    drain_timeout: float = Field(
+        default=os.getenv("TASK_DRAIN_TIMEOUT", 30), alias="TASK_DRAIN_TIMEOUT"
+    )
+    # 한 번의 XREADGROUP으로 읽어올 최대 메시지 수
+    batch_size: int = Field(
+        default=os.getenv("TASK_BATCH_SIZE", 100), alias="TASK_BATCH_SIZE"
+    )
+    # 이메일 lane에서 한 번에 읽어올 최대 메시지 수
+    email_batch_size: int = Field(
+        default=os.getenv("TASK_EMAIL_BATCH_SIZE", 20), alias="TASK_EMAIL_BATCH_SIZE"
+    )
+    # lane별로 동시에 처리하는 최대 메시지 수 (0이면 제한하지 않음)
+    # 이메일 lane이 0이면 SMTP 연결 풀이 한 번에 전송할 수 있는 만큼 (SMTP_POOL_SIZE * SMTP_BATCH_SIZE)
+    product_concurrency: int = Field(
+        default=os.getenv("TASK_PRODUCT_CONCURRENCY", 100),
+        alias="TASK_PRODUCT_CONCURRENCY",
+    )
+    email_concurrency: int = Field(
+        default=os.getenv("TASK_EMAIL_CONCURRENCY", 0), alias="TASK_EMAIL_CONCURRENCY"
+    )
+    legacy_concurrency: int = Field(
+        default=os.getenv("TASK_LEGACY_CONCURRENCY", 100),
+        alias="TASK_LEGACY_CONCURRENCY",
+    )
+    # 새 메시지가 없을 때 XREADGROUP이 대기하는 시간 (ms)
+    block_ms: int = Field(
+        default=os.getenv("TASK_BLOCK_MS", 1000), alias="TASK_BLOCK_MS"
+    )
+    # stream 메시지 인코딩 형식 ("1": json, "2": orjson, "3": orjson + zlib)
+    payload_version: Literal["1", "2", "3"] = Field(
+        default=os.getenv("TASK_PAYLOAD_VERSION", "2"), alias="TASK_PAYLOAD_VERSION"
+    )
+    # 인코딩 결과가 이 크기(byte) 이상이면 zlib으로 압축 (0이면 압축하지 않음)
+    payload_compress_min_bytes: int = Field(
+        default=os.getenv("TASK_PAYLOAD_COMPRESS_MIN_BYTES", 1024),
+        alias="TASK_PAYLOAD_COMPRESS_MIN_BYTES",
+    )
+    # 실패한 작업의 최대 재시도 횟수 (초과하면 dead-letter stream으로 이동)
+    max_retries: int = Field(
+        default=os.getenv("TASK_MAX_RETRIES", 5), alias="TASK_MAX_RETRIES"
+    )
+    # 재시도 대기 시간 (ms, 재시도할 때마다 두 배로 증가)
+    retry_base_ms: int = Field(
+        default=os.getenv("TASK_RETRY_BASE_MS", 1000), alias="TASK_RETRY_BASE_MS"
+    )
+    retry_max_ms: int = Field(
+        default=os.getenv("TASK_RETRY_MAX_MS", 300000), alias="TASK_RETRY_MAX_MS"
+    )
+    # dead-letter stream의 최대 길이 (근사값)
+    dead_letter_maxlen: int = Field(
+        default=os.getenv("TASK_DEAD_LETTER_MAXLEN", 10000),
+        alias="TASK_DEAD_LETTER_MAXLEN",
+    )
+    # 처리가 끝난 메시지를 task_stream에서 삭제하는 주기 (초) / 삭제하지 않고 보존하는 기간 (ms)
+    stream_trim_interval: float = Field(
+        default=os.getenv("TASK_STREAM_TRIM_INTERVAL", 60),
+        alias="TASK_STREAM_TRIM_INTERVAL",
+    )
+    stream_retention_ms: int = Field(
+        default=os.getenv("TASK_STREAM_RETENTION_MS", 0),
+        alias="TASK_STREAM_RETENTION_MS",
+    )
+    # 처리되지 않은 채 이 시간(ms) 이상 방치된 메시지는 다른 consumer가 회수
+    claim_min_idle_ms: int = Field(
+        default=os.getenv("TASK_CLAIM_MIN_IDLE_MS", 60000),
+        alias="TASK_CLAIM_MIN_IDLE_MS",
+    )
+    # 방치된 메시지 회수 주기 (초)
+    claim_interval: float = Field(
+        default=os.getenv("TASK_CLAIM_INTERVAL", 30), alias="TASK_CLAIM_INTERVAL"
+    )
+    # pending 메시지 없이 이 시간(ms) 이상 읽지 않은 consumer는 그룹에서 삭제
+    stale_consumer_ms: int = Field(
+        default=os.getenv("TASK_STALE_CONSUMER_MS", 3600000),
+        alias="TASK_STALE_CONSUMER_MS",
+    )
+    # 상품 동기화 이벤트를 모아 보내는 _bulk 요청의 최대 action 수 / 최대 대기 시간 (ms)
+    bulk_size: int = Field(
+        default=os.getenv("TASK_BULK_SIZE", 500), alias="TASK_BULK_SIZE"
+    )
+    bulk_flush_ms: int = Field(
+        default=os.getenv("TASK_BULK_FLUSH_MS", 100), alias="TASK_BULK_FLUSH_MS"
+    )
+    # 같은 상품의 동기화 이벤트를 하나로 합치기 위해 대기하는 시간 (ms)
+    coalesce_window_ms: int = Field(
+        default=os.getenv("TASK_COALESCE_WINDOW_MS", 100),
+        alias="TASK_COALESCE_WINDOW_MS",
+    )
+    # 이벤트 종류별 _bulk refresh 옵션 ("false", "true", "wait_for")
+    sync_refresh: str = Field(
+        default=os.getenv("TASK_SYNC_REFRESH", "false"), alias="TASK_SYNC_REFRESH"
+    )
+    sync_action_refresh: str = Field(
+        default=os.getenv("TASK_SYNC_ACTION_REFRESH", "false"),
+        alias="TASK_SYNC_ACTION_REFRESH",
+    )
+
+
+class SMTPConfig(BaseSettings):
+    server: Optional[str] = Field(default=os.getenv("SMTP_SERVER"), alias="SMTP_SERVER")
+    port: Optional[int] = Field(default=os.getenv("SMTP_PORT"), alias="SMTP_PORT")
+    user: Optional[str] = Field(default=os.getenv("SMTP_USER"), alias="SMTP_USER")
+    password: Optional[str] = Field(
+        default=os.getenv("SMTP_PASSWORD"), alias="SMTP_PASSWORD"
+    )
+    # STARTTLS 사용 여부 (지정하지 않으면 서버가 지원할 때 사용)
+    start_tls: Optional[bool] = Field(
+        default=os.getenv("SMTP_START_TLS"), alias="SMTP_START_TLS"
+    )
+    # 동시에 유지하는 SMTP 연결 수
+    pool_size: int = Field(
+        default=os.getenv("SMTP_POOL_SIZE", 2), alias="SMTP_POOL_SIZE"
+    )
+    # 하나의 연결에서 연속으로 전송하는 최대 메일 수 / 메일을 모으는 최대 대기 시간 (ms)
+    batch_size: int = Field(
+        default=os.getenv("SMTP_BATCH_SIZE", 20), alias="SMTP_BATCH_SIZE"
+    )
+    batch_window_ms: int = Field(
+        default=os.getenv("SMTP_BATCH_WINDOW_MS", 100), alias="SMTP_BATCH_WINDOW_MS"
+    )
+    # 초당 최대 전송 수 (0이면 제한하지 않음)
+    rate_limit: float = Field(
+        default=os.getenv("SMTP_RATE_LIMIT", 0), alias="SMTP_RATE_LIMIT"
+    )
+
+    @field_validator("start_tls", mode="before")
+    @classmethod
+    def empty_start_tls_as_auto(cls, value: Optional[str]) -> Optional[str]:
+        # SMTP_START_TLS=""는 지정하지 않은 것으로 처리
+        return value or None
+
+
 class ElasticsearchConfig(BaseSettings):
     host: str = Field(
         default=os.getenv("ELASTICSEARCH_HOST"), alias="ELASTICSEARCH_HOST"
@@ -45,6 +225,45 @@ class ElasticsearchConfig(BaseSettings):
     ca_certs: str = Field(
         default=os.getenv("ELASTICSEARCH_CA_CERT"), alias="ELASTICSEARCH_CA_CERT"
     )
+    # 상품명/브랜드명/성분 검색 분석기 (한국어 형태소 분석: analysis-nori 플러그인 설치 후 nori_tokenizer)
+    product_tokenizer: str = Field(
+        default=os.getenv("ELASTICSEARCH_PRODUCT_TOKENIZER", "standard"),
+        alias="ELASTICSEARCH_PRODUCT_TOKENIZER",
+    )
+    # 쉼표로 구분한 token filter 목록 (순서대로 적용)
+    product_token_filters: str = Field(
+        default=os.getenv("ELASTICSEARCH_PRODUCT_TOKEN_FILTERS", "lowercase"),
+        alias="ELASTICSEARCH_PRODUCT_TOKEN_FILTERS",
+    )
+    # PIT(point in time) keep_alive (초), 요청이 없으면 Elasticsearch가 이 시간 후 닫음
+    pit_keep_alive: int = Field(
+        default=os.getenv("ELASTICSEARCH_PIT_KEEP_ALIVE", 120),
+        alias="ELASTICSEARCH_PIT_KEEP_ALIVE",
+    )
+    # 같은 형태의 첫 페이지 요청이 하나의 PIT을 공유하는 시간 (초)
+    pit_share_seconds: int = Field(
+        default=os.getenv("ELASTICSEARCH_PIT_SHARE_SECONDS", 30),
+        alias="ELASTICSEARCH_PIT_SHARE_SECONDS",
+    )
+    # 이 시간 동안 사용되지 않은 PIT은 keep_alive 전이라도 닫음 (초)
+    pit_idle_seconds: int = Field(
+        default=os.getenv("ELASTICSEARCH_PIT_IDLE_SECONDS", 60),
+        alias="ELASTICSEARCH_PIT_IDLE_SECONDS",
+    )
+    # 프로세스당 동시에 열어 둘 수 있는 최대 PIT 수
+    pit_max_open: int = Field(
+        default=os.getenv("ELASTICSEARCH_PIT_MAX_OPEN", 200),
+        alias="ELASTICSEARCH_PIT_MAX_OPEN",
+    )
+    # 이 페이지까지는 PIT 없이 search_after로만 조회
+    shallow_pages: int = Field(
+        default=os.getenv("ELASTICSEARCH_SHALLOW_PAGES", 3),
+        alias="ELASTICSEARCH_SHALLOW_PAGES",
+    )
+    pit_cleanup_interval: int = Field(
+        default=os.getenv("ELASTICSEARCH_PIT_CLEANUP_INTERVAL", 10),
+        alias="ELASTICSEARCH_PIT_CLEANUP_INTERVAL",
+    )
 
 
 db = DatabaseConfig()
@@ -52,3 +271,5 @@ cors = CORSConfig()
 web = WebConfig()
 redis = RedisConfig()
 es = ElasticsearchConfig()
+smtp = SMTPConfig()
+worker = TaskWorkerConfig()
@@ -1,15 +1,160 @@
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlmodel import SQLModel, pool
+import time
+from typing import Optional
+
+from sqlalchemy import Select, event, exc, make_url, pool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src import config
+from src.metrics import register_collector
+
+POOL_CLASSES = {
+    "static": pool.StaticPool,
+    "null": pool.NullPool,
+    "queue": pool.AsyncAdaptedQueuePool,
+}
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float):
+        self.wait_seconds_total += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def on_checkout(self, *args):
+        self.checkouts += 1
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def on_checkin(self, *args):
+        self.in_use -= 1
+
+    def to_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                self.wait_seconds_total / self.checkouts * 1000
+                if self.checkouts
+                else 0.0
+            ),
+            "max_wait_ms": self.max_wait_seconds * 1000,
+        }
+
+
+def instrument_pool(pool_class: type[pool.Pool], metrics: PoolMetrics) -> type:
+    """커넥션을 얻기까지 대기한 시간을 기록하도록 풀 클래스를 감쌉니다."""
+
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                metrics.timeouts += 1
+                raise
+            finally:
+                metrics.record_wait(time.perf_counter() - start)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def get_pool_options(db_config: config.DatabaseConfig) -> dict:
+    url = make_url(db_config.url)
+
+    if db_config.pool_class:
+        pool_class = POOL_CLASSES[db_config.pool_class]
+    elif url.get_backend_name() == "sqlite":
+        # 메모리 DB는 하나의 커넥션을 공유해야 하고, 파일 DB는 커넥션 생성 비용이 작음
+        is_memory = url.database in (None, "", ":memory:")
+        pool_class = pool.StaticPool if is_memory else pool.NullPool
+    else:
+        pool_class = pool.AsyncAdaptedQueuePool
 
-engine = create_async_engine(
-    config.db.url,
-    echo=config.db.echo,
-    poolclass=pool.StaticPool,
+    options = {"poolclass": pool_class}
+    if issubclass(pool_class, pool.QueuePool):
+        options.update(
+            pool_size=db_config.pool_size,
+            max_overflow=db_config.max_overflow,
+            pool_timeout=db_config.pool_timeout,
+            pool_recycle=db_config.pool_recycle,
+            pool_pre_ping=True,
+        )
+    return options
+
+
+def create_engine(db_config: config.DatabaseConfig, metrics_name: str):
+    metrics = PoolMetrics()
+    options = get_pool_options(db_config)
+    options["poolclass"] = instrument_pool(options["poolclass"], metrics)
+
+    async_engine = create_async_engine(db_config.url, echo=db_config.echo, **options)
+    event.listen(async_engine.sync_engine, "checkout", metrics.on_checkout)
+    event.listen(async_engine.sync_engine, "checkin", metrics.on_checkin)
+
+    register_collector(
+        metrics_name,
+        lambda: {"pool": async_engine.pool.status(), **metrics.to_dict()},
+    )
+    return async_engine
+
+
+engine = create_engine(config.db, metrics_name="db_pool")
+replica_engine: Optional[AsyncEngine] = (
+    create_engine(
+        config.db.model_copy(update={"url": config.db.replica_url}),
+        metrics_name="db_replica_pool",
+    )
+    if config.db.replica_url
+    else None
 )
 
 
+class RoutingSession(Session):
+    """
+    읽기 전용 조회는 replica로, 그 외 모든 쿼리는 primary로 보냅니다.
+    세션에서 한 번 쓰기가 일어나면 이후 조회도 primary에서 수행합니다. (read-after-write)
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("use_primary"):
+            return engine.sync_engine
+
+        if self._flushing or (clause is not None and not is_replica_readable(clause)):
+            self.info["use_primary"] = True
+            return engine.sync_engine
+
+        if clause is None:
+            return engine.sync_engine
+        return replica_engine.sync_engine
+
+
+def is_replica_readable(clause) -> bool:
+    if not isinstance(clause, Select):
+        return False
+    if clause._for_update_arg is not None:
+        return False
+    # select(...).execution_options(use_primary=True)로 primary 조회를 강제할 수 있음
+    return not clause.get_execution_options().get("use_primary", False)
+
+
+def create_session() -> AsyncSession:
+    if replica_engine is None:
+        return AsyncSession(engine)
+    return AsyncSession(sync_session_class=RoutingSession)
+
+
 async def create_db_and_tables() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
@@ -17,3 +162,5 @@ async def create_db_and_tables() -> None:
 
 async def close_db() -> None:
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
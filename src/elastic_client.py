@@ -2,6 +2,12 @@ from elasticsearch import AsyncElasticsearch
 
 from src.config import es as es_config
 
+# 상품 인덱스는 products_v{n} 형태로 버전 관리되며, alias를 통해 접근
+# - PRODUCTS_ALIAS : 조회용 alias (항상 하나의 인덱스를 가리킴)
+# - PRODUCTS_WRITE_ALIAS : 쓰기용 alias (재색인 중에는 기존/신규 인덱스를 모두 가리킴)
+PRODUCTS_ALIAS = "products"
+PRODUCTS_WRITE_ALIAS = "products_write"
+
 es_client = AsyncElasticsearch(
     hosts=[es_config.host],
     http_auth=(es_config.username, es_config.password),
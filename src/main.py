@@ -4,30 +4,21 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from redis.exceptions import ResponseError
 
 from src import config
 from src.apis.common import common_router
 from src.apis.store import store_router
 from src.apis.user import user_router
 from src.database import close_db, create_db_and_tables
-from src.redis_client import get_task_redis_client
-from src.service.background_task import process_tasks
-
-
-async def create_consumer_group(stream_name: str, group_name: str):
-    task_redis = get_task_redis_client()
-
-    try:
-        await task_redis.xgroup_create(stream_name, group_name, id="0", mkstream=True)
-    except ResponseError as e:
-        if "BUSYGROUP Consumer Group name already exists" not in str(e):
-            raise e
+from src.pit import close_idle_pits, pit_manager
+from src.service.background_task import create_consumer_group, mailer, process_tasks
+from src.service.category import listen_category_events
+from src.service.cursor import check_cursor_secret
+from src.service.stream_maintenance import maintain_task_streams
 
 
 async def stop_background_tasks(app: FastAPI):
-    task = app.state.stream_task
-    if task:
+    for task in app.state.background_tasks:
         task.cancel()
         try:
             await task
@@ -39,22 +30,41 @@ async def stop_background_tasks(app: FastAPI):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # cursor 서명 키 확인 (설정하지 않았으면 경고)
+    check_cursor_secret()
+
     # DB 및 테이블 생성
     await create_db_and_tables()
 
     # 상품 정보 동기화
     # await sync_all_products()
 
-    # Redis에서 consumer 그룹 생성
-    await create_consumer_group(stream_name="task_stream", group_name="task_group")
-
     # 백그라운드 작업 실행
     loop = asyncio.get_event_loop()
-    app.state.stream_task = loop.create_task(process_tasks())
+    app.state.background_tasks = [
+        # 카테고리 변경 이벤트 수신 (카테고리 트리 캐시 무효화)
+        loop.create_task(listen_category_events()),
+        # 사용되지 않는 상품 목록/검색 PIT 정리
+        loop.create_task(close_idle_pits()),
+    ]
+
+    # 별도의 워커(python -m src.worker)를 사용하면 API 프로세스에서는 작업을 처리하지 않음
+    if config.worker.embedded_consumer:
+        # Redis에서 consumer 그룹 생성
+        await create_consumer_group()
+        app.state.background_tasks.extend(
+            [
+                loop.create_task(process_tasks()),
+                # 처리가 끝난 메시지 삭제 및 stream 상태 기록
+                loop.create_task(maintain_task_streams()),
+            ]
+        )
 
     yield
 
     await stop_background_tasks(app)
+    await pit_manager.close_all()
+    await mailer.close()
 
     await close_db()
 
@@ -0,0 +1,12 @@
+from typing import Callable
+
+# 이름별 지표 수집 함수 (GET /metrics 응답에 포함됨)
+collectors: dict[str, Callable[[], dict]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], dict]) -> None:
+    collectors[name] = collector
+
+
+def collect_metrics() -> dict:
+    return {name: collector() for name, collector in collectors.items()}
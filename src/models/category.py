@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Optional
+
+from src.models.product import PrimaryCategory, SecondaryCategory, TertiaryCategory
+
+
+@dataclass(frozen=True)
+class CategoryPath:
+    primary_id: int
+    primary_name: str
+    secondary_id: int
+    secondary_name: str
+    tertiary_id: int
+    tertiary_name: str
+
+
+class CategoryTree:
+    """
+    대/중/소 카테고리 전체를 담는 읽기 전용 구조입니다.
+
+    - paths : 소분류 ID -> 대/중/소 경로
+    - descendants : 종류별 카테고리 ID -> 하위 소분류 ID 집합
+    - nodes : GET /categories 응답용 트리
+    """
+
+    def __init__(
+        self,
+        primary_categories: Iterable[PrimaryCategory],
+        secondary_categories: Iterable[SecondaryCategory],
+        tertiary_categories: Iterable[TertiaryCategory],
+    ):
+        primaries = {category.id: category for category in primary_categories}
+        secondaries = {category.id: category for category in secondary_categories}
+
+        paths: dict[int, CategoryPath] = {}
+        primary_descendants: dict[int, set[int]] = {id_: set() for id_ in primaries}
+        secondary_descendants: dict[int, set[int]] = {id_: set() for id_ in secondaries}
+        children: dict[int, list[dict]] = {id_: [] for id_ in secondaries}
+
+        for tertiary in sorted(tertiary_categories, key=lambda category: category.id):
+            secondary = secondaries[tertiary.secondary_category_id]
+            primary = primaries[secondary.primary_category_id]
+
+            paths[tertiary.id] = CategoryPath(
+                primary_id=primary.id,
+                primary_name=primary.name,
+                secondary_id=secondary.id,
+                secondary_name=secondary.name,
+                tertiary_id=tertiary.id,
+                tertiary_name=tertiary.name,
+            )
+            primary_descendants[primary.id].add(tertiary.id)
+            secondary_descendants[secondary.id].add(tertiary.id)
+            children[secondary.id].append(
+                {"id": tertiary.id, "name": tertiary.name, "children": []}
+            )
+
+        self.paths = MappingProxyType(paths)
+        self.descendants = MappingProxyType(
+            {
+                "primary": MappingProxyType(
+                    {id_: frozenset(ids) for id_, ids in primary_descendants.items()}
+                ),
+                "secondary": MappingProxyType(
+                    {id_: frozenset(ids) for id_, ids in secondary_descendants.items()}
+                ),
+                "tertiary": MappingProxyType({id_: frozenset([id_]) for id_ in paths}),
+            }
+        )
+        self.nodes = tuple(
+            {
+                "id": primary.id,
+                "name": primary.name,
+                "children": [
+                    {
+                        "id": secondary.id,
+                        "name": secondary.name,
+                        "children": children[secondary.id],
+                    }
+                    for secondary in sorted(
+                        secondaries.values(), key=lambda category: category.id
+                    )
+                    if secondary.primary_category_id == primary.id
+                ],
+            }
+            for primary in sorted(primaries.values(), key=lambda category: category.id)
+        )
+
+    def get_path(self, tertiary_id: int) -> Optional[CategoryPath]:
+        return self.paths.get(tertiary_id)
+
+    def get_tertiary_ids(
+        self, category_type: str, category_id: int
+    ) -> Optional[frozenset[int]]:
+        """카테고리 종류가 올바르지 않으면 None을 반환합니다."""
+        descendants = self.descendants.get(category_type)
+        if descendants is None:
+            return None
+        return descendants.get(category_id, frozenset())
@@ -1,14 +1,18 @@
-from typing import List, Optional, TypeVar
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional, TypeVar
 
-from elasticsearch import AsyncElasticsearch
+from elasticsearch import AsyncElasticsearch, NotFoundError
 from fastapi import Depends
 from redis.asyncio import Redis
+from sqlalchemy import event, insert, update
 from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import SQLModel, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.apis.dependencies import get_session
-from src.elastic_client import get_elasticsearch_client
+from src.elastic_client import PRODUCTS_ALIAS, get_elasticsearch_client
+from src.models.category import CategoryPath, CategoryTree
 from src.models.product import (
     PrimaryCategory,
     Product,
@@ -18,6 +22,7 @@ from src.models.product import (
     TertiaryCategory,
 )
 from src.models.user import Seller, User
+from src.pit import PITManager, get_pit_manager
 from src.redis_client import get_redis_client
 
 T = TypeVar("T", bound=SQLModel)
@@ -38,40 +43,36 @@ class ProductRepository:
     async def get_product_list_by_category(
         self, category_type: str, category_id: int
     ) -> Optional[List[Product]]:
-        query = select(Product).options(
-            selectinload(Product.seller).load_only(Seller.brand_name)
+        category_tree = await CategoryRepository(self.session).get_category_tree()
+        category_ids = category_tree.get_tertiary_ids(
+            category_type=category_type, category_id=category_id
         )
-
-        if category_type == "primary":
-            query = (
-                query.join(TertiaryCategory)
-                .join(SecondaryCategory)
-                .join(PrimaryCategory)
-                .where(PrimaryCategory.id == category_id)
-            )
-        elif category_type == "secondary":
-            query = (
-                query.join(TertiaryCategory)
-                .join(SecondaryCategory)
-                .where(SecondaryCategory.id == category_id)
-            )
-        elif category_type == "tertiary":
-            query = query.join(TertiaryCategory).where(
-                TertiaryCategory.id == category_id
-            )
-        else:
+        if not category_ids:
             return None
 
-        result = await self.session.exec(query)
+        result = await self.session.exec(
+            select(Product)
+            .where(Product.category_id.in_(category_ids))
+            .options(selectinload(Product.seller).load_only(Seller.brand_name))
+        )
         result = list(result.all())
         return result if result else None
 
-    async def get_product_by_id(self, product_id: int) -> Product:
-        result = await self.session.exec(
+    async def get_product_by_id(
+        self, product_id: int, for_update: bool = False
+    ) -> Product:
+        """
+        for_update=True이면 수정/삭제를 위해 primary에서 행을 잠그고 조회합니다.
+        (replica의 지연된 값으로 다른 컬럼을 덮어쓰거나 재입고 수량을 잘못 계산하지 않도록)
+        """
+        query = (
             select(Product)
             .where(Product.id == product_id, Product.use_status == True)
             .options(joinedload(Product.category), joinedload(Product.seller))
         )
+        if for_update:
+            query = query.with_for_update(of=Product)
+        result = await self.session.exec(query)
         return result.one_or_none()
 
     async def create_product(self, product: Product) -> Product:
@@ -90,31 +91,36 @@ class ProductRepository:
         product.use_status = False
         await self.session.commit()
 
-    async def fetch_all_products(self) -> List[Product]:
-        async with self.session as session:
-            result = await session.exec(
-                select(Product).options(
-                    joinedload(Product.seller),
-                    selectinload(Product.category)
-                    .joinedload(TertiaryCategory.secondary_category)
-                    .joinedload(SecondaryCategory.primary_category),
-                )
-            )
-            return list(result.all())
+    async def stream_all_products(
+        self, chunk_size: int = 500
+    ) -> AsyncIterator[List[Product]]:
+        """전체 상품을 서버 측 커서로 chunk_size개씩 나누어 읽습니다."""
+        result = await self.session.stream_scalars(
+            select(Product)
+            .options(joinedload(Product.seller))
+            .execution_options(yield_per=chunk_size)
+        )
+        async for products in result.partitions():
+            yield list(products)
 
     async def fetch_product(self, product_id: int) -> Product:
         result = await self.session.exec(
             select(Product)
             .where(Product.id == product_id)
-            .options(
-                joinedload(Product.seller),
-                selectinload(Product.category)
-                .joinedload(TertiaryCategory.secondary_category)
-                .joinedload(SecondaryCategory.primary_category),
-            )
+            .options(joinedload(Product.seller))
         )
         return result.one_or_none()
 
+    async def fetch_products(self, product_ids: List[int]) -> List[Product]:
+        # 방금 변경된 상품을 다시 색인할 때 사용하므로 primary에서 조회
+        result = await self.session.exec(
+            select(Product)
+            .where(Product.id.in_(product_ids))
+            .options(joinedload(Product.seller))
+            .execution_options(use_primary=True)
+        )
+        return list(result.all())
+
     async def get_product_stock(self, product_id: int) -> Optional[int]:
         result = await self.session.exec(
             select(Product.inventory_quantity).where(
@@ -124,26 +130,185 @@ class ProductRepository:
         return result.one_or_none()
 
 
-class StockRepository:
+class CategoryRepository:
+    # 프로세스 내 카테고리 트리 캐시 (카테고리 변경 이벤트를 받으면 무효화)
+    category_tree: Optional[CategoryTree] = None
+    # 무효화될 때마다 증가 (로드 중에 무효화되면 로드 결과를 캐시하지 않기 위함)
+    generation: int = 0
+    lock = asyncio.Lock()
+
     def __init__(self, session: AsyncSession = Depends(get_session)):
         self.session = session
 
-    async def create_stocks(self, product_id: int, quantity: int):
-        stock_list = [
-            Stock(product_id=product_id, status=StatusType.AVAILABLE)
-            for _ in range(quantity)
-        ]
-        self.session.add_all(stock_list)
+    async def get_category_tree(self) -> CategoryTree:
+        category_tree = CategoryRepository.category_tree
+        if category_tree is not None:
+            return category_tree
+
+        async with CategoryRepository.lock:
+            if CategoryRepository.category_tree is not None:
+                return CategoryRepository.category_tree
+
+            generation = CategoryRepository.generation
+            category_tree = await self.load_category_tree()
+            # 로드하는 동안 무효화되었다면 변경 전 상태일 수 있으므로 이번 요청에만 사용
+            if generation == CategoryRepository.generation:
+                CategoryRepository.category_tree = category_tree
+            return category_tree
+
+    async def get_category_path(self, tertiary_id: int) -> Optional[CategoryPath]:
+        """
+        소분류의 대/중/소분류 경로를 반환합니다.
+        캐시된 이후 추가된 카테고리일 수 있으므로 캐시에 없으면 한 번 다시 로드합니다.
+        """
+        category_path = (await self.get_category_tree()).get_path(tertiary_id)
+        if category_path is None:
+            CategoryRepository.invalidate_cache()
+            category_path = (await self.get_category_tree()).get_path(tertiary_id)
+        return category_path
+
+    async def load_category_tree(self) -> CategoryTree:
+        primary_categories = await self.session.exec(select(PrimaryCategory))
+        secondary_categories = await self.session.exec(select(SecondaryCategory))
+        tertiary_categories = await self.session.exec(select(TertiaryCategory))
+        return CategoryTree(
+            primary_categories=primary_categories.all(),
+            secondary_categories=secondary_categories.all(),
+            tertiary_categories=tertiary_categories.all(),
+        )
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        cls.category_tree = None
+        cls.generation += 1
+
+
+# 같은 프로세스에서 카테고리가 변경되면 캐시 무효화
+for category_model in (PrimaryCategory, SecondaryCategory, TertiaryCategory):
+    for event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(
+            category_model,
+            event_name,
+            lambda *args: CategoryRepository.invalidate_cache(),
+        )
+
+
+# SQLite는 행 잠금을 지원하지 않으므로 재고 확보를 프로세스 내에서 직렬화
+sqlite_allocation_lock = asyncio.Lock()
+
+# 카운터가 존재할 때만 증감시키는 스크립트 (없으면 nil을 반환하고 호출한 쪽에서 DB 기준으로 생성)
+ADJUST_STOCK_COUNTER_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    return redis.call("INCRBY", KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+class StockRepository:
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        redis: Redis = Depends(get_redis_client),
+    ):
+        self.session = session
+        self.redis = redis
+        self.adjust_counter_script = redis.register_script(ADJUST_STOCK_COUNTER_SCRIPT)
+
+    @staticmethod
+    def generate_stock_counter_key(product_id: int) -> str:
+        return f"stock:{product_id}"
+
+    async def create_stocks(
+        self, product_id: int, quantity: int, chunk_size: int = 5000
+    ):
+        """
+        ORM 인스턴스를 만들지 않고 chunk 단위 executemany로 재고를 일괄 생성합니다.
+        신규 상품의 재고 생성과 기존 상품의 재입고에 모두 사용됩니다.
+        """
+        params = {"product_id": product_id, "status": StatusType.AVAILABLE}
+
+        for offset in range(0, quantity, chunk_size):
+            size = min(chunk_size, quantity - offset)
+            await self.session.exec(insert(Stock), params=[params] * size)
         await self.session.commit()
 
+        await self.adjust_available_stock(product_id=product_id, delta=quantity)
+
     async def count_stocks_by_product_id(self, product_id: int):
         result = await self.session.exec(
             select(func.count(Stock.id)).where(
                 Stock.product_id == product_id, Stock.status == StatusType.AVAILABLE
             )
+            # 카운터의 기준값이 되므로 replica 지연이 그대로 오차로 남지 않도록 primary에서 집계
+            .execution_options(use_primary=True)
         )
         return result.one_or_none()
 
+    async def get_available_stock(self, product_id: int) -> int:
+        """
+        Redis에 유지되는 가용 재고 카운터를 반환합니다.
+        카운터가 없는 경우에만 stocks 테이블을 집계하여 채웁니다.
+        """
+        key = self.generate_stock_counter_key(product_id=product_id)
+        available_stock = await self.redis.get(key)
+        if available_stock is not None:
+            return int(available_stock)
+
+        available_stock = await self.count_stocks_by_product_id(product_id=product_id)
+        # 그 사이 다른 요청이 카운터를 갱신했다면 덮어쓰지 않음
+        await self.redis.set(key, available_stock or 0, nx=True)
+        return int(available_stock or 0)
+
+    async def adjust_available_stock(self, product_id: int, delta: int):
+        """
+        재고 변경이 커밋된 뒤 호출하여 가용 재고 카운터에 반영합니다.
+        카운터가 없으면 커밋 이후의 DB 값으로 생성합니다.
+        변경 전에 집계한 값으로 다른 요청이 SET NX를 하더라도 이 값으로 덮어쓰므로
+        새 재고가 카운터에서 누락되지 않습니다.
+        """
+        key = self.generate_stock_counter_key(product_id=product_id)
+        adjusted = await self.adjust_counter_script(keys=[key], args=[delta])
+        if adjusted is not None:
+            return
+
+        available_stock = await self.count_stocks_by_product_id(product_id=product_id)
+        await self.redis.set(key, available_stock or 0)
+
+    async def reconcile_available_stocks(self, batch_size: int = 1000) -> int:
+        """
+        stocks 테이블 기준으로 모든 상품의 가용 재고 카운터를 다시 맞추고,
+        값이 달랐던 상품 수를 반환합니다.
+        """
+        result = await self.session.exec(
+            select(Stock.product_id, func.count(Stock.id))
+            .where(Stock.status == StatusType.AVAILABLE)
+            .group_by(Stock.product_id)
+            .execution_options(use_primary=True)
+        )
+        counts: dict[int, int] = dict(result.all())
+
+        result = await self.session.exec(
+            select(Product.id).execution_options(use_primary=True)
+        )
+        product_ids: list[int] = list(result.all())
+
+        drifted = 0
+        for i in range(0, len(product_ids), batch_size):
+            batch = product_ids[i : i + batch_size]
+            keys = [self.generate_stock_counter_key(product_id=pid) for pid in batch]
+
+            current = await self.redis.mget(keys)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, product_id, value in zip(keys, batch, current):
+                    expected = counts.get(product_id, 0)
+                    if value is None or int(value) != expected:
+                        drifted += 1
+                        pipe.set(key, expected)
+                await pipe.execute()
+
+        return drifted
+
     async def get_available_stock_by_quantity(self, product_id: int, quantity: int):
         result = await self.session.exec(
             select(Stock)
@@ -152,13 +317,80 @@ class StockRepository:
         )
         return result.all()
 
+    async def allocate_stocks(self, product_id: int, quantity: int) -> list[int]:
+        """
+        가용 재고 quantity개를 원자적으로 확보하여 SOLD 처리하고 재고 ID 목록을 반환합니다.
+        재고가 부족하면 아무것도 변경하지 않고 빈 목록을 반환합니다.
+
+        - 행 잠금을 지원하는 DB : FOR UPDATE SKIP LOCKED로 다른 구매자가 잠근 행은 건너뜀
+        - SQLite : 행 잠금이 없으므로 프로세스 내에서 직렬화
+        """
+        dialect = self.session.get_bind().dialect
+
+        if dialect.name == "sqlite":
+            async with sqlite_allocation_lock:
+                stock_ids = await self._claim_stocks(
+                    product_id=product_id, quantity=quantity, skip_locked=False
+                )
+        else:
+            stock_ids = await self._claim_stocks(
+                product_id=product_id, quantity=quantity, skip_locked=True
+            )
+
+        if stock_ids:
+            await self.adjust_available_stock(
+                product_id=product_id, delta=-len(stock_ids)
+            )
+        return stock_ids
+
+    async def _claim_stocks(
+        self, product_id: int, quantity: int, skip_locked: bool
+    ) -> list[int]:
+        claimable = (
+            select(Stock.id)
+            .where(Stock.product_id == product_id, Stock.status == StatusType.AVAILABLE)
+            .limit(quantity)
+        )
+        if skip_locked:
+            claimable = claimable.with_for_update(skip_locked=True)
+
+        if self.session.get_bind().dialect.update_returning:
+            # 선택과 상태 변경을 하나의 UPDATE ... RETURNING 문으로 처리
+            result = await self.session.exec(
+                update(Stock)
+                .where(Stock.id.in_(claimable.scalar_subquery()))
+                .values(status=StatusType.SOLD)
+                .returning(Stock.id)
+            )
+            stock_ids = list(result.scalars().all())
+        else:
+            # RETURNING을 지원하지 않는 DB (MySQL 등)는 잠근 행을 같은 트랜잭션에서 변경
+            result = await self.session.exec(claimable)
+            stock_ids = list(result.all())
+            if len(stock_ids) == quantity:
+                await self.session.exec(
+                    update(Stock)
+                    .where(Stock.id.in_(stock_ids))
+                    .values(status=StatusType.SOLD)
+                )
+
+        if len(stock_ids) < quantity:
+            await self.session.rollback()
+            return []
+
+        await self.session.commit()
+        return stock_ids
+
 
 class UserRepository:
     def __init__(self, session: AsyncSession = Depends(get_session)):
         self.session = session
 
     async def get_user_by_email(self, email: str) -> User:
-        result = await self.session.exec(select(User).where(User.email == email))
+        # 가입 직후 로그인 및 중복 가입 확인에 사용되므로 primary에서 조회
+        result = await self.session.exec(
+            select(User).where(User.email == email).execution_options(use_primary=True)
+        )
         return result.one_or_none()
 
     async def get_user_by_id(self, user_id: int) -> User:
@@ -175,34 +407,111 @@ class UserRepository:
         self, registration_number: str, brand_name: str
     ) -> bool:
         result = await self.session.exec(
-            select(Seller).where(
+            select(Seller)
+            .where(
                 (Seller.registration_number == registration_number)
                 | (Seller.brand_name == brand_name)
             )
+            .execution_options(use_primary=True)
         )
         return result.first() is None
 
 
+# 용도별로 Elasticsearch에서 가져올 상품 필드 (_source filtering)
+# how_to_use, ingredient, caution 등 긴 텍스트는 상세 조회에서만 가져옴
+PRODUCT_LIST_FIELDS = ["id", "brand_name", "product_name", "price", "discounted_price"]
+PRODUCT_CART_FIELDS = ["product_name", "price", "discounted_price"]
+PRODUCT_DETAIL_FIELDS = [
+    "id",
+    "brand_name",
+    "product_name",
+    "price",
+    "discounted_price",
+    "capacity",
+    "key_specification",
+    "expiration_date",
+    "how_to_use",
+    "ingredient",
+    "caution",
+    "contact_number",
+    "category_1",
+    "category_2",
+    "category_3",
+]
+
+
 class ElasticsearchRepository:
-    def __init__(self, es: AsyncElasticsearch = Depends(get_elasticsearch_client)):
+    def __init__(
+        self,
+        es: AsyncElasticsearch = Depends(get_elasticsearch_client),
+        pit_manager: PITManager = Depends(get_pit_manager),
+    ):
         self.es = es
+        self.pit_manager = pit_manager
         self.size = 10
 
-    async def create_pit(self) -> str:
-        pit_response = await self.es.open_point_in_time(
-            index="products", keep_alive="5m"
-        )
-        return pit_response["id"]
-
     async def close_pit(self, pit_id: str):
-        await self.es.close_point_in_time(body={"id": pit_id})
+        await self.pit_manager.release(pit_id)
 
-    async def search_products(
-        self, keyword: str, search_after: list[int] = None, pit_id: str = None
+    async def search_page(
+        self,
+        shape: tuple,
+        query: dict,
+        search_after: list[int] = None,
+        pit_id: str = None,
+        use_pit: bool = True,
     ) -> (list[dict], list[int], str):
-        if not pit_id:
-            pit_id = await self.create_pit()
+        """
+        한 페이지를 조회합니다.
+        use_pit이 False이고 pit_id가 없으면 PIT 없이 search_after만으로 조회하며,
+        PIT이 필요한 첫 요청은 같은 형태(shape)의 요청과 PIT을 공유합니다.
+        """
+        query["size"] = self.size
+        query["_source"] = PRODUCT_LIST_FIELDS
+        # 전체 건수는 사용하지 않으므로 계산하지 않음
+        query["track_total_hits"] = False
+        if search_after and search_after != [0]:
+            query["search_after"] = search_after
+
+        if not pit_id and not use_pit:
+            # 정렬 기준인 id가 고유하므로 PIT 없이도 페이지 사이에 중복/누락이 없음
+            response = await self.es.search(index=PRODUCTS_ALIAS, body=query)
+        else:
+            if not pit_id:
+                pit_id = await self.pit_manager.acquire(shape)
+            query["pit"] = {
+                "id": pit_id,
+                "keep_alive": self.pit_manager.keep_alive_param,
+            }
 
+            try:
+                response = await self.es.search(body=query)
+            except NotFoundError:
+                # 만료되었거나 정리된 PIT이면 새 PIT으로 다시 조회
+                # (만료된 PIT을 다시 공유받지 않도록 먼저 제거)
+                self.pit_manager.discard(pit_id)
+                pit_id = await self.pit_manager.acquire(shape)
+                query["pit"]["id"] = pit_id
+                response = await self.es.search(body=query)
+
+            pit_id = self.pit_manager.touch(pit_id, response.get("pit_id"))
+
+        products = [hit["_source"] for hit in response["hits"]["hits"]]
+
+        if products and len(products) == self.size:
+            next_search_after = response["hits"]["hits"][-1]["sort"]
+        else:
+            next_search_after = None
+
+        return products, next_search_after, pit_id
+
+    async def search_products(
+        self,
+        keyword: str,
+        search_after: list[int] = None,
+        pit_id: str = None,
+        use_pit: bool = True,
+    ) -> (list[dict], list[int], str):
         def get_search_query(keyword: str) -> dict:
             return {
                 "bool": {
@@ -222,59 +531,73 @@ class ElasticsearchRepository:
             }
 
         query = {
-            "size": self.size,
             "query": {
                 "bool": {
                     "must": [get_search_query(keyword)],
                     "filter": [{"term": {"use_status": True}}],
                 }
             },
-            "pit": {"id": pit_id, "keep_alive": "2m"},
-            "sort": [{"id": {"order": "desc"}}, {"_shard_doc": "desc"}],
+            # id가 고유하므로 _shard_doc 없이 정렬 (PIT 없이 조회한 페이지와 search_after 형식이 같음)
+            "sort": [{"id": {"order": "desc"}}],
         }
+        # 이전 정렬([id, _shard_doc])로 발급된 search_after는 id만 사용
+        if search_after and len(search_after) > 1:
+            search_after = search_after[:1]
+
+        return await self.search_page(
+            shape=("search", keyword),
+            query=query,
+            search_after=search_after,
+            pit_id=pit_id,
+            use_pit=use_pit,
+        )
 
-        if search_after and search_after != [0]:
-            query["search_after"] = search_after
-
-        response = await self.es.search(body=query)
-        products = [hit["_source"] for hit in response["hits"]["hits"]]
-
-        if products and len(products) == self.size:
-            next_search_after = response["hits"]["hits"][-1]["sort"]
-        else:
-            next_search_after = None
-
-        return products, next_search_after, pit_id
-
-    async def get_product_by_id(self, product_id: str) -> dict:
-        response = await self.es.get(index="products", id=product_id)
+    async def get_product_by_id(
+        self, product_id: str, source_fields: list[str] = PRODUCT_DETAIL_FIELDS
+    ) -> dict:
+        response = await self.es.get(
+            index=PRODUCTS_ALIAS, id=product_id, source_includes=source_fields
+        )
         return response["_source"] if response["found"] else None
 
+    async def get_products_by_ids(
+        self, product_ids: list[int], source_fields: list[str] = PRODUCT_CART_FIELDS
+    ) -> dict[int, dict]:
+        """
+        여러 상품을 한 번의 mget 요청으로 조회하여 {상품 ID: _source} 형태로 반환합니다.
+        """
+        if not product_ids:
+            return {}
+
+        response = await self.es.mget(
+            index=PRODUCTS_ALIAS,
+            ids=[str(product_id) for product_id in product_ids],
+            source_includes=source_fields,
+        )
+        return {
+            int(doc["_id"]): doc["_source"]
+            for doc in response["docs"]
+            if doc.get("found")
+        }
+
     async def get_product_list(
-        self, search_after: list[int] = None, pit_id: str = None
+        self,
+        search_after: list[int] = None,
+        pit_id: str = None,
+        use_pit: bool = True,
     ) -> (list[dict], list[int], str):
-        if not pit_id:
-            pit_id = await self.create_pit()
-
         query = {
             "query": {"bool": {"filter": [{"term": {"use_status": True}}]}},
             "sort": [{"id": {"order": "desc"}}],
-            "size": self.size,
-            "pit": {"id": pit_id, "keep_alive": "2m"},
         }
 
-        if search_after and search_after != [0]:
-            query["search_after"] = search_after
-
-        response = await self.es.search(body=query)
-        products = [hit["_source"] for hit in response["hits"]["hits"]]
-
-        if products and len(products) == self.size:
-            next_search_after = response["hits"]["hits"][-1]["sort"]
-        else:
-            next_search_after = None
-
-        return products, next_search_after, pit_id
+        return await self.search_page(
+            shape=("list",),
+            query=query,
+            search_after=search_after,
+            pit_id=pit_id,
+            use_pit=use_pit,
+        )
 
     async def get_product_list_by_category(
         self,
@@ -282,10 +605,8 @@ class ElasticsearchRepository:
         category_id: str,
         search_after: list[int] = None,
         pit_id: str = None,
+        use_pit: bool = True,
     ) -> (list[dict], list[int], str):
-        if not pit_id:
-            pit_id = await self.create_pit()
-
         # 카테고리별 필드 설정 (대분류, 중분류, 소분류)
         category_field = {
             "primary": "category_id_1",  # 대분류
@@ -306,97 +627,275 @@ class ElasticsearchRepository:
                 }
             },
             "sort": [{"id": {"order": "desc"}}],
-            "size": self.size,
-            "pit": {"id": pit_id, "keep_alive": "2m"},
         }
 
-        if search_after and search_after != [0]:
-            query["search_after"] = search_after
-
-        response = await self.es.search(body=query)
-        products = [hit["_source"] for hit in response["hits"]["hits"]]
+        return await self.search_page(
+            shape=("category", category_field, category_id),
+            query=query,
+            search_after=search_after,
+            pit_id=pit_id,
+            use_pit=use_pit,
+        )
 
-        if products and len(products) == self.size:
-            next_search_after = response["hits"]["hits"][-1]["sort"]
-        else:
-            next_search_after = None
 
-        return products, next_search_after, pit_id
+# 재고 확인, 장바구니 저장, 예약을 하나의 원자적 단위로 처리하는 스크립트
+# KEYS: cart, cart_expiry, cart_hold, cart_hold_expiry, reserve
+# ARGV: user_id, product_id, quantity, stocks_count, now, ttl, reserve_threshold, replace
+# replace가 1이면 장바구니 수량을 quantity로 변경하고, 0이면 quantity만큼 추가
+# 반환값: {추가 여부(1/0), 추가 전 가용 재고, 장바구니 내 최종 수량}
+ADD_TO_CART_SCRIPT = """
+local user_id = ARGV[1]
+local product_id = ARGV[2]
+local quantity = tonumber(ARGV[3])
+local stocks_count = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local ttl = tonumber(ARGV[6])
+local reserve_threshold = tonumber(ARGV[7])
+local replace = ARGV[8] == "1"
+
+local expired = redis.call("ZRANGEBYSCORE", KEYS[4], "-inf", now)
+for _, expired_user_id in ipairs(expired) do
+    redis.call("HDEL", KEYS[3], expired_user_id)
+end
+redis.call("ZREMRANGEBYSCORE", KEYS[4], "-inf", now)
+
+local current_quantity = 0
+local current_expire_at = redis.call("ZSCORE", KEYS[2], product_id)
+if current_expire_at and tonumber(current_expire_at) > now then
+    current_quantity = tonumber(redis.call("HGET", KEYS[1], product_id) or "0")
+end
+
+local total_in_cart = 0
+for _, held_quantity in ipairs(redis.call("HVALS", KEYS[3])) do
+    total_in_cart = total_in_cart + tonumber(held_quantity)
+end
+
+-- 수량을 변경할 때는 이미 담아 둔 수량을 제외한 재고와 비교
+local total_quantity = current_quantity + quantity
+local reserve_delta = quantity
+if replace then
+    total_in_cart = total_in_cart - current_quantity
+    total_quantity = quantity
+    reserve_delta = quantity - current_quantity
+end
+
+-- 수량을 줄이는 변경은 재고가 부족해도 반영
+local available_stock = stocks_count - total_in_cart
+if available_stock < quantity and total_quantity > current_quantity then
+    return {0, available_stock, 0}
+end
+
+local expire_at = now + ttl
+
+redis.call("HSET", KEYS[1], product_id, total_quantity)
+redis.call("ZADD", KEYS[2], expire_at, product_id)
+redis.call("HSET", KEYS[3], user_id, total_quantity)
+redis.call("ZADD", KEYS[4], expire_at, user_id)
+for i = 1, 4 do
+    redis.call("EXPIRE", KEYS[i], ttl)
+end
+
+if available_stock <= reserve_threshold and reserve_delta ~= 0 then
+    if redis.call("HINCRBY", KEYS[5], "quantity", reserve_delta) > 0 then
+        redis.call("EXPIRE", KEYS[5], ttl)
+    else
+        redis.call("DEL", KEYS[5])
+    end
+end
+
+return {1, available_stock, total_quantity}
+"""
 
 
 class CartRepository:
+    # 장바구니 상품별 TTL (초)
+    cart_ttl: int = 60  # 1분
+
     def __init__(self, redis: Redis = Depends(get_redis_client)):
         self.redis = redis
+        # EVALSHA로 호출하고, 서버에 캐시되지 않은 경우에만 스크립트 전체를 전송
+        self.add_to_cart_script = redis.register_script(ADD_TO_CART_SCRIPT)
 
     @staticmethod
     def generate_cart_key(user_id: int) -> str:
         return f"cart:{user_id}"
 
     @staticmethod
-    def generate_product_key_in_cart(user_id: int, product_id: int) -> str:
-        return f"cart:{user_id}:{product_id}"
+    def generate_cart_expiry_key(user_id: int) -> str:
+        return f"cart_expiry:{user_id}"
+
+    @staticmethod
+    def generate_product_hold_key(product_id: int) -> str:
+        return f"cart_hold:{product_id}"
+
+    @staticmethod
+    def generate_product_hold_expiry_key(product_id: int) -> str:
+        return f"cart_hold_expiry:{product_id}"
 
     @staticmethod
     def generate_reserve_key(user_id: int, product_id: int) -> str:
         return f"reserve:{product_id}:{user_id}"
 
-    async def add_product(self, user_id: int, product_id: int, quantity: int):
-        key = self.generate_product_key_in_cart(user_id=user_id, product_id=product_id)
-        await self.redis.hset(key, mapping={"quantity": quantity})
-        # await self.redis.expire(key, 86400)  # 상품별 TTL 설정 24시간
-        await self.redis.expire(key, 60)  # 상품별 TTL 설정 2분
+    async def add_product(
+        self, user_id: int, product_id: int, quantity: int, ttl: Optional[int] = None
+    ):
+        """
+        장바구니에 상품을 담습니다.
+
+        - cart:{user_id} (hash) : 상품 ID -> 수량
+        - cart_expiry:{user_id} (zset) : 상품 ID -> 만료 시각
+        - cart_hold:{product_id} (hash) : 사용자 ID -> 수량
+        - cart_hold_expiry:{product_id} (zset) : 사용자 ID -> 만료 시각
+        """
+        ttl = ttl or self.cart_ttl
+        expire_at = time.time() + ttl
+
+        cart_key = self.generate_cart_key(user_id=user_id)
+        cart_expiry_key = self.generate_cart_expiry_key(user_id=user_id)
+        hold_key = self.generate_product_hold_key(product_id=product_id)
+        hold_expiry_key = self.generate_product_hold_expiry_key(product_id=product_id)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(cart_key, product_id, quantity)
+            pipe.zadd(cart_expiry_key, {product_id: expire_at})
+            pipe.hset(hold_key, user_id, quantity)
+            pipe.zadd(hold_expiry_key, {user_id: expire_at})
+            # 항목별 만료는 zset으로 관리하고, 키 자체는 비활성 상태일 때만 정리되도록 함
+            for key in (cart_key, cart_expiry_key, hold_key, hold_expiry_key):
+                pipe.expire(key, max(ttl, self.cart_ttl))
+            await pipe.execute()
+
+    async def add_product_with_stock_check(
+        self,
+        user_id: int,
+        product_id: int,
+        quantity: int,
+        stocks_count: int,
+        reserve_threshold: int,
+        replace: bool = False,
+    ) -> dict:
+        """
+        가용 재고 확인과 장바구니 저장, 예약을 한 번의 호출로 원자적으로 처리합니다.
+        동시에 여러 사용자가 담더라도 재고 이상으로 담기지 않습니다.
+        replace가 True이면 담긴 수량에 더하지 않고 quantity로 변경합니다.
+        """
+        is_added, available_stock, total_quantity = await self.add_to_cart_script(
+            keys=[
+                self.generate_cart_key(user_id=user_id),
+                self.generate_cart_expiry_key(user_id=user_id),
+                self.generate_product_hold_key(product_id=product_id),
+                self.generate_product_hold_expiry_key(product_id=product_id),
+                self.generate_reserve_key(user_id=user_id, product_id=product_id),
+            ],
+            args=[
+                user_id,
+                product_id,
+                quantity,
+                stocks_count,
+                time.time(),
+                self.cart_ttl,
+                reserve_threshold,
+                int(replace),
+            ],
+        )
+        return {
+            "is_added": bool(is_added),
+            "available_stock": available_stock,
+            "quantity": total_quantity,
+        }
 
-    async def get_cart_product_keys(self, user_id: int) -> list:
-        cart_key = self.generate_cart_key(user_id=user_id) + ":*"
-        keys = await self.redis.keys(cart_key)
-        return keys
+    async def get_cart_items(self, user_id: int) -> dict[int, int]:
+        """만료되지 않은 장바구니 상품을 {상품 ID: 수량} 형태로 반환합니다."""
+        cart_key = self.generate_cart_key(user_id=user_id)
+        cart_expiry_key = self.generate_cart_expiry_key(user_id=user_id)
 
-    async def delete_from_cart(self, user_id: int, product_id: int):
-        key = self.generate_product_key_in_cart(user_id=user_id, product_id=product_id)
-        await self.redis.delete(key)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrangebyscore(cart_expiry_key, "-inf", time.time())
+            pipe.hgetall(cart_key)
+            expired, items = await pipe.execute()
 
-    async def clear_cart(self, keys: list):
-        await self.redis.delete(*keys)
+        if expired:
+            await self._remove_items(
+                user_id=user_id, product_ids=[int(product_id) for product_id in expired]
+            )
+
+        return {
+            int(product_id): int(quantity)
+            for product_id, quantity in items.items()
+            if product_id not in expired
+        }
+
+    async def delete_from_cart(self, user_id: int, product_id: int):
+        await self._remove_items(user_id=user_id, product_ids=[product_id])
+
+    async def clear_cart(self, user_id: int, product_ids: list[int]):
+        await self._remove_items(user_id=user_id, product_ids=product_ids)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self.generate_cart_key(user_id=user_id))
+            pipe.delete(self.generate_cart_expiry_key(user_id=user_id))
+            await pipe.execute()
+
+    async def _remove_items(self, user_id: int, product_ids: list[int]):
+        if not product_ids:
+            return
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(self.generate_cart_key(user_id=user_id), *product_ids)
+            pipe.zrem(self.generate_cart_expiry_key(user_id=user_id), *product_ids)
+            for product_id in product_ids:
+                pipe.hdel(
+                    self.generate_product_hold_key(product_id=product_id), user_id
+                )
+                pipe.zrem(
+                    self.generate_product_hold_expiry_key(product_id=product_id),
+                    user_id,
+                )
+            await pipe.execute()
 
     async def get_product_quantity_in_cart(self, user_id: int, product_id: int) -> int:
-        key = self.generate_product_key_in_cart(user_id=user_id, product_id=product_id)
-        quantity = await self.redis.hget(key, "quantity")
-        return int(quantity or 0)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zscore(self.generate_cart_expiry_key(user_id=user_id), product_id)
+            pipe.hget(self.generate_cart_key(user_id=user_id), product_id)
+            expire_at, quantity = await pipe.execute()
 
-    async def total_stocks_in_cart(self, product_id: int) -> int:
-        keys = await self.redis.keys(f"cart:*:{product_id}")
-        quantities = 0
+        if expire_at is None or expire_at <= time.time():
+            return 0
+        return int(quantity or 0)
 
-        for key in keys:
-            quantity = await self.redis.hget(key, "quantity")
-            quantities += int(quantity or 0)
+    async def migrate_legacy_cart_keys(self, batch_size: int = 1000) -> int:
+        """
+        cart:{user_id}:{product_id} 형태의 이전 장바구니 키를 새 구조로 옮깁니다.
+        KEYS 대신 SCAN을 사용하므로 운영 중에도 실행할 수 있습니다.
+        """
+        migrated = 0
+
+        async for key in self.redis.scan_iter(match="cart:*:*", count=batch_size):
+            _, user_id, product_id = key.split(":")
+
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hget(key, "quantity")
+                pipe.ttl(key)
+                quantity, ttl = await pipe.execute()
+
+            if quantity is not None and ttl != -2:
+                await self.add_product(
+                    user_id=int(user_id),
+                    product_id=int(product_id),
+                    quantity=int(quantity),
+                    ttl=ttl if ttl > 0 else self.cart_ttl,
+                )
+                migrated += 1
 
-        return quantities
+            await self.redis.delete(key)
 
-    async def product_reservation(self, user_id: int, product_id: int, quantity: int):
-        key = self.generate_reserve_key(user_id=user_id, product_id=product_id)
-        await self.redis.hincrby(key, "quantity", quantity)
-        await self.redis.expire(key, 60)
+        return migrated
 
     async def get_reserved_quantity(self, user_id: int, product_id: int) -> int:
         key = self.generate_reserve_key(user_id=user_id, product_id=product_id)
         reserved_quantity = await self.redis.hget(key, "quantity")
         return int(reserved_quantity or 0)
 
-    async def cancel_reservation(self, user_id: int, product_id: int, quantity: int):
-        key = self.generate_reserve_key(user_id=user_id, product_id=product_id)
-        reserved_quantity = int(await self.redis.hget(key, "quantity"))
-
-        if reserved_quantity >= quantity:
-            updated_quantity = reserved_quantity - quantity
-            if updated_quantity > 0:
-                await self.redis.hset(key, "quantity", updated_quantity)
-                await self.redis.expire(key, 60)
-            else:
-                await self.redis.delete(key)
-        else:
-            raise ValueError("Cannot cancel more than the reserved quantity.")
-
     async def delete_reserve_key(self, user_id: int, product_id: int):
         key = self.generate_reserve_key(user_id=user_id, product_id=product_id)
         await self.redis.delete(key)
@@ -0,0 +1,220 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from elasticsearch import NotFoundError
+
+from src import config
+from src.elastic_client import PRODUCTS_ALIAS, get_elasticsearch_client
+from src.metrics import register_collector
+
+es = get_elasticsearch_client()
+
+
+@dataclass
+class OpenPIT:
+    pit_id: str
+    # PIT을 연 요청의 형태 (예: ("category", "category_id", "3"))
+    shape: tuple
+    opened_at: float
+    last_used_at: float
+    # 이 PIT을 받아 간 클라이언트 수 (close-pit 요청 시 감소)
+    clients: int = 0
+
+
+class PITManager:
+    """
+    상품 목록/검색 페이지네이션에 사용하는 PIT(point in time)을 관리합니다.
+    - 같은 형태의 첫 페이지 요청은 share_seconds 동안 하나의 PIT을 공유
+    - 열린 PIT이 max_open개를 넘으면 가장 오래 사용되지 않은 PIT을 닫음
+    - idle_seconds 동안 사용되지 않은 PIT은 백그라운드에서 닫음
+    """
+
+    def __init__(
+        self,
+        index: str,
+        keep_alive: int,
+        share_seconds: int,
+        idle_seconds: int,
+        max_open: int,
+    ):
+        self.index = index
+        self.keep_alive = keep_alive
+        self.share_seconds = share_seconds
+        self.idle_seconds = idle_seconds
+        self.max_open = max_open
+        self.pits: dict[str, OpenPIT] = {}
+        # 형태별로 현재 공유 중인 PIT ID
+        self.shared: dict[tuple, str] = {}
+        # 형태별로 진행 중인 open 요청 (동시에 들어온 첫 페이지 요청이 PIT을 하나만 열도록)
+        self.opening: dict[tuple, asyncio.Task] = {}
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @property
+    def keep_alive_param(self) -> str:
+        return f"{self.keep_alive}s"
+
+    def get_shared(self, shape: tuple) -> Optional[OpenPIT]:
+        pit = self.pits.get(self.shared.get(shape))
+        if pit and time.monotonic() - pit.opened_at < self.share_seconds:
+            return pit
+        return None
+
+    async def acquire(self, shape: tuple) -> str:
+        pit = self.get_shared(shape)
+        if pit is not None:
+            self.reused += 1
+        else:
+            task = self.opening.get(shape)
+            if task is None:
+                task = asyncio.create_task(self.open(shape))
+                self.opening[shape] = task
+                task.add_done_callback(lambda _: self.opening.pop(shape, None))
+            else:
+                self.reused += 1
+            pit = await asyncio.shield(task)
+
+        pit.clients += 1
+        pit.last_used_at = time.monotonic()
+        return pit.pit_id
+
+    async def open(self, shape: tuple) -> OpenPIT:
+        await self.evict()
+
+        response = await es.open_point_in_time(
+            index=self.index, keep_alive=self.keep_alive_param
+        )
+        now = time.monotonic()
+        pit = OpenPIT(
+            pit_id=response["id"], shape=shape, opened_at=now, last_used_at=now
+        )
+        self.pits[pit.pit_id] = pit
+        self.shared[shape] = pit.pit_id
+        self.opened += 1
+        return pit
+
+    def touch(self, pit_id: str, new_pit_id: Optional[str] = None) -> str:
+        """
+        다음 페이지 요청에 PIT이 사용되었음을 기록합니다.
+        Elasticsearch가 응답에서 PIT ID를 바꿔 주면 새 ID로 추적합니다.
+        """
+        new_pit_id = new_pit_id or pit_id
+        pit = self.pits.pop(pit_id, None)
+        if pit is None:
+            # 다른 프로세스가 열었거나 이미 정리된 PIT
+            return new_pit_id
+
+        pit.pit_id = new_pit_id
+        pit.last_used_at = time.monotonic()
+        self.pits[new_pit_id] = pit
+        if self.shared.get(pit.shape) == pit_id:
+            self.shared[pit.shape] = new_pit_id
+        return new_pit_id
+
+    def discard(self, pit_id: str):
+        """
+        Elasticsearch에서 이미 만료된 PIT을 더 이상 공유하거나 추적하지 않도록 제거합니다.
+        """
+        pit = self.pits.pop(pit_id, None)
+        if pit is None:
+            return
+
+        if self.shared.get(pit.shape) == pit_id:
+            del self.shared[pit.shape]
+        self.expired += 1
+
+    async def release(self, pit_id: str):
+        """
+        클라이언트가 페이지네이션을 마쳤을 때 호출합니다.
+        PIT은 다른 클라이언트와 공유될 수 있으므로 마지막 클라이언트가 반납하고
+        공유 시간이 지난 경우에만 바로 닫고, 나머지는 idle 정리에 맡깁니다.
+        이 프로세스가 열지 않은 PIT은 연 프로세스의 정리 작업이나 keep_alive로 닫힙니다.
+        """
+        pit = self.pits.get(pit_id)
+        if pit is None:
+            return
+
+        pit.clients -= 1
+        if pit.clients <= 0 and self.get_shared(pit.shape) is not pit:
+            await self.close(pit)
+
+    async def close(self, pit: OpenPIT):
+        self.pits.pop(pit.pit_id, None)
+        if self.shared.get(pit.shape) == pit.pit_id:
+            del self.shared[pit.shape]
+
+        try:
+            await es.close_point_in_time(id=pit.pit_id)
+        except NotFoundError:
+            # keep_alive가 지나 Elasticsearch가 이미 닫은 PIT
+            pass
+        except Exception as e:
+            print(f"Error closing PIT: {e}")
+        self.closed += 1
+
+    async def evict(self):
+        while self.pits and len(self.pits) >= self.max_open:
+            pit = min(self.pits.values(), key=lambda pit: pit.last_used_at)
+            await self.close(pit)
+            self.evicted += 1
+
+    async def close_idle(self) -> int:
+        now = time.monotonic()
+        idle = [
+            pit
+            for pit in self.pits.values()
+            if now - pit.last_used_at >= self.idle_seconds
+        ]
+        for pit in idle:
+            await self.close(pit)
+        self.expired += len(idle)
+        return len(idle)
+
+    async def close_all(self):
+        for pit in list(self.pits.values()):
+            await self.close(pit)
+
+    def to_dict(self) -> dict:
+        return {
+            "open": len(self.pits),
+            "shared": sum(1 for shape in self.shared if self.get_shared(shape)),
+            "opened": self.opened,
+            "reused": self.reused,
+            "closed": self.closed,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+pit_manager = PITManager(
+    index=PRODUCTS_ALIAS,
+    keep_alive=config.es.pit_keep_alive,
+    share_seconds=config.es.pit_share_seconds,
+    idle_seconds=config.es.pit_idle_seconds,
+    max_open=config.es.pit_max_open,
+)
+register_collector("pit", pit_manager.to_dict)
+
+
+def get_pit_manager() -> PITManager:
+    return pit_manager
+
+
+async def close_idle_pits(interval: Optional[float] = None):
+    """
+    주기적으로 사용되지 않는 PIT을 닫습니다.
+    """
+    interval = interval or config.es.pit_cleanup_interval
+
+    while True:
+        try:
+            await pit_manager.close_idle()
+        except Exception as e:
+            print(f"Error closing idle PITs: {e}")
+
+        await asyncio.sleep(interval)
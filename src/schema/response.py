@@ -82,3 +82,11 @@ class GetGoodsPageResponse(BaseModel):
     products: list[GetGoodsListResponse]
     next_search_after: Optional[list[int]]
     pit_id: Optional[str]
+    # 다음 페이지 요청에 그대로 전달하는 서명된 cursor (마지막 페이지면 None)
+    cursor: Optional[str] = None
+
+
+class CategoryResponse(BaseModel):
+    id: int
+    name: str
+    children: list["CategoryResponse"] = []
@@ -1,125 +1,577 @@
 import asyncio
 import json
 import os
+import random
+import socket
+import time
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import Awaitable, Callable, Optional
 
-from aiosmtplib import SMTP
+from redis.exceptions import ResponseError
 
-from src.apis.dependencies import get_session
-from src.elastic_client import get_elasticsearch_client
-from src.models.repository import StockRepository
+from src import config
+from src.metrics import register_collector
 from src.redis_client import get_redis_client, get_task_redis_client
+from src.service.mailer import SMTPMailer
+from src.service.product_index import get_write_indices, record_reindex_update
+from src.service.serializer import decode_payload, encode_payload
+from src.service.sync import BulkWriter, DocumentMissingError, SyncCoalescer
+
+TASK_STREAM = "task_stream"
+TASK_GROUP = "task_group"
+# 재시도 횟수를 초과한 작업 (모든 lane 공용)
+TASK_DEAD_LETTER_STREAM = "task_stream:dead"
+
+
+@dataclass
+class TaskLane:
+    """
+    작업 종류별로 분리된 stream
+    lane마다 별도의 consumer 루프에서 처리하므로, 한 lane이 밀려도 다른 lane의 처리는 지연되지 않습니다.
+    """
+
+    name: str
+    stream: str
+    batch_size: int
+    # 동시에 처리하는 메시지 수 (None이면 제한하지 않음)
+    concurrency: Optional[int] = None
+
+    @property
+    def retry_key(self) -> str:
+        # 재시도 대기 중인 작업 (score: 재시도 시각)
+        return f"{self.stream}:retry"
+
+
+# 상품 등록/수정 이벤트는 순서가 바뀌지 않도록 같은 lane으로 보냄
+# (ES 동기화 작업은 BulkWriter가 모아서 전송하므로 배치 크기만큼 동시에 처리)
+PRODUCT_LANE = TaskLane(
+    name="product",
+    stream="task_stream:product",
+    batch_size=config.worker.batch_size,
+    concurrency=config.worker.product_concurrency or None,
+)
+# 이메일은 기본적으로 SMTP 연결 풀이 한 번에 전송할 수 있는 만큼만 대기열에 넣음
+EMAIL_LANE = TaskLane(
+    name="email",
+    stream="task_stream:email",
+    batch_size=config.worker.email_batch_size,
+    concurrency=config.worker.email_concurrency
+    or config.smtp.pool_size * config.smtp.batch_size,
+)
+# lane 도입 이전에 task_stream에 추가된 메시지 처리용
+LEGACY_LANE = TaskLane(
+    name="legacy",
+    stream=TASK_STREAM,
+    batch_size=config.worker.batch_size,
+    concurrency=config.worker.legacy_concurrency or None,
+)
+task_lanes: list[TaskLane] = [PRODUCT_LANE, EMAIL_LANE, LEGACY_LANE]
+
+# 작업 종류별 lane
+task_type_lanes: dict[str, TaskLane] = {
+    "sync_product": PRODUCT_LANE,
+    "sync_product_action": PRODUCT_LANE,
+    "send_email": EMAIL_LANE,
+}
+
+# 재시도 시각이 된 작업을 다시 lane의 stream에 추가 (여러 워커가 같은 작업을 중복으로 옮기지 않도록 스크립트로 처리)
+MOVE_DUE_RETRIES_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    local fields = {}
+    for key, value in pairs(cjson.decode(member)['fields']) do
+        table.insert(fields, key)
+        table.insert(fields, value)
+    end
+    redis.call('XADD', KEYS[2], '*', unpack(fields))
+end
+return #due
+"""
 
 task_redis = get_task_redis_client()
-es = get_elasticsearch_client()
 cart_redis = get_redis_client()
-stock_repo = StockRepository(get_session())
+move_due_retries_script = task_redis.register_script(MOVE_DUE_RETRIES_SCRIPT)
+bulk_writer = BulkWriter(
+    max_actions=config.worker.bulk_size,
+    flush_interval=config.worker.bulk_flush_ms / 1000,
+)
+mailer = SMTPMailer(
+    hostname=config.smtp.server,
+    port=config.smtp.port,
+    username=config.smtp.user,
+    password=config.smtp.password,
+    start_tls=config.smtp.start_tls,
+    pool_size=config.smtp.pool_size,
+    batch_size=config.smtp.batch_size,
+    batch_window=config.smtp.batch_window_ms / 1000,
+    rate_limit=config.smtp.rate_limit,
+)
+# 같은 상품에 대한 연속된 수정 이벤트는 하나의 문서 수정으로 합쳐서 전송
+# (재색인 중에는 기존 인덱스와 새 인덱스 모두에 반영)
+sync_coalescer = SyncCoalescer(
+    bulk_writer,
+    resolve_indices=get_write_indices,
+    window=config.worker.coalesce_window_ms / 1000,
+)
+
+
+@dataclass
+class WorkerMetrics:
+    processed: dict[str, int] = field(default_factory=dict)
+    failed: dict[str, int] = field(default_factory=dict)
+    batches: int = 0
+    # 다른 consumer로부터 회수한 메시지 수
+    claimed: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+    # 재시도 대기 중인 작업 수
+    retry_queue: Optional[int] = None
+    # 마지막으로 처리한 메시지가 stream에 추가된 뒤 처리 완료되기까지 걸린 시간
+    last_latency_ms: float = 0.0
+    # 그룹에 아직 전달되지 않은 메시지 수 / 전달되었지만 ack되지 않은 메시지 수
+    lag: Optional[int] = None
+    pending: Optional[int] = None
+    messages_per_sec: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+    lag_checked_at: float = field(default_factory=time.monotonic)
+    processed_at_lag_check: int = 0
+
+    def record_success(self, task_type: str, message_id: str):
+        self.processed[task_type] = self.processed.get(task_type, 0) + 1
+        # 메시지 ID의 앞부분은 stream에 추가된 시각 (ms)
+        added_at_ms = int(message_id.split("-")[0])
+        self.last_latency_ms = time.time() * 1000 - added_at_ms
+
+    def record_failure(self, task_type: str):
+        self.failed[task_type] = self.failed.get(task_type, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "processed": dict(self.processed),
+            "failed": dict(self.failed),
+            "batches": self.batches,
+            "claimed": self.claimed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "retry_queue": self.retry_queue,
+            "messages_per_sec": round(self.messages_per_sec, 2),
+            "last_latency_ms": round(self.last_latency_ms, 2),
+            "lag": self.lag,
+            "pending": self.pending,
+            "uptime": round(time.monotonic() - self.started_at, 2),
+        }
+
+
+# lane별 처리 지표
+lane_metrics: dict[str, WorkerMetrics] = {
+    lane.name: WorkerMetrics() for lane in task_lanes
+}
+register_collector(
+    "task_worker",
+    lambda: {name: metrics.to_dict() for name, metrics in lane_metrics.items()},
+)
+register_collector("product_sync", sync_coalescer.to_dict)
+register_collector("smtp", mailer.to_dict)
+
+# 처리량/lag 지표 갱신 주기 (초)
+lag_refresh_interval = 5
+
+
+async def refresh_stream_lag(lane: TaskLane):
+    metrics = lane_metrics[lane.name]
+    now = time.monotonic()
+    elapsed = now - metrics.lag_checked_at
+    if elapsed < lag_refresh_interval:
+        return
+
+    processed = sum(metrics.processed.values())
+    metrics.messages_per_sec = (processed - metrics.processed_at_lag_check) / elapsed
+    metrics.processed_at_lag_check = processed
+    metrics.lag_checked_at = now
+
+    for group in await task_redis.xinfo_groups(lane.stream):
+        if group["name"] == TASK_GROUP:
+            # lag은 Redis 7.0 이상에서만 제공됨
+            metrics.lag = group.get("lag")
+            metrics.pending = group.get("pending")
+    metrics.retry_queue = await task_redis.zcard(lane.retry_key)
+
+
+async def send_welcome_email(user_info: dict):
+    await send_email(user_info["email"], user_info["name"])
+
+
+def get_retry_delay(attempt: int) -> float:
+    # 지수 백오프 (최대값 제한) + 여러 작업이 동시에 재시도되지 않도록 jitter 추가
+    delay_ms = min(
+        config.worker.retry_base_ms * 2 ** (attempt - 1), config.worker.retry_max_ms
+    )
+    return delay_ms * random.uniform(0.5, 1.0) / 1000
+
+
+async def add_to_dead_letter(
+    lane: TaskLane, message_id: str, message_data: dict, error: str
+):
+    await task_redis.xadd(
+        TASK_DEAD_LETTER_STREAM,
+        {
+            **message_data,
+            "error": error,
+            "source_id": message_id,
+            "failed_at": str(int(time.time())),
+        },
+        maxlen=config.worker.dead_letter_maxlen,
+        approximate=True,
+    )
+    lane_metrics[lane.name].dead_lettered += 1
+    print(f"Moved task {message_id} to {TASK_DEAD_LETTER_STREAM}: {error}")
+
+
+async def schedule_retry(
+    lane: TaskLane, message_id: str, message_data: dict, error: str
+):
+    """
+    실패한 작업을 재시도 대기열에 추가하고, 재시도 횟수를 초과하면 dead-letter stream으로 옮깁니다.
+    재시도는 작업 종류에 해당하는 lane으로 보냅니다. (이전 task_stream에서 읽은 작업 포함)
+    """
+    attempt = int(message_data.get("attempt", 0)) + 1
+    if attempt > config.worker.max_retries:
+        await add_to_dead_letter(lane, message_id, message_data, error)
+        return
+
+    retry_at = time.time() + get_retry_delay(attempt)
+    member = json.dumps(
+        {"id": message_id, "fields": {**message_data, "attempt": str(attempt)}}
+    )
+    retry_lane = task_type_lanes[message_data["type"]]
+    await task_redis.zadd(retry_lane.retry_key, {member: retry_at})
+    lane_metrics[lane.name].retried += 1
+
+
+async def move_due_retries(lane: TaskLane) -> int:
+    return await move_due_retries_script(
+        keys=[lane.retry_key, lane.stream], args=[time.time(), lane.batch_size]
+    )
+
+
+async def handle_message(lane: TaskLane, message_id: str, message_data: dict) -> bool:
+    """
+    메시지 하나를 처리하고 ack 가능 여부를 반환합니다.
+    처리에 실패한 메시지는 재시도 대기열(또는 dead-letter stream)로 옮긴 뒤 ack하며,
+    옮기는 것조차 실패하면 pending 상태로 남겨 다른 consumer가 회수하도록 합니다.
+    """
+    task_type = message_data.get("type")
+    data = message_data.get("data")
+    handler = task_handlers.get(task_type)
+    if handler is None or not data:
+        print(f"Skipping unknown task {message_id}: {task_type}")
+        return True
+
+    metrics = lane_metrics[lane.name]
+    try:
+        await handler(decode_payload(message_data))
+    except Exception as e:
+        metrics.record_failure(task_type)
+        print(f"Error processing task {message_id} ({task_type}): {e}")
+        try:
+            await schedule_retry(lane, message_id, message_data, repr(e))
+        except Exception as retry_error:
+            print(f"Error scheduling retry for task {message_id}: {retry_error}")
+            return False
+        return True
+
+    metrics.record_success(task_type, message_id)
+    return True
+
+
+async def replay_dead_letters(
+    limit: Optional[int] = None, task_type: Optional[str] = None
+) -> int:
+    """
+    dead-letter stream의 작업을 작업 종류에 해당하는 lane에 다시 추가합니다. (재시도 횟수 초기화)
+    """
+    replayed = 0
+    start_id = "-"
+    while limit is None or replayed < limit:
+        messages = await task_redis.xrange(
+            TASK_DEAD_LETTER_STREAM, min=start_id, count=100
+        )
+        if not messages:
+            break
+
+        for message_id, message_data in messages:
+            if limit is not None and replayed >= limit:
+                break
+            if task_type and message_data.get("type") != task_type:
+                continue
+
+            fields = {
+                key: message_data[key]
+                for key in ("type", "v", "data")
+                if key in message_data
+            }
+            async with task_redis.pipeline(transaction=True) as pipe:
+                pipe.xadd(task_type_lanes[fields["type"]].stream, fields)
+                pipe.xdel(TASK_DEAD_LETTER_STREAM, message_id)
+                await pipe.execute()
+            replayed += 1
+
+        start_id = f"({messages[-1][0]}"
+
+    return replayed
+
+
+def generate_consumer_name() -> str:
+    # 프로세스마다 고유한 consumer 이름 (여러 워커가 같은 consumer로 읽지 않도록)
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
 
+async def process_messages(
+    lane: TaskLane, messages: list, semaphore: Optional[asyncio.Semaphore]
+) -> None:
+    """
+    배치의 메시지를 동시에 처리한 뒤 성공한 메시지를 ack합니다.
+    메시지는 stream 순서대로 처리를 시작하며, 같은 상품의 변경은 SyncCoalescer가
+    submit된 순서대로 반영하므로 동시에 처리해도 등록/수정 순서가 바뀌지 않습니다.
+    """
 
-async def process_tasks():
+    async def handle(message_id: str, message_data: dict) -> bool:
+        async with semaphore or nullcontext():
+            return await handle_message(lane, message_id, message_data)
+
+    results = await asyncio.gather(
+        *(handle(message_id, message_data) for message_id, message_data in messages)
+    )
+
+    # 처리에 성공한 메시지만 한 번에 ack
+    ack_ids = [
+        message_id for (message_id, _), succeeded in zip(messages, results) if succeeded
+    ]
+    if ack_ids:
+        await task_redis.xack(lane.stream, TASK_GROUP, *ack_ids)
+    lane_metrics[lane.name].batches += 1
+
+
+async def claim_idle_messages(
+    lane: TaskLane, consumer_name: str, semaphore: Optional[asyncio.Semaphore]
+) -> None:
+    """
+    다른 consumer(종료된 워커 등)에 전달된 뒤 오래 처리되지 않은 메시지를 가져와 처리합니다.
+    """
+    start_id = "0-0"
     while True:
+        result = await task_redis.xautoclaim(
+            lane.stream,
+            TASK_GROUP,
+            consumer_name,
+            min_idle_time=config.worker.claim_min_idle_ms,
+            start_id=start_id,
+            count=lane.batch_size,
+        )
+        start_id, messages = result[0], result[1]
+
+        # Redis 6.2는 stream에서 삭제된 메시지를 None으로 반환하므로 ack만 함
+        deleted_ids = [message_id for message_id, data in messages if data is None]
+        messages = [message for message in messages if message[1] is not None]
+        if deleted_ids:
+            await task_redis.xack(lane.stream, TASK_GROUP, *deleted_ids)
+
+        if messages:
+            lane_metrics[lane.name].claimed += len(messages)
+            print(f"Claimed {len(messages)} idle messages from {lane.stream}")
+            messages = await drop_poison_messages(lane, messages, consumer_name)
+            await process_messages(lane, messages, semaphore)
+
+        if start_id == "0-0":
+            break
+
+
+async def drop_poison_messages(
+    lane: TaskLane, messages: list, consumer_name: str
+) -> list:
+    """
+    처리 도중 워커를 종료시키는 메시지가 계속 회수되지 않도록,
+    전달 횟수가 재시도 횟수를 초과한 메시지는 dead-letter stream으로 옮깁니다.
+    """
+    pending = await task_redis.xpending_range(
+        lane.stream,
+        TASK_GROUP,
+        min=messages[0][0],
+        max=messages[-1][0],
+        count=len(messages),
+        consumername=consumer_name,
+    )
+    delivered = {entry["message_id"]: entry["times_delivered"] for entry in pending}
+
+    remaining = []
+    for message_id, message_data in messages:
+        if delivered.get(message_id, 0) > config.worker.max_retries + 1:
+            await add_to_dead_letter(
+                lane, message_id, message_data, "Exceeded max deliveries"
+            )
+            await task_redis.xack(lane.stream, TASK_GROUP, message_id)
+        else:
+            remaining.append((message_id, message_data))
+    return remaining
+
+
+async def remove_stale_consumers(lane: TaskLane, consumer_name: str) -> None:
+    # pending 메시지가 없고 오랫동안 읽지 않은 consumer 정리 (종료된 워커)
+    for consumer in await task_redis.xinfo_consumers(lane.stream, TASK_GROUP):
+        if (
+            consumer["name"] != consumer_name
+            and consumer["pending"] == 0
+            and consumer["idle"] > config.worker.stale_consumer_ms
+        ):
+            await task_redis.xgroup_delconsumer(
+                lane.stream, TASK_GROUP, consumer["name"]
+            )
+            print(f"Removed stale consumer {consumer['name']}")
+
+
+async def remove_consumer(lane: TaskLane, consumer_name: str) -> None:
+    # pending 메시지가 남아 있으면 다른 워커가 가져갈 수 있도록 consumer를 유지
+    for consumer in await task_redis.xinfo_consumers(lane.stream, TASK_GROUP):
+        if consumer["name"] == consumer_name and consumer["pending"] == 0:
+            await task_redis.xgroup_delconsumer(lane.stream, TASK_GROUP, consumer_name)
+
+
+async def create_consumer_group():
+    for lane in task_lanes:
         try:
-            result = await task_redis.xreadgroup(
-                groupname="task_group",
-                consumername="worker_1",
-                streams={"task_stream": ">"},
-                count=1,
-                block=1000,
+            await task_redis.xgroup_create(
+                lane.stream, TASK_GROUP, id="0", mkstream=True
             )
+        except ResponseError as e:
+            if "BUSYGROUP Consumer Group name already exists" not in str(e):
+                raise e
+
+
+async def consume_lane(
+    lane: TaskLane, block_ms: int, consumer_name: str, stop_event: asyncio.Event
+):
+    semaphore = asyncio.Semaphore(lane.concurrency) if lane.concurrency else None
+    claimed_at = 0.0
+
+    try:
+        while not stop_event.is_set():
+            try:
+                # 주기적으로 처리되지 않고 방치된 메시지를 회수
+                if time.monotonic() - claimed_at >= config.worker.claim_interval:
+                    claimed_at = time.monotonic()
+                    await claim_idle_messages(lane, consumer_name, semaphore)
+                    await remove_stale_consumers(lane, consumer_name)
+
+                # 재시도 시각이 된 작업을 다시 stream에 추가
+                await move_due_retries(lane)
+
+                # 새 메시지가 없으면 block_ms 동안 대기하므로 별도의 sleep이 필요 없음
+                result = await task_redis.xreadgroup(
+                    groupname=TASK_GROUP,
+                    consumername=consumer_name,
+                    streams={lane.stream: ">"},
+                    count=lane.batch_size,
+                    block=block_ms,
+                )
 
-            if result:
-                stream, messages = result[0]
-                for message_id, message_data in messages:
-                    task_type = message_data.get("type")
-
-                    if task_type == "sync_product":
-                        data = message_data.get("data")
-                        if data:
-                            product_info = json.loads(data)
-                            await sync_product_to_elasticsearch(product_info)
-                    elif task_type == "sync_product_action":
-                        data = message_data.get("data")
-                        if data:
-                            product_info = json.loads(data)
-                            await update_or_delete_product_to_elasticsearch(
-                                product_info
-                            )
-                    elif task_type == "send_email":
-                        data = message_data.get("data")
-                        if data:
-                            user_info = json.loads(data)
-                            await send_email(user_info["email"], user_info["name"])
-
-                    # 메시지 처리 완료 후 ack (완료 처리함)
-                    await task_redis.xack("task_stream", "task_group", message_id)
+                if result:
+                    stream, messages = result[0]
+                    await process_messages(lane, messages, semaphore)
 
+                await refresh_stream_lag(lane)
+
+            except Exception as e:
+                print(f"Error processing tasks ({lane.name}): {e}")
+                await asyncio.sleep(1)  # Redis 연결 오류 등은 잠시 대기 후 재시도
+    finally:
+        try:
+            # 종료가 지연되지 않도록 정리 작업에 제한 시간을 둠
+            await asyncio.wait_for(remove_consumer(lane, consumer_name), timeout=5)
         except Exception as e:
-            print(f"Error processing tasks: {e}")
-        await asyncio.sleep(1)  # 잠시 대기 후 다음 메시지 확인
+            print(f"Error removing consumer {consumer_name} ({lane.name}): {e}")
+
+
+async def process_tasks(
+    block_ms: Optional[int] = None,
+    consumer_name: Optional[str] = None,
+    stop_event: Optional[asyncio.Event] = None,
+):
+    """
+    모든 lane의 메시지를 lane별 루프에서 동시에 처리합니다.
+    stop_event가 설정되면 처리 중인 배치를 마친 뒤 종료합니다.
+    """
+    block_ms = block_ms or config.worker.block_ms
+    consumer_name = consumer_name or generate_consumer_name()
+    stop_event = stop_event or asyncio.Event()
+
+    print(f"Task consumer {consumer_name} started")
+    try:
+        await asyncio.gather(
+            *(
+                consume_lane(lane, block_ms, consumer_name, stop_event)
+                for lane in task_lanes
+            )
+        )
+    finally:
+        print(f"Task consumer {consumer_name} stopped")
+
+
+async def add_task_to_stream(task_type: str, data: dict):
+    await task_redis.xadd(
+        task_type_lanes[task_type].stream, {"type": task_type, **encode_payload(data)}
+    )
 
 
 async def add_product_to_stream(product_info: dict, action_type: str):
     if action_type == "create":
-        await task_redis.xadd(
-            "task_stream", {"type": "sync_product", "data": json.dumps(product_info)}
-        )
+        await add_task_to_stream("sync_product", product_info)
     elif action_type == "update" or action_type == "delete":
-        await task_redis.xadd(
-            "task_stream",
-            {"type": "sync_product_action", "data": json.dumps(product_info)},
-        )
+        await add_task_to_stream("sync_product_action", product_info)
 
 
 async def add_email_to_stream(user_info: dict):
-    await task_redis.xadd(
-        "task_stream", {"type": "send_email", "data": json.dumps(user_info)}
-    )
+    await add_task_to_stream("send_email", user_info)
 
 
 async def sync_product_to_elasticsearch(product_info: dict):
-    try:
-        await es.index(
-            index="products",
-            id=product_info["id"],
-            body=product_info,
-            refresh="wait_for",
-        )
-    except Exception as e:
-        print(f"Error syncing product to Elasticsearch: {e}")
+    await sync_coalescer.submit(
+        "index", product_info, refresh=config.worker.sync_refresh
+    )
 
 
 async def update_or_delete_product_to_elasticsearch(product_info: dict):
     try:
-        await es.update(
-            index="products",
-            id=product_info["id"],
-            body={"doc": product_info},
-            refresh="wait_for",
+        await sync_coalescer.submit(
+            "update", product_info, refresh=config.worker.sync_action_refresh
         )
-    except Exception as e:
-        print(f"Error updating or deleting product to Elasticsearch: {e}")
+    except DocumentMissingError as e:
+        # 재색인 중 새 인덱스에만 아직 없는 문서는 재색인이 전체 색인 후 DB에서 다시 색인
+        if not e.found:
+            raise
+        await record_reindex_update(product_info["id"])
 
 
 async def send_email(email: str, name: str):
-    smtp_server = os.getenv("SMTP_SERVER")
-    smtp_port = os.getenv("SMTP_PORT")
-    smtp_user = os.getenv("SMTP_USER")
-    smtp_password = os.getenv("SMTP_PASSWORD")
-
     msg = MIMEMultipart()
-    msg["From"] = smtp_user
+    msg["From"] = config.smtp.user
     msg["To"] = email
     msg["Subject"] = "Welcome to our service!"
 
     msg.attach(MIMEText(f"{name}, Thank you for register.", "plain"))
 
-    try:
-        async with SMTP(hostname=smtp_server, port=smtp_port) as client:
-            if smtp_port == 587:
-                await client.starttls()  # TLS 암호화 시작
-            await client.login(smtp_user, smtp_password)  # 로그인
-            await client.send_message(msg)  # 이메일 전송
-        print(f"Email sent to {email}")
-    except Exception as e:
-        print(f"Error sending email: {e}")
+    # 전송 실패 시 예외를 그대로 전달하여 재시도하도록 함
+    await mailer.send(msg)
+    print(f"Email sent to {email}")
+
+
+# 작업 종류별 처리 함수
+task_handlers: dict[str, Callable[[dict], Awaitable]] = {
+    "sync_product": sync_product_to_elasticsearch,
+    "sync_product_action": update_or_delete_product_to_elasticsearch,
+    "send_email": send_welcome_email,
+}
@@ -10,6 +10,9 @@ from src.schema.response import CartResponse
 
 
 class CartService:
+    # 가용 재고가 임계값 이하일 경우 Redis에서 별도 예약 관리
+    reservation_threshold: int = 10
+
     def __init__(
         self,
         cart_repo: CartRepository = Depends(CartRepository),
@@ -23,76 +26,50 @@ class CartService:
         self.stock_repo = stock_repo
 
     async def add_to_cart(self, user_id: int, product_id: int, quantity: int) -> dict:
-        available_stock = None
-
         try:
-            stocks_count: int = await self.stock_repo.count_stocks_by_product_id(
+            stocks_count: int = await self.stock_repo.get_available_stock(
                 product_id=product_id
             )
-            total_in_cart: int = await self.cart_repo.total_stocks_in_cart(
-                product_id=product_id
+            result: dict = await self.cart_repo.add_product_with_stock_check(
+                user_id=user_id,
+                product_id=product_id,
+                quantity=quantity,
+                stocks_count=stocks_count,
+                reserve_threshold=self.reservation_threshold,
             )
-            available_stock = stocks_count - total_in_cart
-
-            current_quantity: int = await self.cart_repo.get_product_quantity_in_cart(
-                user_id=user_id, product_id=product_id
-            )
-            total_quantity = current_quantity + quantity
-
-            if available_stock <= 10:  # 임계값 이하일 경우 Redis에서 별도 예약 관리
-                reserved_quantity: int = await self.cart_repo.get_reserved_quantity(
-                    user_id=user_id, product_id=product_id
-                )
-                total_reserved_quantity: int = reserved_quantity + quantity
-
-                await self.cart_repo.product_reservation(
-                    user_id=user_id,
-                    product_id=product_id,
-                    quantity=total_reserved_quantity,
-                )
-
-            if available_stock >= quantity:
-                await self.cart_repo.add_product(
-                    user_id=user_id, product_id=product_id, quantity=total_quantity
-                )
-
-                return {
-                    "is_success": True,
-                    "message": "Goods added to cart successfully",
-                }
-            else:
-                if available_stock <= 10:
-                    await self.cart_repo.cancel_reservation(
-                        user_id=user_id, product_id=product_id, quantity=quantity
-                    )
-
-                return {
-                    "is_success": False,
-                    "status_code": 400,
-                    "message": f"Quantity requested ({quantity}) exceeds available stock ({available_stock}).",
-                }
-
         except Exception as e:
-            if available_stock is not None and available_stock <= 10:
-                await self.cart_repo.cancel_reservation(
-                    user_id=user_id, product_id=product_id, quantity=quantity
-                )
-
             return {
                 "is_success": False,
                 "status_code": 500,
                 "message": f"An error occurred: {str(e)}",
             }
 
+        if not result["is_added"]:
+            available_stock = result["available_stock"]
+            return {
+                "is_success": False,
+                "status_code": 400,
+                "message": f"Quantity requested ({quantity}) exceeds available stock ({available_stock}).",
+            }
+
+        return {
+            "is_success": True,
+            "message": "Goods added to cart successfully",
+        }
+
     async def get_cart(self, user_id: int) -> list[CartResponse]:
+        # 장바구니 크기와 관계없이 Redis 파이프라인 1회 + Elasticsearch mget 1회로 조회
+        cart_items = await self.cart_repo.get_cart_items(user_id=user_id)
+        products = await self.es_repo.get_products_by_ids(
+            product_ids=list(cart_items.keys())
+        )
+
         cart_response = []
-        product_keys = await self.cart_repo.get_cart_product_keys(user_id=user_id)
-        for key in product_keys:
-            product_id = key.split(":")[2]
-            quantity = await self.cart_repo.get_product_quantity_in_cart(
-                user_id=user_id, product_id=product_id
-            )
-            info = await self.es_repo.get_product_by_id(product_id=product_id)
+        for product_id, quantity in cart_items.items():
+            info = products.get(product_id)
+            if info is None:
+                # 색인에서 삭제된 상품은 제외
+                continue
             cart_response.append(
                 CartResponse(product_id=product_id, quantity=quantity, **info)
             )
@@ -109,9 +86,8 @@ class CartService:
             )
 
     async def clear_cart(self, user_id: int):
-        product_keys = await self.cart_repo.get_cart_product_keys(user_id=user_id)
-        for key in product_keys:
-            product_id = key.split(":")[-1]
+        cart_items = await self.cart_repo.get_cart_items(user_id=user_id)
+        for product_id in cart_items:
             if await self.cart_repo.reserve_key_exists(
                 user_id=user_id, product_id=product_id
             ):
@@ -119,7 +95,9 @@ class CartService:
                     user_id=user_id, product_id=product_id
                 )
 
-        await self.cart_repo.clear_cart(keys=product_keys)
+        await self.cart_repo.clear_cart(
+            user_id=user_id, product_ids=list(cart_items.keys())
+        )
 
     async def update_cart_quantity(
         self, user_id: int, product_id: int, quantity: int
@@ -140,22 +118,33 @@ class CartService:
 
         if quantity == current_quantity:
             return {"is_success": True, "message": "Quantity remains the same"}
-        elif quantity < current_quantity:
-            if await self.cart_repo.reserve_key_exists(
-                user_id=user_id, product_id=product_id
-            ):
-                await self.cart_repo.cancel_reservation(
-                    user_id=user_id, product_id=product_id, quantity=quantity
-                )
-        else:
-            if await self.cart_repo.reserve_key_exists(
-                user_id=user_id, product_id=product_id
-            ):
-                await self.cart_repo.product_reservation(
-                    user_id=user_id, product_id=product_id, quantity=quantity
-                )
 
-        await self.cart_repo.add_product(
-            user_id=user_id, product_id=product_id, quantity=quantity
-        )
+        # 수량 변경도 담기와 같은 스크립트로 재고 확인과 저장을 원자적으로 처리
+        try:
+            stocks_count: int = await self.stock_repo.get_available_stock(
+                product_id=product_id
+            )
+            result: dict = await self.cart_repo.add_product_with_stock_check(
+                user_id=user_id,
+                product_id=product_id,
+                quantity=quantity,
+                stocks_count=stocks_count,
+                reserve_threshold=self.reservation_threshold,
+                replace=True,
+            )
+        except Exception as e:
+            return {
+                "is_success": False,
+                "status_code": 500,
+                "message": f"An error occurred: {str(e)}",
+            }
+
+        if not result["is_added"]:
+            available_stock = result["available_stock"]
+            return {
+                "is_success": False,
+                "status_code": 400,
+                "message": f"Quantity requested ({quantity}) exceeds available stock ({available_stock}).",
+            }
+
         return {"is_success": True, "message": "Cart updated successfully"}
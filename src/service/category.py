@@ -0,0 +1,45 @@
+import asyncio
+
+from src.models.repository import CategoryRepository
+from src.redis_client import get_redis_client
+
+CATEGORY_CHANNEL = "category_events"
+
+
+async def publish_category_invalidation():
+    """모든 프로세스의 카테고리 트리 캐시를 무효화합니다."""
+    await get_redis_client().publish(CATEGORY_CHANNEL, "invalidate")
+
+
+async def listen_category_events(retry_delay: float = 1, max_retry_delay: float = 30):
+    """
+    카테고리 변경 이벤트를 받아 카테고리 트리 캐시를 무효화합니다.
+    연결이 끊기면 대기 시간을 두 배씩 늘려 가며 다시 구독합니다.
+    """
+    delay = retry_delay
+    reconnecting = False
+
+    while True:
+        pubsub = get_redis_client().pubsub()
+        try:
+            await pubsub.subscribe(CATEGORY_CHANNEL)
+            if reconnecting:
+                # 연결이 끊긴 동안 발행된 이벤트는 받지 못했으므로 캐시 무효화
+                CategoryRepository.invalidate_cache()
+            delay = retry_delay
+
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    CategoryRepository.invalidate_cache()
+        except Exception as e:
+            print(f"Error listening to {CATEGORY_CHANNEL} (retry in {delay}s): {e}")
+        finally:
+            try:
+                await pubsub.unsubscribe(CATEGORY_CHANNEL)
+                await pubsub.close()
+            except Exception as e:
+                print(f"Error closing {CATEGORY_CHANNEL} subscription: {e}")
+
+        reconnecting = True
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_retry_delay)
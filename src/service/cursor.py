@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import hmac
+import secrets
+from dataclasses import dataclass
+from typing import Optional
+
+import orjson
+from fastapi import HTTPException
+
+from src import config
+
+# 서명 키 (설정하지 않으면 프로세스마다 임의로 생성, check_cursor_secret 참고)
+cursor_secret = (
+    config.web.cursor_secret.encode()
+    if config.web.cursor_secret
+    else secrets.token_bytes(32)
+)
+
+
+def check_cursor_secret():
+    # 프로세스마다 다른 키를 쓰면 재시작하거나 다른 프로세스로 간 요청의 cursor가 무효가 되므로 시작 시 경고
+    if not config.web.cursor_secret:
+        print(
+            "WEB_CURSOR_SECRET is not set; using a random key for this process. "
+            "Cursors will not work across restarts or multiple API processes."
+        )
+
+
+@dataclass
+class PageCursor:
+    # cursor를 발급한 요청의 조회 조건 (다른 조건의 요청에 재사용하지 못하도록)
+    query: list
+    # 조회할 페이지 번호 (1부터 시작)
+    page: int = 1
+    search_after: Optional[list[int]] = None
+    pit_id: Optional[str] = None
+
+    @property
+    def use_pit(self) -> bool:
+        # 앞쪽 페이지는 PIT 없이 search_after만으로 조회하고, 깊은 페이지부터 PIT 사용
+        return self.pit_id is not None or self.page > config.es.shallow_pages
+
+
+def sign(payload: bytes) -> str:
+    digest = hmac.new(cursor_secret, payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def encode_cursor(cursor: PageCursor) -> str:
+    payload = orjson.dumps(
+        {
+            "q": cursor.query,
+            "p": cursor.page,
+            "sa": cursor.search_after,
+            "pit": cursor.pit_id,
+        }
+    )
+    encoded = base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+    return f"{encoded}.{sign(payload)}"
+
+
+def decode_cursor(token: str, query: list) -> PageCursor:
+    """
+    클라이언트가 보낸 cursor의 서명과 조회 조건을 확인하고 다음 페이지 정보를 반환합니다.
+    """
+    try:
+        encoded, signature = token.split(".")
+        payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        # 문자열 비교는 ASCII가 아닌 문자가 있으면 TypeError가 발생하므로 bytes로 비교
+        if not hmac.compare_digest(signature.encode(), sign(payload).encode()):
+            raise ValueError("signature mismatch")
+        data = orjson.loads(payload)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    if data["q"] != query:
+        raise HTTPException(status_code=400, detail="Cursor does not match the query.")
+
+    return PageCursor(
+        query=data["q"], page=data["p"], search_after=data["sa"], pit_id=data["pit"]
+    )
+
+
+def get_page_cursor(
+    query: list,
+    cursor: Optional[str] = None,
+    search_after: Optional[list[int]] = None,
+    pit_id: Optional[str] = None,
+) -> PageCursor:
+    if cursor:
+        return decode_cursor(cursor, query)
+
+    # cursor 도입 이전 방식 (search_after, pit_id를 직접 전달)
+    if search_after == [0]:
+        search_after = None
+    return PageCursor(query=query, search_after=search_after, pit_id=pit_id)
+
+
+def get_next_cursor(
+    current: PageCursor, next_search_after: Optional[list[int]], pit_id: Optional[str]
+) -> Optional[str]:
+    if next_search_after is None:
+        return None
+
+    return encode_cursor(
+        PageCursor(
+            query=current.query,
+            page=current.page + 1,
+            search_after=next_search_after,
+            pit_id=pit_id,
+        )
+    )
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from email.message import Message
+from typing import Optional
+
+from aiosmtplib import SMTP, SMTPServerDisconnected
+
+
+class RateLimiter:
+    """
+    초당 rate개까지 허용하는 token bucket (rate가 0이면 제한하지 않음)
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.rate, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class SMTPMailer:
+    """
+    로그인된 SMTP 연결을 재사용하여 메일을 전송합니다.
+    send()로 들어온 메일은 batch_size개 또는 batch_window초 단위로 모아
+    하나의 연결에서 연속으로 전송하며, 동시에 사용하는 연결은 최대 pool_size개입니다.
+    """
+
+    def __init__(
+        self,
+        hostname: Optional[str],
+        port: Optional[int],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: Optional[bool] = None,
+        pool_size: int = 2,
+        batch_size: int = 20,
+        batch_window: float = 0.1,
+        rate_limit: float = 0,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        # None이면 서버가 STARTTLS를 지원할 때 사용
+        self.start_tls = start_tls
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.rate_limiter = RateLimiter(rate_limit)
+
+        self.idle_clients: list[SMTP] = []
+        self.connections: Optional[asyncio.Semaphore] = None
+        self.pending: list[tuple[Message, asyncio.Future]] = []
+        self.flush_task: Optional[asyncio.Task] = None
+        self.sending: set[asyncio.Task] = set()
+        self.sent = 0
+        self.connects = 0
+
+    async def send(self, message: Message):
+        """
+        메일을 전송 대기열에 추가하고 전송이 끝날 때까지 기다립니다.
+        전송에 실패하면 예외가 발생합니다.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((message, future))
+
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_later())
+
+        await future
+
+    async def flush_later(self):
+        await asyncio.sleep(self.batch_window)
+        self.flush_task = None
+        self.flush()
+
+    def flush(self):
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.create_task(self.send_batch(batch))
+            self.sending.add(task)
+            task.add_done_callback(self.sending.discard)
+
+    async def connect(self) -> SMTP:
+        client = SMTP(hostname=self.hostname, port=self.port, start_tls=self.start_tls)
+        await client.connect()
+        if self.username:
+            await client.login(self.username, self.password)
+        self.connects += 1
+        return client
+
+    async def send_batch(self, batch: list[tuple[Message, asyncio.Future]]):
+        if self.connections is None:
+            self.connections = asyncio.Semaphore(self.pool_size)
+
+        async with self.connections:
+            client = self.idle_clients.pop() if self.idle_clients else None
+            try:
+                for message, future in batch:
+                    # 요청이 취소되었으면 (워커 종료 대기 시간 초과 등) 보내지 않음
+                    if future.done():
+                        continue
+
+                    await self.rate_limiter.acquire()
+                    try:
+                        if client is None or not client.is_connected:
+                            client = await self.connect()
+                        try:
+                            await client.send_message(message)
+                        except SMTPServerDisconnected:
+                            # 재사용한 연결이 서버에 의해 끊어졌으면 다시 연결하여 한 번 더 시도
+                            client = await self.connect()
+                            await client.send_message(message)
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                    else:
+                        self.sent += 1
+                        if not future.done():
+                            future.set_result(None)
+            finally:
+                if client is not None and client.is_connected:
+                    self.idle_clients.append(client)
+
+    async def close(self):
+        self.flush()
+        await asyncio.gather(*self.sending, return_exceptions=True)
+
+        clients, self.idle_clients = self.idle_clients, []
+        for client in clients:
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
+
+    def to_dict(self) -> dict:
+        return {
+            "sent": self.sent,
+            "connects": self.connects,
+            "idle_connections": len(self.idle_clients),
+            "queued": len(self.pending),
+        }
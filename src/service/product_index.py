@@ -0,0 +1,348 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Optional
+
+from src import config
+from src.elastic_client import (
+    PRODUCTS_ALIAS,
+    PRODUCTS_WRITE_ALIAS,
+    get_elasticsearch_client,
+)
+from src.redis_client import get_task_redis_client
+from src.service.sync import SyncReport, sync_all_products, sync_products_by_ids
+
+es = get_elasticsearch_client()
+task_redis = get_task_redis_client()
+
+# 쓰기 alias가 가리키는 인덱스 목록 캐시 (워커가 이벤트마다 조회하지 않도록)
+write_indices_ttl = 5
+write_indices_cache: tuple[float, list[str]] = (0.0, [])
+
+# 재색인 중 새 인덱스에 아직 없어서 수정하지 못한 상품 ID
+# (전체 색인이 끝난 뒤 DB의 현재 상태로 다시 색인하여, 전체 색인이 쓴 이전 상태를 덮어씀)
+REINDEX_UPDATES_KEY = "products:reindex_updates"
+
+
+# products_v{n} 인덱스에 적용되는 인덱스 템플릿
+# 매핑을 바꾸면 PRODUCTS_TEMPLATE_VERSION을 올리고 put-products-template 후 재색인
+# (분석기 설정은 환경 변수로 바뀌므로 버전 대신 설정의 해시로 변경 여부를 확인)
+PRODUCTS_TEMPLATE = "products_template"
+PRODUCTS_TEMPLATE_VERSION = 1
+
+# 상품명/브랜드명/성분 검색에 사용하는 분석기
+PRODUCT_TEXT_ANALYZER = "product_text"
+
+
+def build_analysis_settings() -> dict:
+    return {
+        "analyzer": {
+            PRODUCT_TEXT_ANALYZER: {
+                "type": "custom",
+                "tokenizer": config.es.product_tokenizer,
+                "filter": [
+                    token_filter.strip()
+                    for token_filter in config.es.product_token_filters.split(",")
+                    if token_filter.strip()
+                ],
+            }
+        }
+    }
+
+
+def get_analysis_hash() -> str:
+    analysis = json.dumps(build_analysis_settings(), sort_keys=True)
+    return hashlib.sha256(analysis.encode()).hexdigest()[:16]
+
+
+def build_products_template() -> dict:
+    # 검색 대상 필드
+    searchable_text = {"type": "text", "analyzer": PRODUCT_TEXT_ANALYZER}
+    # 응답에만 사용하는 필드는 색인하지 않고 _source에만 저장
+    display_text = {"type": "text", "index": False}
+
+    return {
+        "settings": {"analysis": build_analysis_settings()},
+        "mappings": {
+            # 매핑에 없는 필드는 _source에만 저장 (동적 매핑으로 필드가 늘어나지 않도록)
+            "dynamic": False,
+            "_meta": {
+                "version": PRODUCTS_TEMPLATE_VERSION,
+                "analysis": get_analysis_hash(),
+            },
+            "properties": {
+                # 정렬/search_after 기준
+                "id": {"type": "integer"},
+                # term 필터 전용 (범위 조회를 하지 않는 ID는 keyword가 더 효율적)
+                "seller_id": {"type": "keyword"},
+                "category_id": {"type": "keyword"},
+                "category_id_1": {"type": "keyword"},
+                "category_id_2": {"type": "keyword"},
+                "use_status": {"type": "boolean"},
+                "price": {"type": "integer"},
+                "discounted_price": {"type": "integer"},
+                "inventory_quantity": {"type": "integer"},
+                "product_name": searchable_text,
+                "brand_name": searchable_text,
+                "ingredient": searchable_text,
+                "capacity": display_text,
+                "key_specification": display_text,
+                "expiration_date": display_text,
+                "how_to_use": display_text,
+                "caution": display_text,
+                "contact_number": display_text,
+                "category_1": display_text,
+                "category_2": display_text,
+                "category_3": display_text,
+            },
+        },
+    }
+
+
+async def get_template_version() -> Optional[int]:
+    if not await es.indices.exists_index_template(name=PRODUCTS_TEMPLATE):
+        return None
+    response = await es.indices.get_index_template(name=PRODUCTS_TEMPLATE)
+    return response["index_templates"][0]["index_template"].get("version")
+
+
+async def get_live_mapping_meta() -> Optional[dict]:
+    """
+    조회 alias가 가리키는 인덱스의 매핑 _meta (템플릿 도입 이전 인덱스는 {}, 인덱스가 없으면 None)
+    """
+    if not await es.indices.exists(index=PRODUCTS_ALIAS):
+        return None
+    response = await es.indices.get_mapping(index=PRODUCTS_ALIAS)
+    mappings = next(iter(response.values()))["mappings"]
+    return mappings.get("_meta", {})
+
+
+def is_current_mapping(meta: dict) -> bool:
+    # 매핑 버전과 분석기 설정이 모두 현재 코드/환경 변수와 같은지 확인
+    return (
+        meta.get("version") == PRODUCTS_TEMPLATE_VERSION
+        and meta.get("analysis") == get_analysis_hash()
+    )
+
+
+async def put_products_template() -> bool:
+    """
+    상품 인덱스 템플릿을 생성하거나 현재 버전으로 갱신합니다.
+    클러스터에 더 높은 버전이 등록되어 있으면 (새 버전 배포 후 이전 코드 실행 등) 갱신하지 않습니다.
+    템플릿은 새로 만드는 인덱스에만 적용되므로 기존 인덱스에는 재색인해야 반영됩니다.
+    """
+    version = await get_template_version()
+    if version is not None and version > PRODUCTS_TEMPLATE_VERSION:
+        print(
+            f"Skipping {PRODUCTS_TEMPLATE} v{PRODUCTS_TEMPLATE_VERSION}: "
+            f"v{version} is already registered"
+        )
+        return False
+
+    await es.indices.put_index_template(
+        name=PRODUCTS_TEMPLATE,
+        index_patterns=[f"{PRODUCTS_ALIAS}_v*"],
+        template=build_products_template(),
+        version=PRODUCTS_TEMPLATE_VERSION,
+        priority=100,
+    )
+    return True
+
+
+def versioned_index_name(version: int) -> str:
+    return f"{PRODUCTS_ALIAS}_v{version}"
+
+
+async def get_alias_indices(alias: str) -> list[str]:
+    if not await es.indices.exists_alias(name=alias):
+        return []
+    response = await es.indices.get_alias(name=alias)
+    return sorted(response.keys())
+
+
+async def get_write_indices() -> list[str]:
+    """
+    실시간 상품 변경 사항을 반영할 인덱스 목록
+    재색인 중에는 기존 인덱스와 새 인덱스를 모두 반환합니다.
+    """
+    global write_indices_cache
+
+    cached_at, indices = write_indices_cache
+    if indices and time.monotonic() - cached_at < write_indices_ttl:
+        return indices
+
+    try:
+        indices = await get_alias_indices(PRODUCTS_WRITE_ALIAS)
+    except Exception as e:
+        print(f"Error fetching write alias indices: {e}")
+        indices = []
+
+    # alias 도입 이전의 단일 인덱스 환경
+    if not indices:
+        indices = [PRODUCTS_ALIAS]
+
+    write_indices_cache = (time.monotonic(), indices)
+    return indices
+
+
+async def get_sync_index() -> str:
+    """
+    전체 상품을 다시 색인(sync-products)할 인덱스
+    쓰기 alias가 없을 때 alias 이름으로 색인하면 동적 매핑의 인덱스가 새로 만들어지므로,
+    alias 도입 이전의 단일 인덱스가 아니면 실행하지 않습니다.
+    재색인 중(쓰기 인덱스가 둘)에는 재색인이 전체 상품을 색인하므로 실행하지 않습니다.
+    """
+    indices = await get_alias_indices(PRODUCTS_WRITE_ALIAS)
+    if len(indices) > 1:
+        raise RuntimeError(f"Reindex in progress (writing to {', '.join(indices)})")
+    if indices:
+        return indices[0]
+
+    # alias 도입 이전에는 "products"가 실제 인덱스 이름
+    aliased = await es.indices.exists_alias(name=PRODUCTS_ALIAS)
+    if not aliased and await es.indices.exists(index=PRODUCTS_ALIAS):
+        return PRODUCTS_ALIAS
+    raise RuntimeError(
+        f"{PRODUCTS_WRITE_ALIAS} alias does not exist; "
+        "run reindex-products to create the index"
+    )
+
+
+async def record_reindex_update(product_id: int) -> None:
+    await task_redis.sadd(REINDEX_UPDATES_KEY, product_id)
+
+
+async def replay_reindex_updates(index: str, report: SyncReport) -> None:
+    # 기록된 상품을 DB의 현재 상태로 다시 색인
+    while product_ids := await task_redis.spop(REINDEX_UPDATES_KEY, 500):
+        await sync_products_by_ids(
+            index, [int(product_id) for product_id in product_ids], report
+        )
+
+
+async def get_next_version() -> int:
+    response = await es.indices.get(
+        index=f"{PRODUCTS_ALIAS}_v*", allow_no_indices=True, expand_wildcards="all"
+    )
+    versions = [
+        int(match.group(1))
+        for name in response.keys()
+        if (match := re.fullmatch(rf"{PRODUCTS_ALIAS}_v(\d+)", name))
+    ]
+    return max(versions, default=0) + 1
+
+
+async def get_live_settings(indices: list[str]) -> dict:
+    # 재색인 후 복원할 설정 (기존 인덱스가 없으면 ES 기본값)
+    settings = {"number_of_replicas": 1, "refresh_interval": "1s"}
+    if not indices:
+        return settings
+
+    response = await es.indices.get_settings(index=indices[0])
+    index_settings = response[indices[0]]["settings"]["index"]
+    settings["number_of_replicas"] = int(
+        index_settings.get("number_of_replicas", settings["number_of_replicas"])
+    )
+    settings["refresh_interval"] = index_settings.get(
+        "refresh_interval", settings["refresh_interval"]
+    )
+    return settings
+
+
+async def reindex_products(
+    chunk_size: int = 500,
+    concurrency: int = 4,
+    delete_old: bool = False,
+) -> SyncReport:
+    """
+    새 버전의 상품 인덱스(products_v{n})를 만들어 전체 상품을 색인한 뒤
+    조회/쓰기 alias를 원자적으로 새 인덱스로 전환합니다.
+    색인 중 새 인덱스에 아직 없는 문서의 수정은 워커가 기록해 두고, 전체 색인 후 다시 색인합니다.
+    색인이 하나라도 실패하면 alias를 전환하지 않고 새 인덱스를 삭제합니다.
+    """
+    old_indices = await get_alias_indices(PRODUCTS_ALIAS)
+    # alias 도입 이전에는 "products"가 실제 인덱스 이름
+    legacy_index = not old_indices and await es.indices.exists(index=PRODUCTS_ALIAS)
+    if legacy_index:
+        old_indices = [PRODUCTS_ALIAS]
+
+    live_settings = await get_live_settings(old_indices)
+    new_index = versioned_index_name(await get_next_version())
+
+    # 새 인덱스가 현재 버전의 매핑/분석기로 만들어지도록 템플릿을 먼저 갱신
+    await put_products_template()
+
+    # 대량 색인 중에는 복제본과 주기적 refresh를 끔 (매핑과 분석기는 템플릿에서 적용)
+    await es.indices.create(
+        index=new_index,
+        settings={"number_of_replicas": 0, "refresh_interval": "-1"},
+    )
+    print(f"Created index {new_index}")
+
+    # 중단된 이전 재색인에서 남은 기록 삭제
+    await task_redis.delete(REINDEX_UPDATES_KEY)
+
+    try:
+        # 워커가 색인 중에도 실시간 변경 사항을 새 인덱스에 반영하도록 쓰기 alias에 추가
+        await es.indices.update_aliases(
+            actions=[{"add": {"index": new_index, "alias": PRODUCTS_WRITE_ALIAS}}]
+            + [
+                {"add": {"index": index, "alias": PRODUCTS_WRITE_ALIAS}}
+                for index in old_indices
+            ]
+        )
+        # 워커의 쓰기 인덱스 캐시가 만료될 때까지 대기
+        await asyncio.sleep(write_indices_ttl)
+
+        # 워커가 먼저 반영한 최신 문서는 덮어쓰지 않음
+        report = await sync_all_products(
+            index=new_index,
+            chunk_size=chunk_size,
+            concurrency=concurrency,
+            op_type="create",
+        )
+        await replay_reindex_updates(new_index, report)
+        if report.failed:
+            raise RuntimeError(f"{report.failed} products failed to index")
+
+        await es.indices.put_settings(index=new_index, settings=live_settings)
+        await es.options(request_timeout=600).indices.forcemerge(
+            index=new_index, max_num_segments=1
+        )
+        await es.indices.refresh(index=new_index)
+
+        # 위 작업 중에 응답을 받아 기록된 수정 사항 (alias 전환 전에 반영)
+        await replay_reindex_updates(new_index, report)
+        if report.failed:
+            raise RuntimeError(f"{report.failed} products failed to index")
+    except BaseException:
+        await es.indices.update_aliases(
+            actions=[{"remove": {"index": new_index, "alias": PRODUCTS_WRITE_ALIAS}}]
+        )
+        await es.indices.delete(index=new_index)
+        print(f"Reindex aborted, deleted {new_index}")
+        raise
+
+    # 조회/쓰기 alias를 한 번의 요청으로 전환
+    actions = [
+        {"add": {"index": new_index, "alias": PRODUCTS_ALIAS}},
+        {"add": {"index": new_index, "alias": PRODUCTS_WRITE_ALIAS}},
+    ]
+    if legacy_index:
+        # alias와 같은 이름의 인덱스는 alias 추가와 동시에 삭제해야 함
+        actions.append({"remove_index": {"index": PRODUCTS_ALIAS}})
+    else:
+        for index in old_indices:
+            actions.append({"remove": {"index": index, "alias": PRODUCTS_ALIAS}})
+            actions.append({"remove": {"index": index, "alias": PRODUCTS_WRITE_ALIAS}})
+    await es.indices.update_aliases(actions=actions)
+    print(f"Switched aliases to {new_index}")
+
+    if delete_old and not legacy_index:
+        for index in old_indices:
+            await es.indices.delete(index=index)
+            print(f"Deleted old index {index}")
+
+    return report
@@ -0,0 +1,71 @@
+import base64
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Callable
+
+import orjson
+
+from src import config
+
+
+@dataclass(frozen=True)
+class PayloadCodec:
+    version: str
+    encode: Callable[[dict], str]
+    decode: Callable[[str], dict]
+
+
+# stream 메시지의 "v" 필드 값별 codec
+# 새 형식을 추가해도 이전 형식의 메시지를 읽을 수 있도록 기존 버전은 삭제하지 않음
+codecs: dict[str, PayloadCodec] = {}
+
+
+def register_codec(codec: PayloadCodec) -> None:
+    codecs[codec.version] = codec
+
+
+def encode_compressed(data: dict) -> str:
+    # Redis 클라이언트가 문자열로 응답을 디코딩하므로 압축 결과는 base85로 인코딩
+    return base64.b85encode(zlib.compress(orjson.dumps(data))).decode()
+
+
+def decode_compressed(payload: str) -> dict:
+    return orjson.loads(zlib.decompress(base64.b85decode(payload)))
+
+
+# 1: 표준 json (버전 필드가 없는 이전 메시지)
+register_codec(PayloadCodec("1", json.dumps, json.loads))
+# 2: orjson (한글을 \uXXXX로 이스케이프하지 않아 더 작고, 인코딩/디코딩이 빠름)
+register_codec(
+    PayloadCodec("2", lambda data: orjson.dumps(data).decode(), orjson.loads)
+)
+# 3: orjson + zlib (how_to_use, ingredient 등 긴 텍스트가 포함된 메시지용)
+register_codec(PayloadCodec("3", encode_compressed, decode_compressed))
+
+LEGACY_VERSION = "1"
+COMPRESSED_VERSION = "3"
+
+
+def encode_payload(data: dict) -> dict[str, str]:
+    """
+    stream 메시지에 저장할 {"v": 버전, "data": 인코딩된 문자열}을 반환합니다.
+    인코딩 결과가 compress_min_bytes 이상이고 압축하는 편이 작으면 압축합니다.
+    """
+    codec = codecs[config.worker.payload_version]
+    payload = codec.encode(data)
+
+    # 한글 등은 한 글자가 여러 바이트이므로 문자 수가 아닌 바이트 수로 비교 (압축 결과는 ASCII)
+    payload_bytes = len(payload.encode())
+    min_bytes = config.worker.payload_compress_min_bytes
+    if min_bytes and payload_bytes >= min_bytes:
+        compressed = codecs[COMPRESSED_VERSION].encode(data)
+        if len(compressed) < payload_bytes:
+            return {"v": COMPRESSED_VERSION, "data": compressed}
+
+    return {"v": codec.version, "data": payload}
+
+
+def decode_payload(message_data: dict) -> dict:
+    codec = codecs[message_data.get("v", LEGACY_VERSION)]
+    return codec.decode(message_data["data"])
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src import config
+from src.metrics import register_collector
+from src.service.background_task import TASK_DEAD_LETTER_STREAM, task_lanes, task_redis
+
+
+@dataclass
+class StreamStats:
+    length: int = 0
+    pending: int = 0
+    memory_bytes: Optional[int] = None
+    trimmed: int = 0
+    # 마지막으로 계산한 trim 기준 ID (이보다 작은 ID의 메시지만 삭제됨)
+    trim_id: Optional[str] = None
+
+
+stream_stats: dict[str, StreamStats] = {}
+
+
+def collect_stream_stats() -> dict:
+    return {
+        stream: {
+            "length": stats.length,
+            "pending": stats.pending,
+            "memory_bytes": stats.memory_bytes,
+            "trimmed": stats.trimmed,
+            "trim_id": stats.trim_id,
+        }
+        for stream, stats in stream_stats.items()
+    }
+
+
+register_collector("task_streams", collect_stream_stats)
+
+
+def parse_stream_id(stream_id: str) -> tuple[int, int]:
+    milliseconds, sequence = stream_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+async def get_trim_id(stream: str) -> Optional[str]:
+    """
+    모든 consumer 그룹이 처리(ack)를 마친 구간의 끝 ID를 반환합니다.
+    - pending 메시지가 있으면 가장 오래된 pending 메시지까지
+    - 없으면 그룹에 마지막으로 전달된 메시지까지
+    보존 기간(retention)이 설정되어 있으면 그 기간 안의 메시지도 남깁니다.
+    """
+    groups = await task_redis.xinfo_groups(stream)
+    if not groups:
+        # consumer 그룹이 없으면 아무도 읽지 않았으므로 삭제하지 않음
+        return None
+
+    candidates = []
+    for group in groups:
+        if group["pending"]:
+            summary = await task_redis.xpending(stream, group["name"])
+            candidates.append(summary["min"])
+        else:
+            candidates.append(group["last-delivered-id"])
+
+    if config.worker.stream_retention_ms:
+        retention_ms = int(time.time() * 1000) - config.worker.stream_retention_ms
+        candidates.append(f"{retention_ms}-0")
+
+    return min(candidates, key=parse_stream_id)
+
+
+async def trim_stream(stream: str) -> int:
+    trim_id = await get_trim_id(stream)
+    stats = stream_stats.setdefault(stream, StreamStats())
+    stats.trim_id = trim_id
+    if trim_id is None or trim_id == "0-0":
+        return 0
+
+    # 근사(~) trim은 radix tree 노드 단위로만 삭제하므로 비용이 적음
+    trimmed = await task_redis.xtrim(stream, minid=trim_id, approximate=True)
+    stats.trimmed += trimmed
+    return trimmed
+
+
+async def refresh_stream_stats(stream: str):
+    stats = stream_stats.setdefault(stream, StreamStats())
+    stats.length = await task_redis.xlen(stream)
+    stats.pending = sum(
+        group["pending"] for group in await task_redis.xinfo_groups(stream)
+    )
+    try:
+        stats.memory_bytes = await task_redis.memory_usage(stream)
+    except Exception:
+        # MEMORY 명령을 지원하지 않는 환경
+        stats.memory_bytes = None
+
+
+async def maintain_task_streams(interval: Optional[float] = None):
+    """
+    주기적으로 처리가 끝난 메시지를 stream에서 삭제하고, stream 상태를 기록합니다.
+    """
+    interval = interval or config.worker.stream_trim_interval
+
+    while True:
+        try:
+            for lane in task_lanes:
+                if not await task_redis.exists(lane.stream):
+                    continue
+
+                trimmed = await trim_stream(lane.stream)
+                await refresh_stream_stats(lane.stream)
+                stats = stream_stats[lane.stream]
+                print(
+                    f"{lane.stream}: length={stats.length} pending={stats.pending} "
+                    f"memory={stats.memory_bytes} trimmed={trimmed}"
+                )
+
+                retry_queue = await task_redis.zcard(lane.retry_key)
+                if retry_queue:
+                    print(f"{lane.retry_key}: {retry_queue} tasks waiting for retry")
+
+            # dead-letter stream은 consumer 그룹이 없으므로 XADD 시 MAXLEN으로 길이를 제한함
+            if await task_redis.exists(TASK_DEAD_LETTER_STREAM):
+                await refresh_stream_stats(TASK_DEAD_LETTER_STREAM)
+        except Exception as e:
+            print(f"Error maintaining task streams: {e}")
+
+        await asyncio.sleep(interval)
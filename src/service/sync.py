@@ -1,44 +1,364 @@
-from sqlmodel.ext.asyncio.session import AsyncSession
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
 
-from src.database import engine
+from src.database import create_session
 from src.elastic_client import get_elasticsearch_client
-from src.models.repository import ProductRepository
+from src.models.category import CategoryTree
+from src.models.product import Product
+from src.models.repository import CategoryRepository, ProductRepository
 
 es = get_elasticsearch_client()
 
 
-async def sync_all_products():
-    async with AsyncSession(engine) as session:
-        product_repo = ProductRepository(session)
+@dataclass
+class SyncReport:
+    indexed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def docs_per_sec(self) -> float:
+        return self.indexed / self.elapsed if self.elapsed else 0.0
+
+
+def build_product_document(product: Product, category_tree: CategoryTree) -> dict:
+    product_info = product.model_dump()
+
+    ##### 필요한 추가 정보 입력 #####
+    # 1. 판매자 정보 : 브랜드명, 전화번호
+    product_info["brand_name"] = product.seller.brand_name
+    product_info["contact_number"] = product.seller.contact_number
+    # 2. 카테고리 정보 : 종류별(대/중/소) 카테고리 ID, 카테고리명
+    category_path = category_tree.get_path(product.category_id)
+    if category_path is None:
+        raise ValueError(
+            f"Unknown category {product.category_id} for product {product.id}"
+        )
+    # 소분류 (id는 상품 정보에 category_id 필드로 이미 포함되어 있음)
+    product_info["category_3"] = category_path.tertiary_name
+    # 중분류
+    product_info["category_id_2"] = category_path.secondary_id
+    product_info["category_2"] = category_path.secondary_name
+    # 대분류
+    product_info["category_id_1"] = category_path.primary_id
+    product_info["category_1"] = category_path.primary_name
+
+    return product_info
+
+
+async def bulk_index_documents(
+    index: str, documents: list[dict], report: SyncReport, op_type: str = "index"
+) -> None:
+    operations = []
+    for document in documents:
+        operations.append({op_type: {"_index": index, "_id": document["id"]}})
+        operations.append(document)
+
+    try:
+        response = await es.bulk(operations=operations)
+    except Exception as e:
+        report.failed += len(documents)
+        print(f"Error bulk indexing {len(documents)} products: {e}")
+        return
+
+    for item in response["items"]:
+        result = item[op_type]
+        if op_type == "create" and result.get("status") == 409:
+            # 이미 최신 문서가 색인되어 있음 (재색인 중 실시간 변경 사항이 먼저 반영된 경우)
+            report.skipped += 1
+        elif result.get("error"):
+            report.failed += 1
+            print(f"Error indexing product {result['_id']}: {result['error']}")
+        else:
+            report.indexed += 1
+
+
+class DocumentMissingError(RuntimeError):
+    """수정할 문서가 인덱스에 없음 (update 404)"""
+
+    def __init__(self, missing: list[str], found: list[str]):
+        super().__init__(f"Document missing in {missing}")
+        # 문서가 없는 인덱스 / 수정에 성공한 인덱스
+        self.missing = missing
+        self.found = found
+
+
+# refresh 옵션을 합칠 때의 우선순위 (뒤로 갈수록 강함)
+REFRESH_PRIORITY = ["false", "wait_for", "true"]
+
+
+class BulkWriter:
+    """
+    여러 작업의 색인 요청을 모아 하나의 _bulk 요청으로 전송합니다.
+    대기 중인 action이 max_actions개가 되거나 flush_interval초가 지나면 전송하며,
+    같은 문서에 대한 action이 요청된 순서대로 반영되도록 refresh 옵션이 달라도 나누지 않고
+    대기 중인 요청 중 가장 강한 refresh 옵션으로 한 번에 보냅니다.
+    """
+
+    def __init__(self, max_actions: int = 500, flush_interval: float = 0.1):
+        self.max_actions = max_actions
+        self.flush_interval = flush_interval
+        # 요청 순서대로 (action 목록, 완료 future)
+        self.pending: list[tuple[list[tuple[dict, dict]], asyncio.Future]] = []
+        self.pending_actions = 0
+        self.refresh = "false"
+        self.flush_task: Optional[asyncio.Task] = None
+
+    async def write(self, actions: list[tuple[dict, dict]], refresh: str = "false"):
+        """
+        (action, source) 목록을 전송하고 모두 성공할 때까지 기다립니다.
+        하나라도 실패하면 예외가 발생합니다.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((actions, future))
+        self.pending_actions += len(actions)
+        self.refresh = max(self.refresh, refresh, key=REFRESH_PRIORITY.index)
+
+        if self.pending_actions >= self.max_actions:
+            await self.flush()
+        elif self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_later())
+
+        await future
+
+    async def flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self.flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+
+        pending, refresh = self.pending, self.refresh
+        self.pending, self.pending_actions, self.refresh = [], 0, "false"
+        if pending:
+            await self.send(pending, refresh)
+
+    async def send(
+        self,
+        entries: list[tuple[list[tuple[dict, dict]], asyncio.Future]],
+        refresh: str,
+    ):
+        operations = []
+        for actions, _ in entries:
+            for action, source in actions:
+                operations.append(action)
+                operations.append(source)
+
         try:
-            products = await product_repo.fetch_all_products()  # 기존 상품 전체 가져오기
-
-            for product in products:
-                product_info = product.model_dump()
-
-                ##### 필요한 추가 정보 입력 #####
-                # 1. 판매자 정보 : 브랜드명, 전화번호
-                product_info["brand_name"] = product.seller.brand_name
-                product_info["contact_number"] = product.seller.contact_number
-                # 2. 카테고리 정보 : 종류별(대/중/소) 카테고리 ID, 카테고리명
-                # 소분류 (id는 상품 정보에 category_id 필드로 이미 포함되어 있음)
-                product_info["category_3"] = product.category.name
-                # 중분류
-                product_info["category_id_2"] = product.category.secondary_category.id
-                product_info["category_2"] = product.category.secondary_category.name
-                # 대분류
-                product_info[
-                    "category_id_1"
-                ] = product.category.secondary_category.primary_category.id
-                product_info[
-                    "category_1"
-                ] = product.category.secondary_category.primary_category.name
-
-                await es.index(
-                    index="products",
-                    id=product_info["id"],
-                    body=product_info,
-                    refresh="wait_for",
-                )
+            response = await es.bulk(operations=operations, refresh=refresh)
         except Exception as e:
-            print(f"Error syncing all products: {e}")
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # 응답 item은 요청한 action 순서와 같음
+        items = iter(response["items"])
+        for actions, future in entries:
+            errors, missing, found = [], [], []
+            for _ in actions:
+                (op_type, result), *_ = next(items).items()
+                if op_type == "update" and result.get("status") == 404:
+                    # 아직 색인되지 않은 문서의 수정도 실패로 처리하여 재시도되도록 함
+                    missing.append(result["_index"])
+                elif result.get("error"):
+                    errors.append(result["error"])
+                else:
+                    found.append(result["_index"])
+
+            if future.done():
+                continue
+            if errors:
+                future.set_exception(RuntimeError(f"Bulk indexing failed: {errors}"))
+            elif missing:
+                future.set_exception(DocumentMissingError(missing, found))
+            else:
+                future.set_result(None)
+
+
+@dataclass
+class PendingSync:
+    op_type: str
+    document: dict
+    refresh: str
+    future: asyncio.Future
+    events: int = 1
+
+
+class SyncCoalescer:
+    """
+    짧은 시간 동안 같은 상품에 대해 들어온 동기화 이벤트를 하나로 합쳐 전송합니다.
+    필드는 나중에 들어온 값이 이기며, 전체 문서 색인(index)과 합쳐진 부분 수정은 전체 문서에 반영됩니다.
+    같은 상품의 변경은 submit된 순서대로 반영되도록, 이전 전송이 끝난 뒤에 다음 전송을 시작합니다.
+    """
+
+    def __init__(
+        self,
+        writer: BulkWriter,
+        resolve_indices: Callable[[], Awaitable[list[str]]],
+        window: float = 0.1,
+    ):
+        self.writer = writer
+        # 반영할 인덱스 목록 (전송할 때마다 조회)
+        self.resolve_indices = resolve_indices
+        self.window = window
+        self.pending: dict[int, PendingSync] = {}
+        # 상품별로 전송 중인 변경의 future
+        self.writing: dict[int, asyncio.Future] = {}
+        self.flush_task: Optional[asyncio.Task] = None
+        self.received = 0
+        self.written = 0
+
+    async def submit(self, op_type: str, document: dict, refresh: str = "false"):
+        """
+        변경 사항이 반영될 때까지 기다립니다.
+        전송 순서가 submit 순서와 같도록 호출 전에 다른 작업을 기다리지 않아야 합니다.
+        """
+        self.received += 1
+        product_id = document["id"]
+        entry = self.pending.get(product_id)
+
+        if entry is None:
+            entry = PendingSync(
+                op_type=op_type,
+                document=dict(document),
+                refresh=refresh,
+                future=asyncio.get_running_loop().create_future(),
+            )
+            self.pending[product_id] = entry
+        else:
+            entry.document.update(document)
+            entry.events += 1
+            if op_type == "index":
+                entry.op_type = "index"
+            entry.refresh = max(entry.refresh, refresh, key=REFRESH_PRIORITY.index)
+
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_later())
+
+        # 같은 future를 여러 이벤트가 기다리므로 한 이벤트의 취소가 전파되지 않도록 함
+        await asyncio.shield(entry.future)
+
+    async def flush_later(self):
+        await asyncio.sleep(self.window)
+        self.flush_task = None
+
+        pending, self.pending = self.pending, {}
+        tasks = [
+            asyncio.create_task(self.write(product_id, entry))
+            for product_id, entry in pending.items()
+        ]
+        # 모든 요청이 BulkWriter에 쌓인 뒤 바로 전송 (BulkWriter의 대기 시간을 중복으로 기다리지 않음)
+        await asyncio.sleep(0)
+        await self.writer.flush()
+        await asyncio.gather(*tasks)
+
+    async def write(self, product_id: int, entry: PendingSync):
+        # 이전 구간에서 합쳐진 같은 상품의 변경이 아직 전송 중이면 끝날 때까지 대기 (성공 여부와 무관)
+        previous = self.writing.get(product_id)
+        self.writing[product_id] = entry.future
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+
+            indices = await self.resolve_indices()
+            if entry.op_type == "index":
+                actions = [
+                    ({"index": {"_index": index, "_id": product_id}}, entry.document)
+                    for index in indices
+                ]
+            else:
+                actions = [
+                    (
+                        {"update": {"_index": index, "_id": product_id}},
+                        {"doc": entry.document},
+                    )
+                    for index in indices
+                ]
+
+            await self.writer.write(actions, refresh=entry.refresh)
+        except Exception as e:
+            entry.future.set_exception(e)
+        else:
+            self.written += 1
+            entry.future.set_result(None)
+        finally:
+            if self.writing.get(product_id) is entry.future:
+                del self.writing[product_id]
+
+    def to_dict(self) -> dict:
+        return {
+            "events_received": self.received,
+            "documents_written": self.written,
+            "pending": len(self.pending),
+        }
+
+
+async def sync_products_by_ids(
+    index: str, product_ids: list[int], report: SyncReport
+) -> None:
+    """지정한 상품을 DB의 현재 상태로 색인합니다. (이미 색인된 문서는 덮어씀)"""
+    async with create_session() as session:
+        category_tree = await CategoryRepository(session).get_category_tree()
+        products = await ProductRepository(session).fetch_products(product_ids)
+        documents = [
+            build_product_document(product, category_tree) for product in products
+        ]
+
+    if documents:
+        await bulk_index_documents(index, documents, report)
+
+
+async def sync_all_products(
+    index: str,
+    chunk_size: int = 500,
+    concurrency: int = 4,
+    op_type: str = "index",
+) -> SyncReport:
+    """
+    DB의 전체 상품을 chunk 단위로 읽어 Elasticsearch bulk API로 색인합니다.
+    동시에 전송 중인 bulk 요청은 최대 concurrency개이며, 색인 후 한 번만 refresh합니다.
+    op_type이 "create"이면 이미 색인된 문서는 덮어쓰지 않습니다.
+    """
+    report = SyncReport()
+    semaphore = asyncio.Semaphore(concurrency)
+    pending: set[asyncio.Task] = set()
+    start = time.perf_counter()
+
+    async def send(documents: list[dict]):
+        try:
+            await bulk_index_documents(index, documents, report, op_type)
+        finally:
+            semaphore.release()
+
+    async with create_session() as session:
+        category_tree = await CategoryRepository(session).get_category_tree()
+        product_repo = ProductRepository(session)
+
+        async for products in product_repo.stream_all_products(chunk_size):
+            documents = [
+                build_product_document(product, category_tree) for product in products
+            ]
+            # 전송 중인 요청이 concurrency개를 넘지 않도록 대기 (메모리 사용량 제한)
+            await semaphore.acquire()
+            task = asyncio.create_task(send(documents))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+            print(
+                f"Indexed {report.indexed} products "
+                f"({report.indexed / (time.perf_counter() - start):.0f} docs/sec)"
+            )
+
+        await asyncio.gather(*pending)
+
+    await es.indices.refresh(index=index)
+
+    report.elapsed = time.perf_counter() - start
+    return report
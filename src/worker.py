@@ -0,0 +1,86 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI, Response, status
+
+from src import config
+from src.apis.common import metrics
+from src.database import close_db
+from src.service.background_task import (
+    create_consumer_group,
+    generate_consumer_name,
+    mailer,
+    process_tasks,
+)
+from src.service.stream_maintenance import maintain_task_streams
+
+
+async def stop_consumer(app: FastAPI):
+    # 새 메시지는 더 읽지 않고, 처리 중인 배치가 끝날 때까지 기다림
+    app.state.stop_event.set()
+    try:
+        await asyncio.wait_for(
+            app.state.consumer_task, timeout=config.worker.drain_timeout
+        )
+    except asyncio.TimeoutError:
+        print("Drain timed out, cancelling in-flight tasks")
+    except Exception as e:
+        print(f"Error occurred while stopping consumer: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await create_consumer_group()
+
+    app.state.consumer_name = generate_consumer_name()
+    app.state.stop_event = asyncio.Event()
+    app.state.consumer_task = asyncio.create_task(
+        process_tasks(
+            consumer_name=app.state.consumer_name, stop_event=app.state.stop_event
+        )
+    )
+    # 처리가 끝난 메시지 삭제 및 stream 상태 기록
+    app.state.maintenance_task = asyncio.create_task(maintain_task_streams())
+
+    yield
+
+    # uvicorn은 SIGTERM/SIGINT를 받으면 요청 처리를 멈추고 lifespan 종료 단계를 실행함
+    await stop_consumer(app)
+    app.state.maintenance_task.cancel()
+    await mailer.close()
+
+    await close_db()
+
+
+def health_handler(response: Response) -> dict:
+    consumer_task: asyncio.Task = app.state.consumer_task
+    if consumer_task.done():
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "Task consumer stopped"}
+    return {"status": "Task consumer is running", "consumer": app.state.consumer_name}
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_api_route(
+    methods=["GET"],
+    path="/health",
+    endpoint=health_handler,
+    status_code=status.HTTP_200_OK,
+)
+app.add_api_route(
+    methods=["GET"],
+    path="/metrics",
+    endpoint=metrics.handler,
+    status_code=status.HTTP_200_OK,
+)
+
+
+if __name__ == "__main__":
+    # 프로세스마다 별도의 consumer로 task_group에 참여함
+    uvicorn.run(
+        "src.worker:app",
+        host=config.worker.host,
+        port=config.worker.port,
+        workers=config.worker.processes,
+    )
@@ -0,0 +1,17 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+
+# 'GET /metrics' API가 DB 커넥션 풀 지표를 반환한다.
+@pytest.mark.asyncio
+async def test_metrics_successfully(client: AsyncClient):
+    # when
+    response = await client.get("/metrics")
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()
+    assert data["db_pool"]["checkouts"] >= 1
+    assert data["db_pool"]["in_use"] >= 0
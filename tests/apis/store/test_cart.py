@@ -0,0 +1,95 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.elastic_client import get_elasticsearch_client
+from src.models.repository import PRODUCT_CART_FIELDS, CartRepository
+from src.service.session import SessionService
+
+
+# 'GET /cart' API가 장바구니 상품을 한 번의 mget 요청으로 조회한다.
+@pytest.mark.asyncio
+async def test_get_cart_successfully(client: AsyncClient, mocker):
+    mocker.patch.object(SessionService, "get_session", return_value={"user_id": 1})
+    mocker.patch.object(
+        CartRepository, "get_cart_items", return_value={1: 2, 2: 1, 3: 5}
+    )
+    mget = mocker.patch.object(
+        get_elasticsearch_client(),
+        "mget",
+        new_callable=mocker.AsyncMock,
+        return_value={
+            "docs": [
+                {
+                    "_id": "1",
+                    "found": True,
+                    "_source": {
+                        "product_name": "테스트 상품1",
+                        "price": 100,
+                        "discounted_price": 90,
+                    },
+                },
+                {
+                    "_id": "2",
+                    "found": True,
+                    "_source": {
+                        "product_name": "테스트 상품2",
+                        "price": 200,
+                        "discounted_price": 0,
+                    },
+                },
+                # 색인에서 삭제된 상품
+                {"_id": "3", "found": False},
+            ]
+        },
+    )
+
+    response = await client.get("/cart", cookies={"session_id": "valid_session_id"})
+
+    assert response.status_code == status.HTTP_200_OK
+
+    # 삭제된 상품은 제외하고, 장바구니 필드(PRODUCT_CART_FIELDS)만 조회한다.
+    assert response.json() == [
+        {
+            "product_id": 1,
+            "product_name": "테스트 상품1",
+            "price": 100,
+            "discounted_price": 90,
+            "quantity": 2,
+        },
+        {
+            "product_id": 2,
+            "product_name": "테스트 상품2",
+            "price": 200,
+            "discounted_price": 0,
+            "quantity": 1,
+        },
+    ]
+    mget.assert_awaited_once()
+    assert mget.call_args.kwargs["ids"] == ["1", "2", "3"]
+    assert mget.call_args.kwargs["source_includes"] == PRODUCT_CART_FIELDS
+
+
+# 'GET /cart' API가 장바구니가 비어 있으면 Elasticsearch를 조회하지 않는다.
+@pytest.mark.asyncio
+async def test_get_empty_cart(client: AsyncClient, mocker):
+    mocker.patch.object(SessionService, "get_session", return_value={"user_id": 1})
+    mocker.patch.object(CartRepository, "get_cart_items", return_value={})
+    mget = mocker.patch.object(
+        get_elasticsearch_client(), "mget", new_callable=mocker.AsyncMock
+    )
+
+    response = await client.get("/cart", cookies={"session_id": "valid_session_id"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+    mget.assert_not_called()
+
+
+# 'GET /cart' API가 세션 ID 없이 호출되면 400을 반환한다.
+@pytest.mark.asyncio
+async def test_get_cart_without_session(client: AsyncClient):
+    response = await client.get("/cart")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Missing Session ID"}
@@ -0,0 +1,62 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.models.category import CategoryTree
+from src.models.product import PrimaryCategory, SecondaryCategory, TertiaryCategory
+from src.models.repository import CategoryRepository
+
+
+# 'GET /categories' API가 대/중/소 카테고리 트리를 반환한다.
+@pytest.mark.asyncio
+async def test_get_categories_successfully(client: AsyncClient, mocker):
+    category_tree = CategoryTree(
+        primary_categories=[PrimaryCategory(id=1, name="스킨케어")],
+        secondary_categories=[
+            SecondaryCategory(id=1, name="토너", primary_category_id=1),
+            SecondaryCategory(id=2, name="에센스", primary_category_id=1),
+        ],
+        tertiary_categories=[
+            TertiaryCategory(id=1, name="스킨", secondary_category_id=1),
+            TertiaryCategory(id=2, name="토너패드", secondary_category_id=1),
+            TertiaryCategory(id=3, name="세럼", secondary_category_id=2),
+        ],
+    )
+
+    mocker.patch.object(
+        CategoryRepository, "get_category_tree", return_value=category_tree
+    )
+
+    response = await client.get("/categories")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Cache-Control"] == "public, max-age=300"
+
+    data = response.json()
+    assert data == [
+        {
+            "id": 1,
+            "name": "스킨케어",
+            "children": [
+                {
+                    "id": 1,
+                    "name": "토너",
+                    "children": [
+                        {"id": 1, "name": "스킨", "children": []},
+                        {"id": 2, "name": "토너패드", "children": []},
+                    ],
+                },
+                {
+                    "id": 2,
+                    "name": "에센스",
+                    "children": [{"id": 3, "name": "세럼", "children": []}],
+                },
+            ],
+        }
+    ]
+
+    # 소분류 ID로 전체 경로를, 상위 카테고리 ID로 하위 소분류 ID 집합을 조회할 수 있다.
+    assert category_tree.get_path(3).secondary_name == "에센스"
+    assert category_tree.get_tertiary_ids("primary", 1) == {1, 2, 3}
+    assert category_tree.get_tertiary_ids("secondary", 1) == {1, 2}
+    assert category_tree.get_tertiary_ids("invalid", 1) is None
@@ -2,9 +2,38 @@ import pytest
 from fastapi import status
 from httpx import AsyncClient
 
+from src import config
+from src.elastic_client import PRODUCTS_ALIAS, get_elasticsearch_client
 from src.models.product import Product, TertiaryCategory
-from src.models.repository import ElasticsearchRepository, ProductRepository
+from src.models.repository import (
+    PRODUCT_DETAIL_FIELDS,
+    PRODUCT_LIST_FIELDS,
+    ElasticsearchRepository,
+    ProductRepository,
+)
 from src.models.user import Seller
+from src.pit import pit_manager
+
+
+def build_search_response(first_id: int, size: int = 10) -> dict:
+    # 목록용 필드만 포함된 검색 결과 (id 내림차순)
+    return {
+        "hits": {
+            "hits": [
+                {
+                    "_source": {
+                        "id": product_id,
+                        "brand_name": "브랜드",
+                        "product_name": f"상품{product_id}",
+                        "price": 1000,
+                        "discounted_price": 900,
+                    },
+                    "sort": [product_id],
+                }
+                for product_id in range(first_id, first_id - size, -1)
+            ]
+        }
+    }
 
 
 # 'GET /goods' API가 성공적으로 동작한다.
@@ -115,6 +144,114 @@ async def test_goods_list_with_invalid_category(client: AsyncClient, mocker):
     assert response.json() == {"detail": "Invalid query format."}
 
 
+# 'GET /goods?cursor=' 서명이 맞지 않는 cursor가 주어지면 400을 반환한다.
+@pytest.mark.asyncio
+async def test_goods_list_with_invalid_cursor(client: AsyncClient):
+    response = await client.get("/goods?cursor=eyJxIjpbImdvb2RzIixudWxsXX0.invalid")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor."}
+
+
+# 'GET /goods' API가 목록용 필드만 조회하고, 첫 페이지는 PIT 없이 조회한다.
+@pytest.mark.asyncio
+async def test_goods_list_fetches_list_fields(client: AsyncClient, mocker):
+    search = mocker.patch.object(
+        get_elasticsearch_client(),
+        "search",
+        new_callable=mocker.AsyncMock,
+        return_value=build_search_response(first_id=100),
+    )
+
+    response = await client.get("/goods")
+
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()
+    assert [goods["id"] for goods in data["products"]] == list(range(100, 90, -1))
+    assert data["next_search_after"] == [91]
+    assert data["pit_id"] is None
+    assert data["cursor"] is not None
+
+    search.assert_awaited_once()
+    assert search.call_args.kwargs["index"] == PRODUCTS_ALIAS
+    body = search.call_args.kwargs["body"]
+    assert body["_source"] == PRODUCT_LIST_FIELDS
+    assert body["track_total_hits"] is False
+    assert "pit" not in body
+
+
+# 'GET /goods?cursor=' 앞쪽 페이지는 PIT 없이 조회하고, shallow_pages 다음 페이지부터 PIT을 사용한다.
+@pytest.mark.asyncio
+async def test_goods_list_switches_to_pit_after_shallow_pages(
+    client: AsyncClient, mocker
+):
+    es = get_elasticsearch_client()
+    search = mocker.patch.object(
+        es,
+        "search",
+        new_callable=mocker.AsyncMock,
+        side_effect=[
+            build_search_response(first_id=100 - page * 10)
+            for page in range(config.es.shallow_pages + 1)
+        ],
+    )
+    mocker.patch.object(
+        es,
+        "open_point_in_time",
+        new_callable=mocker.AsyncMock,
+        return_value={"id": "pit-1"},
+    )
+    mocker.patch.object(pit_manager, "pits", {})
+    mocker.patch.object(pit_manager, "shared", {})
+
+    cursor = None
+    for _ in range(config.es.shallow_pages + 1):
+        response = await client.get(
+            "/goods", params={"cursor": cursor} if cursor else None
+        )
+        assert response.status_code == status.HTTP_200_OK
+        cursor = response.json()["cursor"]
+
+    bodies = [call.kwargs["body"] for call in search.call_args_list]
+    assert ["pit" in body for body in bodies] == [False] * config.es.shallow_pages + [
+        True
+    ]
+    assert bodies[-1]["pit"]["id"] == "pit-1"
+    assert bodies[-1]["search_after"] == [100 - config.es.shallow_pages * 10 + 1]
+    assert response.json()["pit_id"] == "pit-1"
+
+
+# 'GET /goods/{goods_id}' API가 상세 정보에 필요한 필드만 조회한다.
+@pytest.mark.asyncio
+async def test_get_goods_by_id_fetches_detail_fields(client: AsyncClient, mocker):
+    source = {
+        "id": 1,
+        "brand_name": "브랜드",
+        "product_name": "테스트 상품",
+        "price": 1000,
+        "discounted_price": 900,
+        "contact_number": "000-000-0000",
+        "category_1": "스킨케어",
+        "category_2": "토너",
+        "category_3": "스킨",
+    }
+    get = mocker.patch.object(
+        get_elasticsearch_client(),
+        "get",
+        new_callable=mocker.AsyncMock,
+        return_value={"found": True, "_source": source},
+    )
+
+    response = await client.get("/goods/1")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["category"] == "스킨케어 > 토너 > 스킨"
+    get.assert_awaited_once_with(
+        index=PRODUCTS_ALIAS, id=1, source_includes=PRODUCT_DETAIL_FIELDS
+    )
+
+
 # 'GET /goods/{goods_id}' API가 성공적으로 동작한다.
 @pytest.mark.asyncio
 async def test_get_goods_by_id_successfully(client: AsyncClient, mocker):
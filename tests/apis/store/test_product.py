@@ -3,7 +3,7 @@ from fastapi import status
 from httpx import AsyncClient
 
 from src.models.product import Product, TertiaryCategory
-from src.models.repository import ProductRepository, UserRepository
+from src.models.repository import CategoryRepository, ProductRepository, UserRepository
 from src.models.user import Seller, User, UserType
 from src.service.session import SessionService
 
@@ -82,6 +82,35 @@ async def test_create_product_with_invalid_data(client: AsyncClient, mocker):
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+# 'POST /products/' API가 존재하지 않는 카테고리를 받으면 상품을 만들지 않고 400을 응답한다.
+@pytest.mark.asyncio
+async def test_create_product_with_unknown_category(client: AsyncClient, mocker):
+    mock_user = User(
+        id=1, email="test@example.com", password="hashed_pw", user_type=UserType.SELLER
+    )
+    product_data = {"product_name": "테스트 상품", "category_id": 999, "price": 10000}
+
+    mocker.patch.object(
+        SessionService,
+        "get_session",
+        return_value={"user_id": 1, "user_type": UserType.SELLER},
+    )
+    mocker.patch.object(UserRepository, "get_user_by_id", return_value=mock_user)
+    get_category_path = mocker.patch.object(
+        CategoryRepository, "get_category_path", return_value=None
+    )
+    create_product = mocker.patch.object(ProductRepository, "create_product")
+
+    response = await client.post(
+        "/products", json=product_data, cookies={"session_id": "valid_session_id"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid category_id."}
+    get_category_path.assert_awaited_once_with(999)
+    create_product.assert_not_called()
+
+
 # 'GET /products/{product_id}' API가 성공적으로 동작한다.
 @pytest.mark.asyncio
 async def test_get_product_by_id_successfully(client: AsyncClient, mocker):
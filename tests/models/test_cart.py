@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from src.models.repository import CartRepository
+
+
+@pytest_asyncio.fixture
+async def cart_repo() -> CartRepository:
+    # 장바구니 스크립트를 실행할 수 있도록 Lua를 지원하는 fakeredis 사용
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield CartRepository(redis)
+    await redis.aclose()
+
+
+# 여러 사용자가 동시에 담아도 가용 재고보다 많이 담기지 않는다.
+@pytest.mark.asyncio
+async def test_add_product_with_stock_check_concurrently(cart_repo: CartRepository):
+    results = await asyncio.gather(
+        *(
+            cart_repo.add_product_with_stock_check(
+                user_id=user_id,
+                product_id=1,
+                quantity=3,
+                stocks_count=10,
+                reserve_threshold=0,
+            )
+            for user_id in range(1, 6)
+        )
+    )
+
+    assert sorted(result["is_added"] for result in results) == [False] * 2 + [True] * 3
+    held = await cart_repo.redis.hvals(cart_repo.generate_product_hold_key(1))
+    assert sum(int(quantity) for quantity in held) == 9
+
+
+# 수량 변경은 이미 담아 둔 수량을 제외한 재고와 비교하며, 동시에 변경해도 재고를 넘지 않는다.
+@pytest.mark.asyncio
+async def test_replace_quantity_with_stock_check(cart_repo: CartRepository):
+    async def set_quantity(user_id: int, quantity: int, replace: bool = True) -> dict:
+        return await cart_repo.add_product_with_stock_check(
+            user_id=user_id,
+            product_id=1,
+            quantity=quantity,
+            stocks_count=5,
+            reserve_threshold=0,
+            replace=replace,
+        )
+
+    await set_quantity(user_id=1, quantity=2, replace=False)
+    await set_quantity(user_id=2, quantity=2, replace=False)
+
+    results = await asyncio.gather(
+        set_quantity(user_id=1, quantity=3), set_quantity(user_id=2, quantity=3)
+    )
+
+    assert sorted(result["is_added"] for result in results) == [False, True]
+    assert sorted(
+        [
+            await cart_repo.get_product_quantity_in_cart(user_id=1, product_id=1),
+            await cart_repo.get_product_quantity_in_cart(user_id=2, product_id=1),
+        ]
+    ) == [2, 3]
+
+    # 수량을 줄이는 변경은 재고가 부족해져도 반영
+    result = await cart_repo.add_product_with_stock_check(
+        user_id=1,
+        product_id=1,
+        quantity=1,
+        stocks_count=0,
+        reserve_threshold=0,
+        replace=True,
+    )
+    assert result["is_added"] and result["quantity"] == 1
+
+
+# 이전 형식의 장바구니 키를 새 구조로 옮기며, 여러 번 실행해도 결과가 같다.
+@pytest.mark.asyncio
+async def test_migrate_legacy_cart_keys(cart_repo: CartRepository):
+    redis = cart_repo.redis
+    await redis.hset("cart:1:10", "quantity", 2)
+    await redis.expire("cart:1:10", 30)
+    await redis.hset("cart:1:11", "quantity", 1)
+    await redis.hset("cart:2:10", "quantity", 3)
+    # 이미 새 구조로 담긴 장바구니는 그대로 유지
+    await cart_repo.add_product(user_id=3, product_id=10, quantity=4)
+
+    assert await cart_repo.migrate_legacy_cart_keys(batch_size=1) == 3
+    assert await cart_repo.migrate_legacy_cart_keys(batch_size=1) == 0
+
+    assert await redis.keys("cart:*:*") == []
+    assert await cart_repo.get_cart_items(user_id=1) == {10: 2, 11: 1}
+    assert await cart_repo.get_cart_items(user_id=2) == {10: 3}
+    assert await cart_repo.get_cart_items(user_id=3) == {10: 4}
+    holds = await redis.hgetall(cart_repo.generate_product_hold_key(10))
+    assert holds == {"1": "2", "2": "3", "3": "4"}
+
+    # 이전 키의 남은 TTL을 만료 시각으로 사용
+    expiry_key = cart_repo.generate_cart_expiry_key(user_id=1)
+    expire_at = await redis.zscore(expiry_key, 10)
+    assert expire_at - time.time() == pytest.approx(30, abs=2)
+    assert await redis.zscore(expiry_key, 11) - time.time() == pytest.approx(
+        cart_repo.cart_ttl, abs=2
+    )
@@ -0,0 +1,20 @@
+import pytest
+
+from src.models.repository import ElasticsearchRepository
+
+
+# 이전 정렬([id, _shard_doc])로 발급된 search_after로 검색해도 id 기준으로 다음 페이지를 조회한다.
+@pytest.mark.asyncio
+async def test_search_products_with_legacy_search_after(mocker):
+    es = mocker.MagicMock()
+    es.search = mocker.AsyncMock(
+        return_value={"hits": {"hits": [{"_source": {"id": 119}, "sort": [119]}]}}
+    )
+    es_repo = ElasticsearchRepository(es=es, pit_manager=mocker.MagicMock())
+
+    products, next_search_after, pit_id = await es_repo.search_products(
+        keyword="토너", search_after=[120, 37], use_pit=False
+    )
+
+    assert products == [{"id": 119}]
+    assert es.search.call_args.kwargs["body"]["search_after"] == [120]
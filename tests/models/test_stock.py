@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert, pool
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.product import Product, StatusType, Stock
+from src.models.repository import StockRepository
+
+
+# 여러 구매자가 동시에 재고를 확보해도 같은 재고가 두 번 할당되지 않는다.
+@pytest.mark.asyncio
+async def test_allocate_stocks_concurrently(tmp_path, mocker):
+    # 세션마다 별도의 커넥션을 사용하도록 파일 DB 사용
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'stock.sqlite3'}", poolclass=pool.NullPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(
+            insert(Stock),
+            [{"product_id": 1, "status": StatusType.AVAILABLE}] * 50,
+        )
+
+    mocker.patch.object(StockRepository, "adjust_available_stock", return_value=None)
+
+    async def allocate() -> list[int]:
+        async with AsyncSession(engine) as session:
+            stock_repo = StockRepository(session, mocker.MagicMock())
+            return await stock_repo.allocate_stocks(product_id=1, quantity=3)
+
+    results = await asyncio.gather(*(allocate() for _ in range(20)))
+
+    allocated = [stock_id for stock_ids in results for stock_id in stock_ids]
+    # 50개 중 3개씩 16번만 성공하고, 재고가 부족한 요청은 아무것도 확보하지 않는다.
+    assert len(allocated) == len(set(allocated)) == 48
+    assert sorted(len(stock_ids) for stock_ids in results) == [0] * 4 + [3] * 16
+
+    async with AsyncSession(engine) as session:
+        result = await session.exec(
+            select(func.count(Stock.id)).where(Stock.status == StatusType.SOLD)
+        )
+        assert result.one() == 48
+
+    await engine.dispose()
+
+
+async def create_stock_engine(tmp_path, stocks: list[dict], product_ids: list[int]):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'stock.sqlite3'}", poolclass=pool.NullPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(
+            insert(Product),
+            [
+                {
+                    "id": product_id,
+                    "seller_id": 1,
+                    "product_name": f"product{product_id}",
+                    "category_id": 1,
+                    "price": 1000,
+                }
+                for product_id in product_ids
+            ],
+        )
+        if stocks:
+            await conn.execute(insert(Stock), stocks)
+    return engine
+
+
+# 재고 카운터가 없으면 DB의 가용 재고로 생성하고, 있으면 증감만 반영한다.
+@pytest.mark.asyncio
+async def test_adjust_available_stock_seeds_missing_counter(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    engine = await create_stock_engine(
+        tmp_path, [{"product_id": 1, "status": StatusType.AVAILABLE}] * 5, [1]
+    )
+
+    async with AsyncSession(engine) as session:
+        stock_repo = StockRepository(session, redis)
+        # 이미 커밋된 재고 5개를 추가한 뒤 호출 (카운터가 없으므로 증감값이 아닌 DB 값 사용)
+        await stock_repo.adjust_available_stock(product_id=1, delta=5)
+        assert await redis.get(stock_repo.generate_stock_counter_key(1)) == "5"
+
+        await stock_repo.adjust_available_stock(product_id=1, delta=-2)
+        assert await stock_repo.get_available_stock(product_id=1) == 3
+
+        # 조회 시 카운터가 없으면 DB 값으로 생성
+        await redis.delete(stock_repo.generate_stock_counter_key(1))
+        assert await stock_repo.get_available_stock(product_id=1) == 5
+        assert await redis.get(stock_repo.generate_stock_counter_key(1)) == "5"
+
+    await redis.aclose()
+    await engine.dispose()
+
+
+# 재고 카운터가 DB와 다르거나 없는 상품만 DB 기준으로 다시 맞춘다.
+@pytest.mark.asyncio
+async def test_reconcile_available_stocks(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    engine = await create_stock_engine(
+        tmp_path,
+        [{"product_id": 1, "status": StatusType.AVAILABLE}] * 5
+        + [{"product_id": 2, "status": StatusType.AVAILABLE}] * 2
+        + [{"product_id": 2, "status": StatusType.SOLD}],
+        [1, 2, 3],
+    )
+    await redis.set("stock:1", 5)
+    await redis.set("stock:2", 7)
+
+    async with AsyncSession(engine) as session:
+        stock_repo = StockRepository(session, redis)
+        assert await stock_repo.reconcile_available_stocks(batch_size=2) == 2
+        assert await stock_repo.reconcile_available_stocks(batch_size=2) == 0
+
+    assert await redis.mget("stock:1", "stock:2", "stock:3") == ["5", "2", "0"]
+    await redis.aclose()
+    await engine.dispose()
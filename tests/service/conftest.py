@@ -0,0 +1,21 @@
+import pytest
+import pytest_asyncio
+from redis.asyncio import Redis
+
+from src.service import background_task
+
+
+@pytest_asyncio.fixture(scope="function")
+async def task_redis(mocker) -> Redis:
+    # Lua 스크립트를 실행할 수 있는 fakeredis로 작업 stream을 대체
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    mocker.patch.object(background_task, "task_redis", client)
+    mocker.patch.object(
+        background_task,
+        "move_due_retries_script",
+        client.register_script(background_task.MOVE_DUE_RETRIES_SCRIPT),
+    )
+    await background_task.create_consumer_group()
+    yield client
+    await client.aclose()
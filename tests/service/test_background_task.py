@@ -0,0 +1,254 @@
+import asyncio
+import json
+import time
+
+import pytest
+from redis.asyncio import Redis
+
+from src import config
+from src.service import background_task
+from src.service.background_task import (
+    EMAIL_LANE,
+    PRODUCT_LANE,
+    TASK_DEAD_LETTER_STREAM,
+    TASK_GROUP,
+    claim_idle_messages,
+    drop_poison_messages,
+    get_retry_delay,
+    move_due_retries,
+    process_messages,
+    process_tasks,
+    remove_stale_consumers,
+    replay_dead_letters,
+    schedule_retry,
+)
+
+PRODUCT_TASK = {"type": "sync_product", "v": "1", "data": '{"id": 1}'}
+EMAIL_TASK = {"type": "send_email", "v": "1", "data": '{"email": "a@example.com"}'}
+
+
+# 재시도 간격은 2배씩 늘어나며 최대값을 넘지 않고, jitter로 최대 절반까지 줄어든다.
+def test_get_retry_delay(mocker):
+    mocker.patch.object(config.worker, "retry_base_ms", 100)
+    mocker.patch.object(config.worker, "retry_max_ms", 1000)
+
+    mocker.patch.object(background_task.random, "uniform", return_value=1.0)
+    assert [get_retry_delay(attempt) for attempt in range(1, 7)] == [
+        0.1,
+        0.2,
+        0.4,
+        0.8,
+        1.0,
+        1.0,
+    ]
+
+    mocker.patch.object(background_task.random, "uniform", return_value=0.5)
+    assert get_retry_delay(3) == 0.2
+
+
+# 재시도 시각이 지난 작업만 lane의 stream에 다시 추가한다.
+@pytest.mark.asyncio
+async def test_move_due_retries(task_redis: Redis):
+    due = json.dumps({"id": "1-0", "fields": {**PRODUCT_TASK, "attempt": "1"}})
+    not_due = json.dumps({"id": "2-0", "fields": {**PRODUCT_TASK, "attempt": "2"}})
+    await task_redis.zadd(
+        PRODUCT_LANE.retry_key, {due: time.time() - 1, not_due: time.time() + 60}
+    )
+
+    assert await move_due_retries(PRODUCT_LANE) == 1
+    assert await move_due_retries(PRODUCT_LANE) == 0
+
+    messages = await task_redis.xrange(PRODUCT_LANE.stream)
+    assert [data for _, data in messages] == [{**PRODUCT_TASK, "attempt": "1"}]
+    assert await task_redis.zrange(PRODUCT_LANE.retry_key, 0, -1) == [not_due]
+
+
+# 재시도 횟수가 남아 있으면 재시도 대기열에, 초과하면 dead-letter stream에 추가한다.
+@pytest.mark.asyncio
+async def test_schedule_retry_dead_letters_after_max_retries(mocker, task_redis: Redis):
+    mocker.patch.object(config.worker, "max_retries", 3)
+
+    await schedule_retry(PRODUCT_LANE, "1-0", {**PRODUCT_TASK, "attempt": "2"}, "err")
+    members = await task_redis.zrange(PRODUCT_LANE.retry_key, 0, -1)
+    assert [json.loads(member) for member in members] == [
+        {"id": "1-0", "fields": {**PRODUCT_TASK, "attempt": "3"}}
+    ]
+    assert await task_redis.xlen(TASK_DEAD_LETTER_STREAM) == 0
+
+    await schedule_retry(PRODUCT_LANE, "2-0", {**PRODUCT_TASK, "attempt": "3"}, "err")
+    assert await task_redis.zcard(PRODUCT_LANE.retry_key) == 1
+    [(_, dead)] = await task_redis.xrange(TASK_DEAD_LETTER_STREAM)
+    assert dead["source_id"] == "2-0"
+    assert dead["error"] == "err"
+    assert dead["attempt"] == "3"
+
+
+# dead-letter stream의 작업을 재시도 횟수 없이 lane에 다시 추가하고 dead-letter stream에서 삭제한다.
+@pytest.mark.asyncio
+async def test_replay_dead_letters(task_redis: Redis):
+    for task in (PRODUCT_TASK, EMAIL_TASK, PRODUCT_TASK):
+        await task_redis.xadd(
+            TASK_DEAD_LETTER_STREAM,
+            {**task, "attempt": "3", "error": "err", "source_id": "1-0"},
+        )
+
+    assert await replay_dead_letters(task_type="send_email") == 1
+    assert [data for _, data in await task_redis.xrange(EMAIL_LANE.stream)] == [
+        EMAIL_TASK
+    ]
+    assert await task_redis.xlen(TASK_DEAD_LETTER_STREAM) == 2
+
+    assert await replay_dead_letters(limit=1) == 1
+    assert await task_redis.xlen(PRODUCT_LANE.stream) == 1
+    assert await task_redis.xlen(TASK_DEAD_LETTER_STREAM) == 1
+
+    assert await replay_dead_letters() == 1
+    assert [data for _, data in await task_redis.xrange(PRODUCT_LANE.stream)] == [
+        PRODUCT_TASK,
+        PRODUCT_TASK,
+    ]
+    assert await task_redis.xlen(TASK_DEAD_LETTER_STREAM) == 0
+
+
+# 전달 횟수가 재시도 횟수를 초과한 메시지는 처리하지 않고 dead-letter stream으로 옮긴다.
+@pytest.mark.asyncio
+async def test_drop_poison_messages(mocker, task_redis: Redis):
+    mocker.patch.object(config.worker, "max_retries", 1)
+    poison_id = await task_redis.xadd(PRODUCT_LANE.stream, PRODUCT_TASK)
+    await task_redis.xreadgroup(TASK_GROUP, "worker", {PRODUCT_LANE.stream: ">"})
+    # 워커가 처리 도중 종료되어 두 번 더 회수됨
+    for _ in range(2):
+        await task_redis.xclaim(
+            PRODUCT_LANE.stream, TASK_GROUP, "worker", 0, [poison_id]
+        )
+    message_id = await task_redis.xadd(PRODUCT_LANE.stream, PRODUCT_TASK)
+    await task_redis.xreadgroup(TASK_GROUP, "worker", {PRODUCT_LANE.stream: ">"})
+
+    messages = await task_redis.xrange(PRODUCT_LANE.stream)
+    remaining = await drop_poison_messages(PRODUCT_LANE, messages, "worker")
+
+    assert remaining == [(message_id, PRODUCT_TASK)]
+    [(_, dead)] = await task_redis.xrange(TASK_DEAD_LETTER_STREAM)
+    assert dead["source_id"] == poison_id
+    pending = await task_redis.xpending(PRODUCT_LANE.stream, TASK_GROUP)
+    assert pending["pending"] == 1
+
+
+# 한 lane의 작업이 밀려 있어도 다른 lane의 작업은 지연 없이 처리된다.
+@pytest.mark.asyncio
+async def test_busy_lane_does_not_starve_other_lanes(mocker, task_redis: Redis):
+    released = asyncio.Event()
+    sent = asyncio.Event()
+
+    async def sync_product(product_info: dict):
+        await released.wait()
+
+    async def send_email(user_info: dict):
+        sent.set()
+
+    mocker.patch.dict(
+        background_task.task_handlers,
+        {"sync_product": sync_product, "send_email": send_email},
+    )
+    mocker.patch.object(PRODUCT_LANE, "concurrency", 2)
+    for _ in range(10):
+        await task_redis.xadd(PRODUCT_LANE.stream, PRODUCT_TASK)
+    await task_redis.xadd(EMAIL_LANE.stream, EMAIL_TASK)
+
+    stop_event = asyncio.Event()
+    consumer = asyncio.create_task(
+        process_tasks(block_ms=10, consumer_name="worker", stop_event=stop_event)
+    )
+    try:
+        # 상품 lane의 작업이 모두 대기 중인 동안 이메일이 전송됨
+        await asyncio.wait_for(sent.wait(), timeout=1)
+        pending = await task_redis.xpending(PRODUCT_LANE.stream, TASK_GROUP)
+        assert pending["pending"] == 10
+    finally:
+        stop_event.set()
+        released.set()
+        await asyncio.wait_for(consumer, timeout=1)
+
+    assert (await task_redis.xpending(EMAIL_LANE.stream, TASK_GROUP))["pending"] == 0
+
+
+# 처리에 성공했거나 재시도 대기열로 옮긴 메시지만 ack하고, 옮기지 못한 메시지는 pending으로 남긴다.
+@pytest.mark.asyncio
+async def test_process_messages_acks_handled_messages(mocker, task_redis: Redis):
+    async def sync_product(product_info: dict):
+        if product_info["id"] != 1:
+            raise RuntimeError("Elasticsearch unavailable")
+
+    mocker.patch.dict(background_task.task_handlers, {"sync_product": sync_product})
+    mocker.patch.object(
+        background_task,
+        "schedule_retry",
+        side_effect=[None, ConnectionError("Redis unavailable")],
+    )
+    for product_id in (1, 2, 3):
+        await task_redis.xadd(
+            PRODUCT_LANE.stream, {**PRODUCT_TASK, "data": f'{{"id": {product_id}}}'}
+        )
+    [(_, messages)] = await task_redis.xreadgroup(
+        TASK_GROUP, "worker", {PRODUCT_LANE.stream: ">"}
+    )
+
+    await process_messages(PRODUCT_LANE, messages, asyncio.Semaphore(2))
+
+    pending = await task_redis.xpending_range(
+        PRODUCT_LANE.stream, TASK_GROUP, min="-", max="+", count=10
+    )
+    assert [entry["message_id"] for entry in pending] == [messages[2][0]]
+
+
+# 다른 consumer에 전달된 뒤 오래 처리되지 않은 메시지를 가져와 처리하고 ack한다.
+@pytest.mark.asyncio
+async def test_claim_idle_messages(mocker, task_redis: Redis):
+    handled = []
+
+    async def sync_product(product_info: dict):
+        handled.append(product_info["id"])
+
+    mocker.patch.dict(background_task.task_handlers, {"sync_product": sync_product})
+    mocker.patch.object(config.worker, "claim_min_idle_ms", 10)
+    for product_id in (1, 2, 3):
+        await task_redis.xadd(
+            PRODUCT_LANE.stream, {**PRODUCT_TASK, "data": f'{{"id": {product_id}}}'}
+        )
+    # 종료된 워커가 읽고 처리하지 못한 메시지
+    await task_redis.xreadgroup(
+        TASK_GROUP, "stopped", {PRODUCT_LANE.stream: ">"}, count=2
+    )
+
+    # 방치된 시간이 claim_min_idle_ms보다 짧으면 가져오지 않음
+    await claim_idle_messages(PRODUCT_LANE, "worker", None)
+    assert handled == []
+
+    await asyncio.sleep(0.02)
+    await claim_idle_messages(PRODUCT_LANE, "worker", None)
+
+    assert handled == [1, 2]
+    assert (await task_redis.xpending(PRODUCT_LANE.stream, TASK_GROUP))["pending"] == 0
+
+
+# pending 메시지가 없고 오랫동안 읽지 않은 다른 consumer만 그룹에서 삭제한다.
+@pytest.mark.asyncio
+async def test_remove_stale_consumers(mocker, task_redis: Redis):
+    mocker.patch.object(config.worker, "stale_consumer_ms", 10)
+    await task_redis.xadd(PRODUCT_LANE.stream, PRODUCT_TASK)
+    await task_redis.xreadgroup(TASK_GROUP, "busy", {PRODUCT_LANE.stream: ">"})
+    for consumer_name in ("stopped", "worker"):
+        await task_redis.xreadgroup(
+            TASK_GROUP, consumer_name, {PRODUCT_LANE.stream: ">"}
+        )
+    await asyncio.sleep(0.02)
+    await task_redis.xreadgroup(TASK_GROUP, "active", {PRODUCT_LANE.stream: ">"})
+
+    await remove_stale_consumers(PRODUCT_LANE, "worker")
+
+    consumers = await task_redis.xinfo_consumers(PRODUCT_LANE.stream, TASK_GROUP)
+    assert sorted(consumer["name"] for consumer in consumers) == [
+        "active",
+        "busy",
+        "worker",
+    ]
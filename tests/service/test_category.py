@@ -0,0 +1,58 @@
+import asyncio
+from typing import Optional
+
+import pytest
+
+from src.service import category
+from src.service.category import CATEGORY_CHANNEL, listen_category_events
+
+
+def create_pubsub(mocker, messages: list, error: Optional[Exception] = None):
+    # messages를 전달한 뒤 error로 연결이 끊기는 구독 (error가 없으면 계속 대기)
+    async def listen():
+        for message in messages:
+            yield message
+        if error is not None:
+            raise error
+        await asyncio.Event().wait()
+
+    pubsub = mocker.AsyncMock()
+    pubsub.listen = listen
+    return pubsub
+
+
+# 구독이 끊기면 다시 구독하고, 끊긴 동안 놓친 변경이 없도록 캐시를 무효화한다.
+@pytest.mark.asyncio
+async def test_listen_category_events_reconnects(mocker, capsys):
+    message = {"type": "message", "channel": CATEGORY_CHANNEL, "data": "invalidate"}
+    refused = [create_pubsub(mocker, []) for _ in range(2)]
+    for pubsub in refused:
+        pubsub.subscribe.side_effect = ConnectionError("Connection refused")
+    dropped = create_pubsub(mocker, [message], ConnectionError("Connection reset"))
+    listening = create_pubsub(mocker, [])
+    subscribed = asyncio.Event()
+    listening.subscribe.side_effect = lambda channel: subscribed.set()
+
+    redis = mocker.MagicMock()
+    redis.pubsub.side_effect = [*refused, dropped, listening]
+    mocker.patch.object(category, "get_redis_client", return_value=redis)
+    invalidate_cache = mocker.patch.object(
+        category.CategoryRepository, "invalidate_cache"
+    )
+    sleep = mocker.spy(category.asyncio, "sleep")
+
+    task = asyncio.create_task(listen_category_events(retry_delay=0.01))
+    await asyncio.wait_for(subscribed.wait(), timeout=1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # 재구독 2번 + 메시지 1번
+    assert invalidate_cache.call_count == 3
+    # 실패할 때마다 대기 시간이 늘어나고, 구독에 성공하면 초기화
+    assert [call.args[0] for call in sleep.call_args_list] == [0.01, 0.02, 0.01]
+    for pubsub in (*refused, dropped, listening):
+        pubsub.close.assert_awaited_once()
+
+    output = capsys.readouterr().out
+    assert "Connection refused" in output and "Connection reset" in output
@@ -0,0 +1,69 @@
+import pytest
+from fastapi import HTTPException
+
+from src import config
+from src.service.cursor import (
+    PageCursor,
+    check_cursor_secret,
+    decode_cursor,
+    encode_cursor,
+    get_next_cursor,
+    get_page_cursor,
+)
+
+
+# 발급한 cursor를 같은 조회 조건으로 보내면 그대로 복원된다.
+def test_cursor_round_trip():
+    cursor = PageCursor(
+        query=["goods", "tertiary1"], page=3, search_after=[120], pit_id="pit-1"
+    )
+
+    assert decode_cursor(encode_cursor(cursor), ["goods", "tertiary1"]) == cursor
+
+
+# 다른 조회 조건의 요청에 cursor를 사용하면 400을 반환한다.
+def test_cursor_with_other_query():
+    token = encode_cursor(PageCursor(query=["search", "토너"], search_after=[120]))
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(token, ["search", "크림"])
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Cursor does not match the query."
+
+
+# 서명이 변조되었거나 ASCII가 아닌 문자가 포함된 cursor는 400을 반환한다.
+@pytest.mark.parametrize("signature", ["invalid", "é"])
+def test_cursor_with_invalid_signature(signature: str):
+    token = encode_cursor(PageCursor(query=["goods", None], search_after=[120]))
+    encoded, _ = token.split(".")
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(f"{encoded}.{signature}", ["goods", None])
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor."
+
+
+# 앞쪽 shallow_pages개 페이지는 PIT 없이 조회하고, 다음 페이지부터 PIT을 사용한다.
+def test_cursor_uses_pit_after_shallow_pages():
+    query = ["goods", None]
+    page = get_page_cursor(query)
+    use_pit = [page.use_pit]
+
+    for search_after in range(config.es.shallow_pages, 0, -1):
+        token = get_next_cursor(page, [search_after], pit_id=None)
+        page = get_page_cursor(query, cursor=token)
+        use_pit.append(page.use_pit)
+
+    assert page.page == config.es.shallow_pages + 1
+    assert use_pit == [False] * config.es.shallow_pages + [True]
+
+
+# 서명 키가 설정되지 않아도 API 서버는 시작되지만 경고를 출력한다.
+def test_check_cursor_secret_without_secret(mocker, capsys):
+    mocker.patch.object(config.web, "cursor_secret", None)
+
+    check_cursor_secret()
+
+    assert "WEB_CURSOR_SECRET is not set" in capsys.readouterr().out
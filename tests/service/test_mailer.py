@@ -0,0 +1,112 @@
+import asyncio
+import time
+from email.mime.text import MIMEText
+
+import pytest
+import pytest_asyncio
+
+from benchmarks.smtp_sink import SMTPSink
+from src.service.mailer import SMTPMailer
+
+
+def build_message(index: int) -> MIMEText:
+    msg = MIMEText(f"user{index}, Thank you for register.", "plain")
+    msg["From"] = "noreply@example.com"
+    msg["To"] = f"user{index}@example.com"
+    msg["Subject"] = "Welcome to our service!"
+    return msg
+
+
+@pytest_asyncio.fixture
+async def sink() -> SMTPSink:
+    sink = SMTPSink()
+    await sink.start()
+    yield sink
+    await sink.stop()
+
+
+def create_mailer(sink: SMTPSink, **kwargs) -> SMTPMailer:
+    return SMTPMailer(
+        hostname=sink.host,
+        port=sink.port,
+        username="noreply@example.com",
+        password="password",
+        start_tls=False,
+        **kwargs,
+    )
+
+
+# batch_size개가 모이면 대기 시간을 기다리지 않고 하나의 연결로 전송한다.
+@pytest.mark.asyncio
+async def test_send_batches_by_size(sink: SMTPSink):
+    mailer = create_mailer(sink, pool_size=1, batch_size=5, batch_window=10)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(mailer.send(build_message(index)) for index in range(5))),
+        timeout=5,
+    )
+    await mailer.close()
+
+    assert sink.received == 5
+    assert sink.connections == 1
+
+
+# batch_size개가 모이지 않으면 batch_window초 뒤에 전송한다.
+@pytest.mark.asyncio
+async def test_send_batches_by_window(sink: SMTPSink):
+    mailer = create_mailer(sink, batch_size=100, batch_window=0.2)
+
+    start = time.monotonic()
+    await asyncio.gather(*(mailer.send(build_message(index)) for index in range(3)))
+    elapsed = time.monotonic() - start
+    await mailer.close()
+
+    assert elapsed >= 0.2
+    assert sink.received == 3
+    assert sink.connections == 1
+
+
+# 재사용한 연결이 서버에 의해 끊어졌으면 다시 연결하여 한 번 더 전송한다.
+@pytest.mark.asyncio
+async def test_send_reconnects_once_on_disconnect(sink: SMTPSink):
+    mailer = create_mailer(sink, pool_size=1, batch_size=1)
+
+    await mailer.send(build_message(1))
+    sink.drop_next_command = True
+    await mailer.send(build_message(2))
+    await mailer.close()
+
+    assert sink.received == 2
+    assert mailer.connects == 2
+
+
+# 취소된 요청은 건너뛰고 같은 배치의 나머지 메일은 계속 전송한다.
+@pytest.mark.asyncio
+async def test_send_skips_cancelled_requests(sink: SMTPSink):
+    mailer = create_mailer(sink, pool_size=1, batch_size=3, batch_window=10)
+
+    cancelled = asyncio.create_task(mailer.send(build_message(1)))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.wait_for(
+        asyncio.gather(mailer.send(build_message(2)), mailer.send(build_message(3))),
+        timeout=5,
+    )
+    await mailer.close()
+
+    assert sink.received == 2
+
+
+# 초당 전송 수를 rate_limit개로 제한한다. (처음에는 rate_limit개까지 바로 전송)
+@pytest.mark.asyncio
+async def test_send_respects_rate_limit(sink: SMTPSink):
+    mailer = create_mailer(sink, batch_size=10, batch_window=0.01, rate_limit=20)
+
+    start = time.monotonic()
+    await asyncio.gather(*(mailer.send(build_message(index)) for index in range(30)))
+    elapsed = time.monotonic() - start
+    await mailer.close()
+
+    # 처음 20개 이후 10개는 초당 20개씩
+    assert elapsed >= 0.45
+    assert sink.received == 30
@@ -0,0 +1,181 @@
+from typing import Optional
+
+import pytest
+from redis.asyncio import Redis
+
+from src import config
+from src.elastic_client import PRODUCTS_ALIAS, PRODUCTS_WRITE_ALIAS
+from src.service import product_index
+from src.service.product_index import (
+    PRODUCTS_TEMPLATE_VERSION,
+    REINDEX_UPDATES_KEY,
+    get_analysis_hash,
+    get_sync_index,
+    get_write_indices,
+    is_current_mapping,
+    record_reindex_update,
+    reindex_products,
+)
+from src.service.sync import SyncReport
+
+
+@pytest.fixture
+def es(mocker):
+    es = mocker.MagicMock()
+    es.indices = mocker.AsyncMock()
+    es.options.return_value.indices = mocker.AsyncMock()
+    mocker.patch.object(product_index, "es", es)
+    return es
+
+
+def set_aliases(es, aliases: dict[str, list[str]], indices: Optional[list[str]] = None):
+    # alias -> 인덱스 목록과 alias가 아닌 인덱스로 클러스터 상태를 흉내냄
+    indices = indices or []
+    es.indices.exists_alias.side_effect = lambda name: name in aliases
+    es.indices.get_alias.side_effect = lambda name: {
+        index: {"aliases": {name: {}}} for index in aliases[name]
+    }
+    es.indices.exists.side_effect = lambda index: index in aliases or index in indices
+
+
+# 매핑 버전이 같아도 분석기 설정이 바뀌면 현재 매핑이 아니다.
+def test_is_current_mapping_detects_analyzer_change(mocker):
+    meta = {"version": PRODUCTS_TEMPLATE_VERSION, "analysis": get_analysis_hash()}
+    assert is_current_mapping(meta)
+    assert not is_current_mapping({})
+    assert not is_current_mapping({**meta, "version": PRODUCTS_TEMPLATE_VERSION - 1})
+
+    mocker.patch.object(config.es, "product_tokenizer", "nori_tokenizer")
+    assert not is_current_mapping(meta)
+
+
+# 쓰기 alias의 인덱스가 하나면 그 인덱스에, alias 도입 이전이면 products 인덱스에 색인한다.
+@pytest.mark.asyncio
+async def test_get_sync_index(es):
+    set_aliases(es, {PRODUCTS_WRITE_ALIAS: ["products_v2"]})
+    assert await get_sync_index() == "products_v2"
+
+    set_aliases(es, {}, indices=[PRODUCTS_ALIAS])
+    assert await get_sync_index() == PRODUCTS_ALIAS
+
+
+# 재색인 중이거나 색인할 인덱스가 없으면 실행하지 않는다.
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "aliases",
+    [
+        {PRODUCTS_WRITE_ALIAS: ["products_v1", "products_v2"]},
+        {},
+        # 쓰기 alias 없이 조회 alias만 있는 경우 (alias 이름으로 색인하면 안 됨)
+        {PRODUCTS_ALIAS: ["products_v1"]},
+    ],
+)
+async def test_get_sync_index_refuses(es, aliases: dict):
+    set_aliases(es, aliases)
+
+    with pytest.raises(RuntimeError):
+        await get_sync_index()
+
+
+# 쓰기 alias의 인덱스 목록은 캐시 유효 시간 동안 다시 조회하지 않는다.
+@pytest.mark.asyncio
+async def test_get_write_indices_cache(mocker, es):
+    mocker.patch.object(product_index, "write_indices_cache", (0.0, []))
+    set_aliases(es, {PRODUCTS_WRITE_ALIAS: ["products_v1"]})
+
+    assert await get_write_indices() == ["products_v1"]
+    set_aliases(es, {PRODUCTS_WRITE_ALIAS: ["products_v1", "products_v2"]})
+    assert await get_write_indices() == ["products_v1"]
+    assert es.indices.get_alias.await_count == 1
+
+    # 캐시가 만료되면 다시 조회
+    mocker.patch.object(product_index, "write_indices_ttl", 0)
+    assert await get_write_indices() == ["products_v1", "products_v2"]
+
+
+@pytest.fixture
+def reindex(mocker, es, task_redis: Redis):
+    mocker.patch.object(product_index, "task_redis", task_redis)
+    mocker.patch.object(product_index, "write_indices_ttl", 0)
+    mocker.patch.object(product_index, "put_products_template")
+    set_aliases(
+        es, {PRODUCTS_ALIAS: ["products_v1"], PRODUCTS_WRITE_ALIAS: ["products_v1"]}
+    )
+    es.indices.get.return_value = {"products_v1": {}}
+    es.indices.get_settings.return_value = {
+        "products_v1": {"settings": {"index": {"number_of_replicas": "2"}}}
+    }
+    return {
+        "sync_all_products": mocker.patch.object(
+            product_index, "sync_all_products", return_value=SyncReport(indexed=3)
+        ),
+        "sync_products_by_ids": mocker.patch.object(
+            product_index, "sync_products_by_ids"
+        ),
+    }
+
+
+# 재색인 중 기록된 수정 사항을 모두 다시 색인한 뒤 조회/쓰기 alias를 한 번에 전환한다.
+@pytest.mark.asyncio
+async def test_reindex_products_replays_updates_and_swaps_aliases(
+    es, task_redis: Redis, reindex: dict
+):
+    async def sync_all_products(**kwargs) -> SyncReport:
+        await record_reindex_update(5)
+        await record_reindex_update(6)
+        return SyncReport(indexed=3)
+
+    async def forcemerge(**kwargs):
+        # 전체 색인 이후 alias 전환 전에 기록된 수정 사항
+        await record_reindex_update(7)
+
+    async def update_aliases(actions: list[dict]):
+        # alias 전환 시점에는 기록된 수정 사항이 모두 반영되어 있어야 함
+        if any(PRODUCTS_ALIAS in action.get("add", {}).values() for action in actions):
+            assert await task_redis.scard(REINDEX_UPDATES_KEY) == 0
+
+    reindex["sync_all_products"].side_effect = sync_all_products
+    es.options.return_value.indices.forcemerge.side_effect = forcemerge
+    es.indices.update_aliases.side_effect = update_aliases
+
+    await reindex_products()
+
+    assert reindex["sync_all_products"].await_args.kwargs["index"] == "products_v2"
+    replayed = [
+        product_id
+        for call in reindex["sync_products_by_ids"].await_args_list
+        for product_id in call.args[1]
+    ]
+    assert sorted(replayed) == [5, 6, 7]
+
+    first, last = [
+        call.kwargs["actions"] for call in es.indices.update_aliases.await_args_list
+    ]
+    assert first == [
+        {"add": {"index": "products_v2", "alias": PRODUCTS_WRITE_ALIAS}},
+        {"add": {"index": "products_v1", "alias": PRODUCTS_WRITE_ALIAS}},
+    ]
+    assert last == [
+        {"add": {"index": "products_v2", "alias": PRODUCTS_ALIAS}},
+        {"add": {"index": "products_v2", "alias": PRODUCTS_WRITE_ALIAS}},
+        {"remove": {"index": "products_v1", "alias": PRODUCTS_ALIAS}},
+        {"remove": {"index": "products_v1", "alias": PRODUCTS_WRITE_ALIAS}},
+    ]
+    es.indices.put_settings.assert_awaited_once_with(
+        index="products_v2",
+        settings={"number_of_replicas": 2, "refresh_interval": "1s"},
+    )
+
+
+# 색인에 실패한 상품이 있으면 alias를 전환하지 않고 새 인덱스를 삭제한다.
+@pytest.mark.asyncio
+async def test_reindex_products_aborts_on_failure(es, reindex: dict):
+    reindex["sync_all_products"].return_value = SyncReport(indexed=2, failed=1)
+
+    with pytest.raises(RuntimeError):
+        await reindex_products()
+
+    assert es.indices.update_aliases.await_args_list[-1].kwargs["actions"] == [
+        {"remove": {"index": "products_v2", "alias": PRODUCTS_WRITE_ALIAS}}
+    ]
+    es.indices.delete.assert_awaited_once_with(index="products_v2")
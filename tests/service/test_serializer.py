@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from src import config
+from src.config import TaskWorkerConfig
+from src.service.serializer import decode_payload, encode_payload
+
+PRODUCT_INFO = {
+    "id": 1,
+    "product_name": "수분 크림",
+    "price": 25000,
+    "ingredient": "정제수, 글리세린",
+}
+
+
+# 모든 인코딩 형식으로 저장한 메시지를 원래 데이터로 읽을 수 있다.
+@pytest.mark.parametrize("version", ["1", "2", "3"])
+def test_payload_round_trip(mocker, version: str):
+    mocker.patch.object(config.worker, "payload_version", version)
+    mocker.patch.object(config.worker, "payload_compress_min_bytes", 0)
+
+    message_data = encode_payload(PRODUCT_INFO)
+
+    assert message_data["v"] == version
+    assert decode_payload(message_data) == PRODUCT_INFO
+
+
+# 버전 필드가 없는 이전 메시지는 표준 json으로 읽는다.
+def test_decode_payload_without_version():
+    message_data = {"type": "sync_product", "data": json.dumps(PRODUCT_INFO)}
+
+    assert decode_payload(message_data) == PRODUCT_INFO
+
+
+# 인코딩 결과가 압축 기준(byte) 이상이고 압축하는 편이 작을 때만 압축한다.
+def test_encode_payload_compresses_large_payloads(mocker):
+    mocker.patch.object(config.worker, "payload_version", "2")
+    mocker.patch.object(config.worker, "payload_compress_min_bytes", 1024)
+
+    # 글자 수는 압축 기준보다 작지만 UTF-8로는 기준 이상
+    large = {**PRODUCT_INFO, "how_to_use": "적당량을 덜어 얼굴에 펴 바릅니다" * 25}
+    assert len("적당량을 덜어 얼굴에 펴 바릅니다" * 25) < 1024
+
+    assert encode_payload(PRODUCT_INFO)["v"] == "2"
+    message_data = encode_payload(large)
+    assert message_data["v"] == "3"
+    assert decode_payload(message_data) == large
+
+
+# 지원하지 않는 인코딩 형식은 설정을 읽을 때 거부한다.
+def test_invalid_payload_version(monkeypatch):
+    monkeypatch.setenv("TASK_PAYLOAD_VERSION", "4")
+
+    with pytest.raises(ValidationError):
+        TaskWorkerConfig()
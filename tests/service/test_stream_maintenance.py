@@ -0,0 +1,81 @@
+import pytest
+from redis.asyncio import Redis
+
+from src import config
+from src.service import stream_maintenance
+from src.service.background_task import PRODUCT_LANE, TASK_GROUP
+from src.service.stream_maintenance import get_trim_id, trim_stream
+
+STREAM = PRODUCT_LANE.stream
+NOW_MS = 1_700_000_000_000
+
+
+@pytest.fixture
+def stream_redis(mocker, task_redis: Redis) -> Redis:
+    mocker.patch.object(stream_maintenance, "task_redis", task_redis)
+    mocker.patch.object(stream_maintenance.time, "time", return_value=NOW_MS / 1000)
+    return task_redis
+
+
+async def add_messages(redis: Redis, *offsets_ms: int) -> list[str]:
+    # NOW_MS 기준 offset(ms) 전에 추가된 메시지
+    return [
+        await redis.xadd(STREAM, {"type": "sync_product"}, id=f"{NOW_MS - offset}-0")
+        for offset in offsets_ms
+    ]
+
+
+# 그룹 중 하나라도 처리하지 않은 가장 오래된 메시지 이후로는 삭제하지 않는다.
+@pytest.mark.asyncio
+async def test_trim_keeps_oldest_pending_message(mocker, stream_redis: Redis):
+    mocker.patch.object(config.worker, "stream_retention_ms", 0)
+    ids = await add_messages(stream_redis, 5000, 4000, 3000, 2000)
+    await stream_redis.xgroup_create(STREAM, "audit", id="0")
+
+    # task_group은 두 번째 메시지부터 처리하지 못했고, audit 그룹은 모두 처리함
+    await stream_redis.xreadgroup(TASK_GROUP, "worker", {STREAM: ">"})
+    await stream_redis.xack(STREAM, TASK_GROUP, ids[0], ids[3])
+    await stream_redis.xreadgroup("audit", "worker", {STREAM: ">"})
+    await stream_redis.xack(STREAM, "audit", *ids)
+
+    assert await get_trim_id(STREAM) == ids[1]
+
+    await trim_stream(STREAM)
+    remaining = [message_id for message_id, _ in await stream_redis.xrange(STREAM)]
+    assert set(ids[1:]) <= set(remaining)
+    assert await stream_redis.xpending(STREAM, TASK_GROUP) == {
+        "pending": 2,
+        "min": ids[1],
+        "max": ids[2],
+        "consumers": [{"name": "worker", "pending": 2}],
+    }
+
+
+# pending 메시지가 없으면 마지막으로 전달된 메시지와 보존 기간 중 더 오래된 쪽까지 삭제한다.
+@pytest.mark.asyncio
+async def test_trim_without_pending_uses_last_delivered_and_retention(
+    mocker, stream_redis: Redis
+):
+    ids = await add_messages(stream_redis, 5000, 4000, 3000, 2000)
+    await stream_redis.xreadgroup(TASK_GROUP, "worker", {STREAM: ">"}, count=3)
+    await stream_redis.xack(STREAM, TASK_GROUP, *ids[:3])
+
+    mocker.patch.object(config.worker, "stream_retention_ms", 0)
+    assert await get_trim_id(STREAM) == ids[2]
+
+    mocker.patch.object(config.worker, "stream_retention_ms", 4500)
+    assert await get_trim_id(STREAM) == f"{NOW_MS - 4500}-0"
+
+    await trim_stream(STREAM)
+    remaining = [message_id for message_id, _ in await stream_redis.xrange(STREAM)]
+    assert set(ids[1:]) <= set(remaining)
+
+
+# consumer 그룹이 없는 stream은 아직 아무도 읽지 않았으므로 삭제하지 않는다.
+@pytest.mark.asyncio
+async def test_trim_without_groups(stream_redis: Redis):
+    await stream_redis.xadd("task_stream:unknown", {"type": "sync_product"})
+
+    assert await get_trim_id("task_stream:unknown") is None
+    assert await trim_stream("task_stream:unknown") == 0
+    assert await stream_redis.xlen("task_stream:unknown") == 1
@@ -0,0 +1,260 @@
+import asyncio
+from typing import Optional
+
+import pytest
+
+from src.service import sync
+from src.service.sync import (
+    BulkWriter,
+    DocumentMissingError,
+    SyncCoalescer,
+    SyncReport,
+    bulk_index_documents,
+    sync_all_products,
+)
+
+
+def build_bulk_response(operations: list[dict], results: Optional[dict] = None) -> dict:
+    # 요청한 action 순서대로 응답 item 생성 (results에 없는 문서는 성공)
+    results = results or {}
+    items = []
+    for action in operations[::2]:
+        (op_type, meta), *_ = action.items()
+        result = results.get((meta["_index"], meta["_id"]), {"status": 200})
+        items.append(
+            {op_type: {"_index": meta["_index"], "_id": meta["_id"], **result}}
+        )
+    return {"errors": False, "items": items}
+
+
+def index_action(index: str, product_id: int) -> tuple[dict, dict]:
+    return {"index": {"_index": index, "_id": product_id}}, {"id": product_id}
+
+
+def update_action(index: str, product_id: int) -> tuple[dict, dict]:
+    return {"update": {"_index": index, "_id": product_id}}, {"doc": {"id": product_id}}
+
+
+@pytest.fixture
+def bulk(mocker):
+    return mocker.patch.object(
+        sync.es,
+        "bulk",
+        new_callable=mocker.AsyncMock,
+        side_effect=lambda operations, refresh: build_bulk_response(operations),
+    )
+
+
+# 하나의 요청으로 전송하더라도 실패한 문서를 요청한 작업만 실패한다.
+@pytest.mark.asyncio
+async def test_bulk_writer_fails_only_failed_item(bulk):
+    bulk.side_effect = lambda operations, refresh: build_bulk_response(
+        operations, {("products", 2): {"status": 400, "error": {"type": "error"}}}
+    )
+    writer = BulkWriter(max_actions=100, flush_interval=0.01)
+
+    results = await asyncio.gather(
+        writer.write([index_action("products", 1)]),
+        writer.write([index_action("products", 2)]),
+        writer.write([index_action("products", 3)]),
+        return_exceptions=True,
+    )
+
+    assert bulk.await_count == 1
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RuntimeError)
+
+
+# 수정할 문서가 없는 인덱스와 수정에 성공한 인덱스를 구분하여 알린다.
+@pytest.mark.asyncio
+async def test_bulk_writer_update_missing_document(bulk):
+    bulk.side_effect = lambda operations, refresh: build_bulk_response(
+        operations,
+        {("products_v2", 1): {"status": 404, "error": {"type": "not_found"}}},
+    )
+    writer = BulkWriter(max_actions=100, flush_interval=0.01)
+
+    with pytest.raises(DocumentMissingError) as exc_info:
+        await writer.write(
+            [update_action("products_v1", 1), update_action("products_v2", 1)]
+        )
+
+    assert exc_info.value.missing == ["products_v2"]
+    assert exc_info.value.found == ["products_v1"]
+
+
+# 대기 중인 요청의 refresh 옵션 중 가장 강한 옵션으로 한 번에 전송한다.
+@pytest.mark.asyncio
+async def test_bulk_writer_merges_refresh(bulk):
+    writer = BulkWriter(max_actions=100, flush_interval=0.01)
+
+    await asyncio.gather(
+        writer.write([index_action("products", 1)]),
+        writer.write([index_action("products", 2)], refresh="wait_for"),
+        writer.write([index_action("products", 3)]),
+    )
+    await writer.write([index_action("products", 4)])
+
+    assert [call.kwargs["refresh"] for call in bulk.await_args_list] == [
+        "wait_for",
+        "false",
+    ]
+    assert len(bulk.await_args_list[0].kwargs["operations"]) == 6
+
+
+# action이 max_actions개가 되면 flush_interval을 기다리지 않고 전송한다.
+@pytest.mark.asyncio
+async def test_bulk_writer_flushes_at_max_actions(bulk):
+    writer = BulkWriter(max_actions=3, flush_interval=10)
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            writer.write([index_action("products", 1)]),
+            writer.write([index_action("products", 2), index_action("products", 3)]),
+        ),
+        timeout=1,
+    )
+
+    assert bulk.await_count == 1
+    assert writer.flush_task is None
+
+
+# action이 max_actions개보다 적으면 flush_interval초 뒤에 전송한다.
+@pytest.mark.asyncio
+async def test_bulk_writer_flushes_after_interval(bulk):
+    writer = BulkWriter(max_actions=100, flush_interval=0.05)
+
+    task = asyncio.create_task(writer.write([index_action("products", 1)]))
+    await asyncio.sleep(0.01)
+    assert bulk.await_count == 0
+
+    await asyncio.wait_for(task, timeout=1)
+    assert bulk.await_count == 1
+
+
+async def resolve_indices() -> list[str]:
+    return ["products"]
+
+
+# 같은 구간에 들어온 같은 상품의 변경은 나중 값이 이기는 하나의 action으로 합쳐지고,
+# 전체 문서 색인과 합쳐지면 부분 수정도 전체 문서 색인으로 전송한다.
+@pytest.mark.asyncio
+async def test_sync_coalescer_merges_events(bulk):
+    coalescer = SyncCoalescer(
+        BulkWriter(max_actions=100, flush_interval=10), resolve_indices, window=0.01
+    )
+
+    await asyncio.gather(
+        coalescer.submit("update", {"id": 1, "price": 100}),
+        coalescer.submit("index", {"id": 1, "product_name": "크림", "price": 200}),
+        coalescer.submit("update", {"id": 1, "price": 300}, refresh="wait_for"),
+        coalescer.submit("update", {"id": 2, "price": 100}),
+    )
+
+    assert bulk.await_count == 1
+    assert bulk.await_args.kwargs["operations"] == [
+        {"index": {"_index": "products", "_id": 1}},
+        {"id": 1, "product_name": "크림", "price": 300},
+        {"update": {"_index": "products", "_id": 2}},
+        {"doc": {"id": 2, "price": 100}},
+    ]
+    assert bulk.await_args.kwargs["refresh"] == "wait_for"
+    assert coalescer.to_dict() == {
+        "events_received": 4,
+        "documents_written": 2,
+        "pending": 0,
+    }
+
+
+# 이전 구간의 같은 상품 변경이 전송 중이면 끝난 뒤에 다음 변경을 전송한다.
+@pytest.mark.asyncio
+async def test_sync_coalescer_waits_for_previous_write(bulk):
+    released = asyncio.Event()
+    requests = []
+
+    async def send_bulk(operations, refresh):
+        requests.append(operations[1])
+        if len(requests) == 1:
+            await released.wait()
+        return build_bulk_response(operations)
+
+    bulk.side_effect = send_bulk
+    coalescer = SyncCoalescer(
+        BulkWriter(max_actions=100, flush_interval=0.01), resolve_indices, window=0.01
+    )
+
+    first = asyncio.create_task(coalescer.submit("update", {"id": 1, "price": 100}))
+    await asyncio.sleep(0.05)
+    second = asyncio.create_task(coalescer.submit("update", {"id": 1, "price": 200}))
+    await asyncio.sleep(0.05)
+
+    # 첫 번째 전송이 끝나지 않았으므로 두 번째 변경은 대기
+    assert requests == [{"doc": {"id": 1, "price": 100}}]
+    assert 1 in coalescer.writing
+
+    released.set()
+    await asyncio.wait_for(asyncio.gather(first, second), timeout=1)
+
+    assert requests == [
+        {"doc": {"id": 1, "price": 100}},
+        {"doc": {"id": 1, "price": 200}},
+    ]
+    assert coalescer.writing == {}
+
+
+# 이미 색인된 문서(create 409)는 건너뛰고, 실패한 문서만 실패로 집계한다.
+@pytest.mark.asyncio
+async def test_bulk_index_documents_report(bulk):
+    bulk.side_effect = lambda operations: build_bulk_response(
+        operations,
+        {
+            ("products_v2", 2): {"status": 409, "error": {"type": "conflict"}},
+            ("products_v2", 3): {"status": 400, "error": {"type": "error"}},
+        },
+    )
+    report = SyncReport()
+
+    documents = [{"id": product_id} for product_id in range(1, 5)]
+    await bulk_index_documents("products_v2", documents, report, op_type="create")
+
+    assert (report.indexed, report.skipped, report.failed) == (2, 1, 1)
+
+
+# 전체 상품을 chunk 단위로 전송하며, 동시에 전송 중인 요청은 concurrency개를 넘지 않는다.
+@pytest.mark.asyncio
+async def test_sync_all_products_limits_concurrency(mocker, bulk):
+    in_flight, max_in_flight = 0, 0
+
+    async def send_bulk(operations):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return build_bulk_response(operations)
+
+    async def stream_all_products(chunk_size: int):
+        for start in range(0, 50, chunk_size):
+            yield list(range(start + 1, min(start + chunk_size, 50) + 1))
+
+    bulk.side_effect = send_bulk
+    mocker.patch.object(sync, "create_session")
+    mocker.patch.object(sync.CategoryRepository, "get_category_tree")
+    mocker.patch.object(
+        sync.ProductRepository, "stream_all_products", side_effect=stream_all_products
+    )
+    mocker.patch.object(
+        sync,
+        "build_product_document",
+        side_effect=lambda product, tree: {"id": product},
+    )
+    refresh = mocker.patch.object(
+        sync.es.indices, "refresh", new_callable=mocker.AsyncMock
+    )
+
+    report = await sync_all_products("products_v2", chunk_size=5, concurrency=2)
+
+    assert report.indexed == 50
+    assert bulk.await_count == 10
+    assert max_in_flight == 2
+    refresh.assert_awaited_once_with(index="products_v2")
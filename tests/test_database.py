@@ -0,0 +1,60 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import Column, MetaData, String, Table
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import select
+
+from src import database
+from src.database import create_session
+
+# 조회 결과로 어느 DB에서 실행되었는지 구분하기 위한 테이블
+marker = Table("marker", MetaData(), Column("name", String))
+
+
+@pytest_asyncio.fixture
+async def routing(mocker, tmp_path):
+    engines = {}
+    for name in ("primary", "replica"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(marker.metadata.create_all)
+            await conn.execute(marker.insert().values(name=name))
+        engines[name] = engine
+
+    mocker.patch.object(database, "engine", engines["primary"])
+    mocker.patch.object(database, "replica_engine", engines["replica"])
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+# 읽기 전용 조회는 replica에서 실행한다.
+@pytest.mark.asyncio
+async def test_select_uses_replica(routing):
+    async with create_session() as session:
+        assert (await session.exec(select(marker.c.name))).all() == ["replica"]
+
+
+# 잠금 조회와 primary 조회를 지정한 쿼리는 primary에서 실행한다.
+@pytest.mark.asyncio
+async def test_locking_and_forced_select_use_primary(routing):
+    async with create_session() as session:
+        statement = select(marker.c.name).with_for_update()
+        assert (await session.exec(statement)).all() == ["primary"]
+
+    async with create_session() as session:
+        statement = select(marker.c.name).execution_options(use_primary=True)
+        assert (await session.exec(statement)).all() == ["primary"]
+
+
+# 쓰기는 primary에서 실행하고, 같은 세션의 이후 조회도 primary에서 실행한다.
+@pytest.mark.asyncio
+async def test_read_after_write_uses_primary(routing):
+    async with create_session() as session:
+        await session.exec(marker.insert().values(name="written"))
+        result = await session.exec(select(marker.c.name).order_by(marker.c.name))
+        assert result.all() == ["primary", "written"]
+        await session.commit()
+
+    async with create_session() as session:
+        assert (await session.exec(select(marker.c.name))).all() == ["replica"]
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from elasticsearch import NotFoundError
+
+from src.models.repository import ElasticsearchRepository
+from src.pit import PITManager
+
+
+@pytest.fixture
+def es(mocker):
+    es = mocker.patch("src.pit.es")
+    opened = iter(range(1, 100))
+
+    async def open_point_in_time(index: str, keep_alive: str) -> dict:
+        await asyncio.sleep(0.01)
+        return {"id": f"pit-{next(opened)}"}
+
+    es.open_point_in_time = mocker.AsyncMock(side_effect=open_point_in_time)
+    es.close_point_in_time = mocker.AsyncMock()
+    return es
+
+
+def create_pit_manager(max_open: int = 10) -> PITManager:
+    return PITManager(
+        index="products",
+        keep_alive=120,
+        share_seconds=30,
+        idle_seconds=60,
+        max_open=max_open,
+    )
+
+
+# 같은 형태의 요청은 공유 시간 동안 하나의 PIT을 공유한다.
+@pytest.mark.asyncio
+async def test_acquire_shares_pit(es):
+    pit_manager = create_pit_manager()
+
+    first = await pit_manager.acquire(("all",))
+    second = await pit_manager.acquire(("all",))
+    other = await pit_manager.acquire(("category", "category_id", "3"))
+
+    assert first == second == "pit-1"
+    assert other == "pit-2"
+    assert pit_manager.pits["pit-1"].clients == 2
+    assert es.open_point_in_time.await_count == 2
+
+
+# 동시에 들어온 첫 요청들도 PIT을 하나만 연다.
+@pytest.mark.asyncio
+async def test_acquire_opens_once_under_concurrency(es):
+    pit_manager = create_pit_manager()
+
+    pit_ids = await asyncio.gather(*(pit_manager.acquire(("all",)) for _ in range(10)))
+
+    assert set(pit_ids) == {"pit-1"}
+    assert es.open_point_in_time.await_count == 1
+    assert pit_manager.pits["pit-1"].clients == 10
+
+
+# 열린 PIT이 max_open개이면 가장 오래 사용되지 않은 PIT을 닫는다.
+@pytest.mark.asyncio
+async def test_open_evicts_least_recently_used(es):
+    pit_manager = create_pit_manager(max_open=2)
+
+    await pit_manager.acquire(("a",))
+    await pit_manager.acquire(("b",))
+    pit_manager.touch("pit-1")
+    await pit_manager.acquire(("c",))
+
+    es.close_point_in_time.assert_awaited_once_with(id="pit-2")
+    assert set(pit_manager.pits) == {"pit-1", "pit-3"}
+    assert pit_manager.evicted == 1
+
+
+# 공유 중인 PIT은 반납해도 닫지 않고, 공유 시간이 지난 뒤 마지막 클라이언트가 반납하면 닫는다.
+@pytest.mark.asyncio
+async def test_release_closes_after_last_client(es):
+    pit_manager = create_pit_manager()
+    shared_pit_id = await pit_manager.acquire(("shared",))
+    await pit_manager.release(shared_pit_id)
+    assert shared_pit_id in pit_manager.pits
+
+    pit_id = await pit_manager.acquire(("all",))
+    await pit_manager.acquire(("all",))
+    pit_manager.pits[pit_id].opened_at -= pit_manager.share_seconds
+
+    await pit_manager.release(pit_id)
+    es.close_point_in_time.assert_not_awaited()
+
+    await pit_manager.release(pit_id)
+    es.close_point_in_time.assert_awaited_once_with(id=pit_id)
+    assert set(pit_manager.pits) == {shared_pit_id}
+
+
+# Elasticsearch가 PIT ID를 바꾸면 새 ID로 추적하고 공유한다.
+@pytest.mark.asyncio
+async def test_touch_follows_new_pit_id(es):
+    pit_manager = create_pit_manager()
+    pit_id = await pit_manager.acquire(("all",))
+
+    assert pit_manager.touch(pit_id, "pit-1b") == "pit-1b"
+    assert set(pit_manager.pits) == {"pit-1b"}
+    assert await pit_manager.acquire(("all",)) == "pit-1b"
+
+    pit_manager.pits["pit-1b"].opened_at -= pit_manager.share_seconds
+    await pit_manager.release("pit-1b")
+    await pit_manager.release("pit-1b")
+    es.close_point_in_time.assert_awaited_once_with(id="pit-1b")
+
+
+# 만료된 PIT으로 조회하면 만료된 PIT을 제거하고 새 PIT으로 다시 조회한다.
+@pytest.mark.asyncio
+async def test_search_page_replaces_expired_pit(es, mocker):
+    pit_manager = create_pit_manager()
+    expired_pit_id = await pit_manager.acquire(("all",))
+
+    search_es = mocker.MagicMock()
+    search_es.search = mocker.AsyncMock(
+        side_effect=[
+            NotFoundError("search_phase_execution_exception", mocker.MagicMock(), {}),
+            {"pit_id": "pit-2", "hits": {"hits": [{"_source": {"id": 1}}]}},
+        ]
+    )
+    es_repo = ElasticsearchRepository(es=search_es, pit_manager=pit_manager)
+
+    products, next_search_after, pit_id = await es_repo.search_page(
+        ("all",), {"sort": [{"id": {"order": "desc"}}]}, pit_id=expired_pit_id
+    )
+
+    assert products == [{"id": 1}]
+    assert next_search_after is None
+    assert pit_id == "pit-2"
+    assert set(pit_manager.pits) == {"pit-2"}
+    assert pit_manager.pits["pit-2"].clients == 1